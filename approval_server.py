@@ -0,0 +1,249 @@
+"""
+UAV Strategic Deconfliction System - HTTP approval endpoint
+Exposes query_mission_safety to fleet-management services over HTTP/1.1
+"""
+from src.deconfliction_system import DeconflictionSystem
+from src.mission_io import mission_from_dict
+from src.separation_minima import SeparationTable
+from src.serialization import encode_json, encode_binary
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple
+import argparse
+import asyncio
+import json
+
+MAX_BODY_BYTES = 1 << 20
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            413: "Payload Too Large", 500: "Internal Server Error", 503: "Service Unavailable"}
+
+
+class ApprovalServer:
+    """
+    asyncio HTTP/1.1 server in front of a DeconflictionSystem.
+
+    POST /missions   body: mission JSON (see src.mission_io) -> summary response
+                     (JSON, or the binary frame with Accept: application/octet-stream)
+    GET  /status     -> get_system_status()
+
+    Requests arriving within batch_window seconds of each other are decided as one
+    batch on a single worker thread, so the event loop keeps accepting connections
+    while the system (which is not thread-safe) only ever runs one batch at a time.
+    Once max_pending requests are queued or in flight, new ones get 503 + Retry-After.
+    """
+
+    def __init__(self, system: DeconflictionSystem, host: str = "127.0.0.1", port: int = 8080,
+                 batch_window: float = 0.002, max_batch: int = 64, max_pending: int = 512,
+                 idle_timeout: float = 30.0):
+        self.system = system
+        self.host = host
+        self.port = port
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.max_pending = max_pending
+        self.idle_timeout = idle_timeout
+
+        self.batches_run = 0
+        self.requests_shed = 0
+        self._pending = 0
+        self._queue = None
+        self._server = None
+        self._batcher_task = None
+        self._worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix="deconfliction")
+
+    async def start(self):
+        self._queue = asyncio.Queue()
+        self._batcher_task = asyncio.create_task(self._batcher())
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        # Report the real port when started on port 0
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def serve_forever(self):
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._batcher_task is not None:
+            self._batcher_task.cancel()
+        self._worker.shutdown(wait=False)
+
+    # ---- request batching -------------------------------------------------
+
+    async def _batcher(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.batch_window
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            try:
+                bodies = await loop.run_in_executor(self._worker, self._decide, batch)
+            except Exception as exc:
+                bodies = [exc] * len(batch)
+            self.batches_run += 1
+            for (_, _, future), body in zip(batch, bodies):
+                if future.done():
+                    continue
+                if isinstance(body, Exception):
+                    future.set_exception(body)
+                else:
+                    future.set_result(body)
+
+    def _decide(self, batch: List[Tuple]) -> list:
+        """
+        Runs on the worker thread: decide a whole batch, then encode each result
+        on its own, so a response that fails to encode only fails its own request
+        (its slot holds the exception instead of the body)
+        """
+        results = self.system.query_mission_batch([mission for mission, _, _ in batch])
+        bodies = []
+        for (_, binary, _), result in zip(batch, results):
+            try:
+                bodies.append(encode_binary(result) if binary else encode_json(result).encode("utf-8"))
+            except Exception as exc:
+                bodies.append(exc)
+        return bodies
+
+    async def _submit(self, mission, binary: bool) -> bytes:
+        self._pending += 1
+        try:
+            future = asyncio.get_running_loop().create_future()
+            await self._queue.put((mission, binary, future))
+            return await future
+        finally:
+            self._pending -= 1
+
+    # ---- HTTP -------------------------------------------------------------
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(self._read_request(reader), self.idle_timeout)
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError, ValueError):
+                    break
+                if request is None:
+                    break
+                method, path, headers, body = request
+                keep_alive = headers.get("connection", "").lower() != "close"
+
+                try:
+                    status, content_type, payload, extra = await self._route(method, path, headers, body)
+                except Exception as exc:
+                    # Answer instead of dropping the connection without a status line
+                    status, content_type, payload, extra = 500, "text/plain", repr(exc).encode("utf-8"), {}
+                self._write_response(writer, status, content_type, payload, keep_alive, extra)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _route(self, method: str, path: str, headers: dict, body: bytes):
+        if path == "/status":
+            if method != "GET":
+                return 405, "text/plain", b"GET only", {}
+            return 200, "application/json", encode_json(self.system.get_system_status()).encode("utf-8"), {}
+
+        if path != "/missions":
+            return 404, "text/plain", b"Not found", {}
+        if method != "POST":
+            return 405, "text/plain", b"POST only", {}
+        if body is None:
+            return 413, "text/plain", b"Mission too large", {}
+
+        # Back-pressure: shed load instead of queueing without bound
+        if self._pending >= self.max_pending:
+            self.requests_shed += 1
+            return 503, "text/plain", b"Overloaded", {"Retry-After": "1"}
+
+        try:
+            mission = mission_from_dict(json.loads(body))
+        except ValueError as exc:
+            return 400, "text/plain", str(exc).encode("utf-8"), {}
+
+        binary = "application/octet-stream" in headers.get("accept", "")
+        payload = await self._submit(mission, binary)
+        return 200, "application/octet-stream" if binary else "application/json", payload, {}
+
+    @staticmethod
+    async def _read_request(reader: asyncio.StreamReader):
+        request_line = await reader.readline()
+        if not request_line:
+            return None
+        method, path, _ = request_line.decode("latin-1").split(" ", 2)
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        length = int(headers.get("content-length", 0))
+        if length > MAX_BODY_BYTES:
+            # Reject without reading the body (the client may never send it all):
+            # the 413 goes out with Connection: close and the connection is dropped
+            headers["connection"] = "close"
+            return method, path, headers, None
+        body = await reader.readexactly(length) if length else b""
+        return method, path, headers, body
+
+    @staticmethod
+    def _write_response(writer, status: int, content_type: str, payload: bytes, keep_alive: bool, extra: dict):
+        head = [
+            f"HTTP/1.1 {status} {_REASONS[status]}",
+            f"Content-Type: {content_type}",
+            f"Content-Length: {len(payload)}",
+            "Connection: keep-alive" if keep_alive else "Connection: close",
+        ]
+        head.extend(f"{name}: {value}" for name, value in extra.items())
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + payload)
+
+
+async def run_server(args):
+    system = DeconflictionSystem(safety_distance=args.safety_distance, time_step=args.time_step,
+                                 mode=args.mode, verbose=False, workers=args.workers,
+                                 separation=SeparationTable.load(args.separation) if args.separation else None)
+    server = await ApprovalServer(system, args.host, args.port,
+                                  batch_window=args.batch_window_ms / 1000.0,
+                                  max_batch=args.max_batch, max_pending=args.max_pending).start()
+    print(f"Deconfliction approval endpoint listening on http://{server.host}:{server.port}")
+    await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="HTTP approval endpoint for the deconfliction system")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--safety-distance", type=float, default=10.0)
+    parser.add_argument("--time-step", type=float, default=1.0)
+    parser.add_argument("--mode", choices=["2d", "3d", "auto"], default="auto")
+    parser.add_argument("--separation", metavar="JSON", help="per-drone-class separation table")
+    parser.add_argument("--batch-window-ms", type=float, default=2.0)
+    parser.add_argument("--max-batch", type=int, default=64)
+    parser.add_argument("--max-pending", type=int, default=512)
+    parser.add_argument("--workers", type=int, default=1, help="threads for each batch's conflict checks")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(run_server(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
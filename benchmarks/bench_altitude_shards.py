@@ -0,0 +1,119 @@
+"""
+Altitude-layer sharding benchmark: layered traffic (every mission level within
+one of a few altitude bands) queried against the approved store
+
+  - checked against every approved mission (no pre-screen),
+  - through the single 4D occupancy map,
+  - through the altitude shards.
+
+Queries run in what-if sessions, so every configuration sees the same store.
+Verifies that all of them reach the same decisions. The configurations take
+turns over several rounds (so drift in machine load hits them alike); each
+prints the median per-query latency over the rounds and the range of the
+per-round medians. Differences inside those ranges are noise.
+
+    python benchmarks/bench_altitude_shards.py
+    python benchmarks/bench_altitude_shards.py --missions 20000 --bands 10 --rounds 7
+"""
+if __package__ in (None, ""):
+    # Running as a script: make the project root importable (no effect on package imports)
+    import os
+    import sys
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.load_generator import random_mission
+from src.deconfliction_system import DeconflictionSystem
+from src.models import waypoint, Mission
+import argparse
+import random
+import statistics
+import time
+
+
+def layered_mission(rng: random.Random, drone_id: str, area: float, bands: int, spacing: float) -> Mission:
+    """A random route flown level (within +-3 m) in one of `bands` altitude bands"""
+    shape = random_mission(rng, drone_id, area)
+    altitude = spacing * (rng.randrange(bands) + 1.5)
+    wps = [waypoint(wp.x, wp.y, altitude + rng.uniform(-3, 3), wp.time) for wp in shape.waypoints]
+    return Mission(wps, shape.start_time, shape.end_time, drone_id)
+
+
+def loaded_system(missions, safety_distance: float, **kwargs) -> DeconflictionSystem:
+    system = DeconflictionSystem(safety_distance=safety_distance, mode="3d", verbose=False, **kwargs)
+    system.approved_missions = list(missions)
+    system.occupancy.rebuild(system.approved_missions)
+    return system
+
+
+def query_all(system, probes, prescreen: bool):
+    """(decisions, per-query seconds), none of them stored"""
+    decisions, samples = [], []
+    for probe in probes:
+        with system.what_if() as session:
+            started = time.perf_counter()
+            if prescreen:
+                status = session.query_mission_safety(probe, "summary")["status"]
+            else:
+                status = "REJECTED" if system.detector.find_conflicts_against_others(
+                    probe, system.approved_missions) else "APPROVED"
+            samples.append(time.perf_counter() - started)
+        decisions.append(status)
+    return decisions, samples
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--missions", type=int, default=5000)
+    parser.add_argument("--probes", type=int, default=200)
+    parser.add_argument("--bands", type=int, default=8)
+    parser.add_argument("--band-spacing", type=float, default=30.0)
+    parser.add_argument("--safety-distance", type=float, default=10.0)
+    parser.add_argument("--area", type=float, default=10000.0)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=45)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    fleet = [layered_mission(rng, f"DRONE_{i:05d}", args.area, args.bands, args.band_spacing)
+             for i in range(args.missions)]
+    probes = [layered_mission(rng, f"PROBE_{i:04d}", args.area, args.bands, args.band_spacing)
+              for i in range(args.probes)]
+    print(f"{args.missions} approved missions in {args.bands} bands {args.band_spacing:g} m apart, "
+          f"{args.probes} probe queries")
+
+    started = time.perf_counter()
+    configurations = {
+        "every mission": (loaded_system(fleet, args.safety_distance), False),
+        "occupancy map": (loaded_system(fleet, args.safety_distance), True),
+        "altitude shards": (loaded_system(fleet, args.safety_distance, altitude_layer=args.band_spacing), True),
+    }
+    print(f"Indexed the store {len(configurations)} times in {time.perf_counter() - started:.1f}s")
+
+    reference = None
+    samples = {name: [] for name in configurations}
+    round_medians = {name: [] for name in configurations}
+    for _ in range(args.rounds):
+        for name, (system, prescreen) in configurations.items():
+            decisions, seconds = query_all(system, probes, prescreen)
+            if reference is None:
+                reference = decisions
+            elif decisions != reference:
+                print(f"  {name}: decisions differ from checking every mission!")
+                return 1
+            samples[name].extend(seconds)
+            round_medians[name].append(statistics.median(seconds) * 1000)
+
+    baseline = None
+    for name in configurations:
+        ms = statistics.median(samples[name]) * 1000
+        baseline = baseline or ms
+        low, high = min(round_medians[name]), max(round_medians[name])
+        print(f"  {name:<16} {ms:8.3f} ms/query (rounds {low:.3f}-{high:.3f}) {baseline / ms:6.1f}x")
+    rejected = reference.count("REJECTED")
+    print(f"All configurations agree: {rejected} rejected, {len(reference) - rejected} approved")
+    return 0
+
+
+if __name__ == "__main__":
+    import sys
+    sys.exit(main())
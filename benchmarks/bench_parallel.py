@@ -0,0 +1,93 @@
+"""
+Primary-vs-many benchmark: one approval query checked serially, on a thread
+pool running the NumPy kernels, and on a process pool (src.audit).
+
+Verifies that every mode returns the same conflicts and prints the median
+latency of each.
+
+    python benchmarks/bench_parallel.py
+    python benchmarks/bench_parallel.py --missions 5000 --workers 8 --repeat 5
+"""
+if __package__ in (None, ""):
+    # Running as a script: make the project root importable (no effect on package imports)
+    import os
+    import sys
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.load_generator import random_mission
+from src.audit import iter_conflicts_parallel
+from src.conflict_detector import ConflictDetector
+from src.parallel import find_conflicts_threaded
+from src.models import waypoint, Mission
+import argparse
+import os
+import random
+import statistics
+import time
+
+
+def long_primary(area: float) -> Mission:
+    """A survey pattern across the whole area for the whole hour"""
+    wps = []
+    legs = 8
+    for k in range(legs + 1):
+        x = area * k / legs
+        wps.append(waypoint(x, 0.0 if k % 2 == 0 else area, 60.0, 3600.0 * k / legs))
+    return Mission(waypoints=wps, start_time=0.0, end_time=3600.0, drone_id="PRIMARY")
+
+
+def timed(fn, repeat: int):
+    samples = []
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        samples.append(time.perf_counter() - started)
+    return result, statistics.median(samples) * 1000
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--missions", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--safety-distance", type=float, default=50.0)
+    parser.add_argument("--area", type=float, default=10000.0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=38)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    others = [random_mission(rng, f"DRONE_{i:05d}", args.area) for i in range(args.missions)]
+    primary = long_primary(args.area)
+    for mission in others + [primary]:
+        mission.compiled()
+
+    serial = ConflictDetector(args.safety_distance, mode="3d")
+    serial_numpy = ConflictDetector(args.safety_distance, mode="3d", engine="numpy")
+    # Call the pool directly: the detector would take the serial path with workers=1
+    threaded = lambda: find_conflicts_threaded(serial, primary, serial._overlapping(primary, others), args.workers)
+    threaded()  # warm the thread pool
+
+    modes = [
+        ("serial (python)", lambda: serial.find_conflicts_against_others(primary, others)),
+        ("serial (numpy)", lambda: serial_numpy.find_conflicts_against_others(primary, others)),
+        (f"threads x{args.workers}", threaded),
+        (f"processes x{args.workers}", lambda: list(iter_conflicts_parallel(
+            serial_numpy, [primary] + others, args.workers, primary_index=0))),
+    ]
+
+    print(f"{args.missions} approved missions, {args.workers} workers, {os.cpu_count()} CPUs")
+    reference = None
+    for name, fn in modes:
+        records, ms = timed(fn, args.repeat)
+        if reference is None:
+            reference = records
+        elif records != reference:
+            print(f"{name}: results differ from the serial check")
+            return 1
+        print(f"  {name:<18} {ms:9.1f} ms   ({len(records)} conflict samples)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
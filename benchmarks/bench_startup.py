@@ -0,0 +1,79 @@
+"""
+Startup benchmark for the core package, based on `python -X importtime`.
+
+Imports the core entry points in a fresh interpreter several times, keeps the
+fastest run, prints the slowest modules and fails (exit code 1) if the core
+import exceeds the budget or pulls in a heavy optional dependency.
+
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --budget-ms 40 --runs 10
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CORE_IMPORT = "from src import DeconflictionSystem, ConflictDetector, Mission, waypoint"
+HEAVY_MODULES = ("numpy", "matplotlib", "plotly", "asyncio", "concurrent")
+
+
+def import_profile(statement: str):
+    """[(module, self_us, cumulative_us, depth)] for one fresh interpreter"""
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", statement],
+                          cwd=ROOT, capture_output=True, text=True, check=True)
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return rows
+
+
+def core_cost(statement: str):
+    """Cumulative microseconds of every top-level import the statement triggers"""
+    baseline = {name for name, _, _, _ in import_profile("pass")}
+    rows = import_profile(statement)
+    total = sum(cum for name, _, cum, depth in rows if depth == 0 and name not in baseline)
+    return total, rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--budget-ms", type=float, default=60.0)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    best_total, best_rows = None, None
+    for _ in range(args.runs):
+        total, rows = core_cost(CORE_IMPORT)
+        if best_total is None or total < best_total:
+            best_total, best_rows = total, rows
+
+    print(f"core import: {CORE_IMPORT}")
+    print(f"cumulative import time (best of {args.runs}): {best_total / 1000:.1f} ms "
+          f"(budget {args.budget_ms:.1f} ms)")
+    print(f"\nslowest modules by self time:")
+    for name, self_us, cumulative_us, _ in sorted(best_rows, key=lambda r: -r[1])[:args.top]:
+        print(f"  {self_us / 1000:7.2f} ms self  {cumulative_us / 1000:7.2f} ms cumulative  {name}")
+
+    loaded = {name.split(".")[0] for name, _, _, _ in best_rows}
+    heavy = [name for name in HEAVY_MODULES if name in loaded]
+    failed = False
+    if heavy:
+        print(f"\nFAIL: core import pulled in {', '.join(heavy)}")
+        failed = True
+    if best_total / 1000 > args.budget_ms:
+        print(f"\nFAIL: core import over budget")
+        failed = True
+    if not failed:
+        print("\nOK")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
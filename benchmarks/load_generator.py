@@ -0,0 +1,123 @@
+"""
+Load generator for approval_server.py
+
+Opens keep-alive connections, submits random missions and reports p50/p99 latency
+and requests per second. Without --port it starts a server in-process on a free port.
+
+    python benchmarks/load_generator.py --requests 5000 --connections 32
+    python benchmarks/load_generator.py --port 8080 --requests 20000
+"""
+if __package__ in (None, ""):
+    # Running as a script: make the project root importable (no effect on package imports)
+    import os
+    import sys
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from approval_server import ApprovalServer
+from src.deconfliction_system import DeconflictionSystem
+from src.mission_io import mission_to_dict
+from src.models import waypoint, Mission
+import argparse
+import asyncio
+import json
+import random
+import time
+
+
+def random_mission(rng: random.Random, drone_id: str, area: float) -> Mission:
+    start = rng.uniform(0, 3600)
+    t = start
+    wps = []
+    x, y = rng.uniform(0, area), rng.uniform(0, area)
+    for _ in range(rng.randint(2, 6)):
+        wps.append(waypoint(x, y, rng.uniform(10, 120), t))
+        # Legs of up to 1.5 km flown at 8-25 m/s
+        dx, dy = rng.uniform(-1500, 1500), rng.uniform(-1500, 1500)
+        x, y = min(max(x + dx, 0.0), area), min(max(y + dy, 0.0), area)
+        t += (dx * dx + dy * dy) ** 0.5 / rng.uniform(8, 25)
+    return Mission(waypoints=wps, start_time=start, end_time=t, drone_id=drone_id)
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(q * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+async def client(host, port, bodies, latencies, statuses):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for body in bodies:
+            request = (
+                f"POST /missions HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n\r\n"
+            ).encode("latin-1") + body
+            sent = time.perf_counter()
+            writer.write(request)
+            await writer.drain()
+
+            status_line = await reader.readline()
+            length = 0
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                if name.lower() == "content-length":
+                    length = int(value)
+            payload = await reader.readexactly(length)
+            latencies.append(time.perf_counter() - sent)
+
+            code = int(status_line.split()[1])
+            key = json.loads(payload)["status"] if code == 200 else str(code)
+            statuses[key] = statuses.get(key, 0) + 1
+    finally:
+        writer.close()
+
+
+async def run(args):
+    server = None
+    host, port = args.host, args.port
+    if port is None:
+        system = DeconflictionSystem(safety_distance=args.safety_distance, mode="3d", verbose=False)
+        server = await ApprovalServer(system, host, 0, batch_window=args.batch_window_ms / 1000.0).start()
+        port = server.port
+
+    rng = random.Random(args.seed)
+    bodies = [json.dumps(mission_to_dict(random_mission(rng, f"LOAD_{i:06d}", args.area))).encode("utf-8")
+              for i in range(args.requests)]
+    per_client = [bodies[i::args.connections] for i in range(args.connections)]
+
+    latencies, statuses = [], {}
+    started = time.perf_counter()
+    await asyncio.gather(*(client(host, port, chunk, latencies, statuses) for chunk in per_client if chunk))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    print(f"requests:     {len(latencies)} over {args.connections} keep-alive connections")
+    print(f"elapsed:      {elapsed:.2f}s  ->  {len(latencies) / elapsed:.0f} req/s")
+    print(f"latency p50:  {percentile(latencies, 0.50) * 1000:.2f} ms")
+    print(f"latency p99:  {percentile(latencies, 0.99) * 1000:.2f} ms")
+    print(f"results:      {statuses}")
+    if server is not None:
+        print(f"batches:      {server.batches_run} (avg {len(latencies) / max(1, server.batches_run):.1f} req/batch), "
+              f"shed: {server.requests_shed}")
+        await server.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=None, help="target an already running server")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--connections", type=int, default=16)
+    parser.add_argument("--area", type=float, default=10000.0, help="side of the square airspace (m)")
+    parser.add_argument("--safety-distance", type=float, default=10.0)
+    parser.add_argument("--batch-window-ms", type=float, default=2.0)
+    parser.add_argument("--seed", type=int, default=0)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
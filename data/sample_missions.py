@@ -1,7 +1,8 @@
-import sys
-import os
-# Add the parent directory to Python path so we can import from src
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if __package__ in (None, ""):
+    # Running as a script: make the project root importable (no effect on package imports)
+    import os
+    import sys
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.models import waypoint, Mission
 
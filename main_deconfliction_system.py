@@ -2,132 +2,9 @@
 UAV Strategic Deconfliction System - Main Interface
 Final authority for verifying drone mission safety in shared airspace
 """
-import sys
-import os
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-
 from src.models import waypoint, Mission
-from src.conflict_detector import ConflictDetector
-from data.sample_missions import create_sample_missions_2d, create_sample_missions_3d
-from typing import List, Dict, Tuple
-import json
+from src.deconfliction_system import DeconflictionSystem
 
-class DeconflictionSystem:
-    """
-    Main deconfliction system - serves as final authority for mission approval
-    """
-    
-    def __init__(self, safety_distance: float = 10.0, time_step: float = 1.0, mode: str = "auto"):
-        """
-        Initialize the deconfliction system
-        
-        Args:
-            safety_distance: Minimum safe distance between drones (meters)
-            time_step: Time resolution for conflict checking (seconds)  
-            mode: "2d", "3d", or "auto" for detection mode
-        """
-        self.detector = ConflictDetector(safety_distance, time_step, mode)
-        self.approved_missions = []  # Store approved missions
-        self.rejected_missions = []  # Store rejected missions with reasons
-        
-    def query_mission_safety(self, primary_mission: Mission, other_missions: List[Mission] = None) -> dict:
-        """
-        PRIMARY QUERY FUNCTION: Check if a mission is safe to execute
-        
-        Args:
-            primary_mission: The mission requesting approval
-            other_missions: List of already approved missions to check against
-            
-        Returns:
-            dict: {
-                "status": "APPROVED" or "REJECTED",
-                "conflicts": [...],
-                "recommendations": [...],
-                "mission_id": str,
-                "timestamp": float
-            }
-        """
-        if other_missions is None:
-            other_missions = self.approved_missions
-            
-        # Detect conflicts
-        conflicts = self.detector.check_mission_against_others(primary_mission, other_missions)
-        
-        # Generate recommendations
-        recommendations = self._generate_recommendations(primary_mission, conflicts)
-        
-        # Make decision
-        status = "APPROVED" if len(conflicts) == 0 else "REJECTED"
-        
-        result = {
-            "status": status,
-            "mission_id": primary_mission.drone_id,
-            "conflicts_detected": len(conflicts),
-            "conflicts": conflicts,
-            "recommendations": recommendations,
-            "safety_distance": self.detector.safety_distance,
-            "detection_mode": self.detector.mode
-        }
-        
-        # Store result
-        if status == "APPROVED":
-            self.approved_missions.append(primary_mission)
-            print(f"✅ MISSION APPROVED: {primary_mission.drone_id}")
-        else:
-            self.rejected_missions.append((primary_mission, result))
-            print(f"❌ MISSION REJECTED: {primary_mission.drone_id} - {len(conflicts)} conflicts detected")
-            
-        return result
-    
-    def _generate_recommendations(self, mission: Mission, conflicts: List[str]) -> List[str]:
-        """Generate recommendations to resolve conflicts"""
-        recommendations = []
-        
-        if not conflicts:
-            recommendations.append("Mission approved - no conflicts detected")
-            return recommendations
-            
-        # Analyze conflict patterns
-        altitude_conflicts = sum(1 for c in conflicts if "3D distance" in c)
-        spatial_conflicts = sum(1 for c in conflicts if "distance" in c)
-        
-        if altitude_conflicts > 0 and mission.is_3d_mission():
-            recommendations.append("Consider altitude adjustment: fly 20-30m higher or lower")
-            
-        if spatial_conflicts > 0:
-            recommendations.append("Consider route modification to avoid congested areas")
-            recommendations.append("Consider time delay: start mission 10-15 seconds later")
-            
-        # Specific recommendations based on conflict locations
-        conflict_times = []
-        for conflict in conflicts:
-            try:
-                if "time" in conflict:
-                    time_str = conflict.split("time ")[1].split("s")[0]
-                    conflict_times.append(float(time_str))
-            except:
-                continue
-                
-        if conflict_times:
-            avg_conflict_time = sum(conflict_times) / len(conflict_times)
-            recommendations.append(f"Peak conflict time around {avg_conflict_time:.1f}s - consider avoiding this window")
-            
-        return recommendations
-    
-    def get_system_status(self) -> dict:
-        """Get overall system status"""
-        return {
-            "approved_missions": len(self.approved_missions),
-            "rejected_missions": len(self.rejected_missions),
-            "total_queries": len(self.approved_missions) + len(self.rejected_missions),
-            "approval_rate": len(self.approved_missions) / max(1, len(self.approved_missions) + len(self.rejected_missions)) * 100
-        }
-    
-    def clear_approved_missions(self):
-        """Clear all approved missions (for testing)"""
-        self.approved_missions = []
-        self.rejected_missions = []
-        print("System cleared - all missions removed")
 
 def demo_system():
     """Demonstrate the deconfliction system with various scenarios"""
@@ -136,6 +13,8 @@ def demo_system():
     print("UAV STRATEGIC DECONFLICTION SYSTEM - DEMONSTRATION")
     print("="*80)
     
+    from data.sample_missions import create_sample_missions_2d, create_sample_missions_3d
+
     # Initialize system
     system = DeconflictionSystem(safety_distance=5.0, time_step=1.0, mode="auto")
     
@@ -215,6 +94,7 @@ def create_custom_mission_example():
         print(f"  Waypoint {i}: ({wp.x}, {wp.y}, {wp.z}) at {wp.time}s")
     
     # Test against existing missions
+    from data.sample_missions import create_sample_missions_3d
     system = DeconflictionSystem(safety_distance=8.0, mode="3d")
     existing_missions = create_sample_missions_3d()[:2]  # Use first 2 as existing
     
@@ -0,0 +1,69 @@
+"""
+UAV Strategic Deconfliction System - Conformance Monitor
+Follows live position reports against the approved plans and re-checks drones
+that stray from them against nearby traffic
+
+    python monitor_telemetry.py approved.jsonl --file telemetry.csv --max-deviation 25
+    python monitor_telemetry.py approved.jsonl --udp 127.0.0.1:9500 --mode 3d --safety-distance 10
+
+Reports are CSV lines "drone_id,time,x,y[,z]" or JSON objects, one per line
+(UDP datagrams may carry several lines).
+"""
+from src.conformance import ConformanceMonitor, follow_file, receive_datagrams
+from src.deconfliction_system import DeconflictionSystem
+from src.mission_io import load_missions
+from src.separation_minima import SeparationTable
+import argparse
+import sys
+import time
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("plans", help="approved missions: JSON array or JSON Lines file")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--file", help="follow this report file like tail -f")
+    source.add_argument("--udp", metavar="HOST:PORT", help="receive reports as UDP datagrams")
+    parser.add_argument("--from-end", action="store_true", help="with --file, skip the reports already in it")
+    parser.add_argument("--max-deviation", type=float, default=25.0)
+    parser.add_argument("--lookahead", type=float, default=60.0)
+    parser.add_argument("--recheck-interval", type=float, default=5.0)
+    parser.add_argument("--mode", choices=["2d", "3d", "auto"], default="auto")
+    parser.add_argument("--safety-distance", type=float, default=10.0)
+    parser.add_argument("--time-step", type=float, default=1.0)
+    parser.add_argument("--separation", metavar="JSON", help="per-drone-class separation table")
+    args = parser.parse_args(argv)
+
+    system = DeconflictionSystem(safety_distance=args.safety_distance, time_step=args.time_step, mode=args.mode,
+                                 verbose=False,
+                                 separation=SeparationTable.load(args.separation) if args.separation else None)
+    system.approved_missions = load_missions(args.plans)
+    monitor = ConformanceMonitor(system, args.max_deviation, args.lookahead, args.recheck_interval,
+                                 on_malformed=lambda line, exc: print(f"SKIPPED: {exc}", file=sys.stderr))
+
+    if args.file:
+        lines = follow_file(args.file, from_start=not args.from_end)
+    else:
+        host, _, port = args.udp.rpartition(":")
+        lines = receive_datagrams(host or "127.0.0.1", int(port))
+
+    started = time.perf_counter()
+    try:
+        for deviation in monitor.ingest_lines(lines):
+            where = "no approved plan" if deviation.planned is None else f"{deviation.distance:.1f}m off plan"
+            print(f"DEVIATION: {deviation.drone_id} at {deviation.time:.1f}s, {where}, "
+                  f"{len(deviation.conflicts)} conflict samples ahead", flush=True)
+            for record in deviation.conflicts[:3]:
+                print(f"  - {system.detector.format_conflict(record)}", flush=True)
+    except KeyboardInterrupt:
+        pass
+    except BrokenPipeError:
+        return 0
+    elapsed = time.perf_counter() - started
+    print(f"Checked {monitor.reports} reports in {elapsed:.1f}s, {monitor.deviations} deviations flagged, "
+          f"{monitor.malformed} malformed lines skipped", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,39 @@
+"""
+Core deconfliction package.
+
+Importing `src` is cheap: the public names below are resolved on first access,
+and NumPy / plotting libraries are only imported by the modules that need them
+(engine="numpy", the uncertainty mode, and the visualizations).
+"""
+
+_EXPORTS = {
+    "waypoint": "src.models",
+    "Mission": "src.models",
+    "ConflictDetector": "src.conflict_detector",
+    "ConflictRecord": "src.conflict_detector",
+    "ConformanceMonitor": "src.conformance",
+    "DeconflictionSystem": "src.deconfliction_system",
+    "OccupancyMap": "src.occupancy_map",
+    "ErrorModel": "src.uncertainty",
+    "GeoZone": "src.geofence",
+    "SeparationMinima": "src.separation_minima",
+    "SeparationTable": "src.separation_minima",
+    "mission_from_dict": "src.mission_io",
+    "mission_to_dict": "src.mission_io",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module 'src' has no attribute {name!r}")
+    import importlib
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,120 @@
+from typing import Dict, Iterable, List
+import math
+
+from src.models import Mission
+from src.occupancy_map import OccupancyMap
+
+
+class AltitudeShards:
+    """
+    Approved-mission store partitioned into altitude layers of `layer_height`.
+
+    A mission is stored in every layer its z-range, grown by `reach` (the
+    largest vertical separation) and its position_tolerance, touches. A
+    candidate then only needs the layers its own z-range touches: any mission
+    close enough in altitude to conflict with it shares one of them. Each layer
+    keeps a 2D occupancy map (altitude is already handled by the layer) for the
+    horizontal/time pre-screen.
+
+    Drop-in for OccupancyMap in DeconflictionSystem: same add / remove /
+    rebuild / clear / candidates interface.
+    """
+
+    def __init__(self, layer_height: float, reach: float, cell_size: float, time_bucket: float, margin: float,
+                 max_cells_per_mission: int = 20000):
+        """
+        :param layer_height: Thickness of an altitude layer in meters.
+        :param reach: Vertical distance beyond which two missions never conflict
+            (the safety distance, or a separation table's largest vertical minimum).
+        :param cell_size, time_bucket, margin, max_cells_per_mission: Per-layer
+            occupancy map settings (see OccupancyMap).
+        """
+        if layer_height <= 0:
+            raise ValueError("layer_height must be positive")
+        self.layer_height = layer_height
+        self.reach = reach
+        self.cell_size = cell_size
+        self.time_bucket = time_bucket
+        self.margin = margin
+        self.use_z = True  # what-if overlays built from these settings keep the altitude
+        self.max_cells_per_mission = max_cells_per_mission
+
+        self.shards: Dict[int, OccupancyMap] = {}
+        self._layers: Dict[int, range] = {}
+        self._order: Dict[int, int] = {}  # id(mission) -> insertion sequence
+        self._sequence = 0
+        self._template = self._new_shard()
+
+    def _new_shard(self) -> OccupancyMap:
+        return OccupancyMap(self.cell_size, self.time_bucket, self.margin, use_z=False,
+                            max_cells_per_mission=self.max_cells_per_mission)
+
+    def __len__(self) -> int:
+        return len(self._layers)
+
+    def __contains__(self, mission: Mission) -> bool:
+        return id(mission) in self._layers
+
+    def _span(self, low: float, high: float) -> range:
+        return range(math.floor(low / self.layer_height), math.floor(high / self.layer_height) + 1)
+
+    def stored_layers(self, mission: Mission) -> range:
+        """Layers a stored mission occupies: its z-range grown by reach and its tolerance"""
+        bounds = mission.compiled().bounds
+        grow = self.reach + mission.position_tolerance
+        return self._span(bounds[2] - grow, bounds[5] + grow)
+
+    def query_layers(self, mission: Mission) -> range:
+        """Layers a candidate must be checked in: its own z-range (and tolerance)"""
+        bounds = mission.compiled().bounds
+        return self._span(bounds[2] - mission.position_tolerance, bounds[5] + mission.position_tolerance)
+
+    def add_mission(self, mission: Mission):
+        key = id(mission)
+        if key in self._layers:
+            return
+        layers = self.stored_layers(mission)
+        self._layers[key] = layers
+        self._order[key] = self._sequence
+        self._sequence += 1
+        for layer in layers:
+            shard = self.shards.get(layer)
+            if shard is None:
+                shard = self.shards[layer] = self._new_shard()
+            shard.add_mission(mission)
+
+    def remove_mission(self, mission: Mission):
+        key = id(mission)
+        layers = self._layers.pop(key, None)
+        if layers is None:
+            return
+        del self._order[key]
+        for layer in layers:
+            shard = self.shards[layer]
+            shard.remove_mission(mission)
+            if not len(shard):
+                del self.shards[layer]
+
+    def rebuild(self, missions: Iterable[Mission]):
+        self.clear()
+        for mission in missions:
+            self.add_mission(mission)
+
+    def clear(self):
+        self.shards.clear()
+        self._layers.clear()
+        self._order.clear()
+
+    def candidates(self, mission: Mission) -> List[Mission]:
+        """
+        Pre-screened candidates from every touched layer, each once, in insertion
+        (approval) order like OccupancyMap
+        """
+        cells = self._template.rasterize(mission)  # every layer shares the same 2D grid
+        found: Dict[int, Mission] = {}
+        for layer in self.query_layers(mission):
+            shard = self.shards.get(layer)
+            if shard is not None:
+                for m in shard.candidates_in(cells):
+                    found[id(m)] = m
+        return sorted(found.values(), key=lambda m: self._order[id(m)])
@@ -0,0 +1,87 @@
+from collections import deque
+from itertools import islice
+from typing import Iterator, List, Optional, Tuple
+
+from src.conflict_detector import ConflictDetector, ConflictRecord
+from src.models import Mission
+from src.sweep import iter_overlapping_pairs, windows_overlap
+
+# A task is a block of (primary index, other index) pairs to check
+Task = Tuple[Tuple[int, int], ...]
+
+
+def iter_pairs(missions: List[Mission], primary_index: Optional[int] = None) -> Iterator[Tuple[int, int]]:
+    """
+    Pairs worth checking: every time-overlapping pair (i < j, found by a sweep
+    over start times), or the primary against every other mission it overlaps.
+    """
+    if primary_index is None:
+        yield from iter_overlapping_pairs(missions)
+        return
+    primary = missions[primary_index]
+    for j, other in enumerate(missions):
+        if j != primary_index and windows_overlap(primary, other):
+            yield (primary_index, j)
+
+
+def iter_tasks(missions: List[Mission], primary_index: Optional[int] = None, block: int = 64) -> Iterator[Task]:
+    """Lazily cut the audit's pairs into blocks of at most `block` pairs"""
+    pairs = iter_pairs(missions, primary_index)
+    while True:
+        task = tuple(islice(pairs, block))
+        if not task:
+            return
+        yield task
+
+
+def check_task(detector: ConflictDetector, missions: List[Mission], task: Task) -> List[ConflictRecord]:
+    records = []
+    for i, j in task:
+        primary, other = missions[i], missions[j]
+        if other.drone_id != primary.drone_id:
+            records.extend(detector.find_conflicts(primary, other))
+    return records
+
+
+def iter_conflicts(detector: ConflictDetector, missions: List[Mission],
+                   primary_index: Optional[int] = None) -> Iterator[ConflictRecord]:
+    """Yield conflicts as they are found, one pair block at a time"""
+    for task in iter_tasks(missions, primary_index):
+        yield from check_task(detector, missions, task)
+
+
+# Worker-process state, installed once per worker by the pool initializer
+_worker_detector = None
+_worker_missions = None
+
+
+def _init_worker(detector: ConflictDetector, missions: List[Mission]):
+    global _worker_detector, _worker_missions
+    _worker_detector = detector
+    _worker_missions = missions
+
+
+def _run_task(task: Task) -> List[ConflictRecord]:
+    return check_task(_worker_detector, _worker_missions, task)
+
+
+def iter_conflicts_parallel(detector: ConflictDetector, missions: List[Mission], workers: int,
+                            primary_index: Optional[int] = None,
+                            max_in_flight: int = None) -> Iterator[ConflictRecord]:
+    """
+    Same output and order as iter_conflicts, computed by a process pool.
+
+    Only max_in_flight tasks (default 4 per worker) are outstanding at any time,
+    so memory stays bounded however many pairs the audit covers.
+    """
+    import multiprocessing
+
+    max_in_flight = max_in_flight or 4 * workers
+    with multiprocessing.Pool(workers, initializer=_init_worker, initargs=(detector, missions)) as pool:
+        in_flight = deque()
+        for task in iter_tasks(missions, primary_index):
+            in_flight.append(pool.apply_async(_run_task, (task,)))
+            if len(in_flight) >= max_in_flight:
+                yield from in_flight.popleft().get()
+        while in_flight:
+            yield from in_flight.popleft().get()
@@ -1,26 +1,105 @@
-import sys
-import os
-# Add the parent directory to Python path so we can import from src
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if __package__ in (None, ""):
+    # Running as a script: make the project root importable (no effect on package imports)
+    import os
+    import sys
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from src.models import Mission, waypoint
-from typing import List, Tuple
+from src import kernels
+from typing import Dict, List, NamedTuple, Optional, Tuple
 import math
 
+# Fewer pairs than this are checked inline even when workers > 1 (dispatch would dominate)
+THREADED_MIN_PAIRS = 32
+
+
+class ConflictRecord(NamedTuple):
+    """One sampled loss of separation between two missions"""
+    drone_a: str
+    drone_b: str
+    time: float
+    pos1: Tuple  # (x, y) or (x, y, z)
+    pos2: Tuple
+    distance: float
+
+
+def kernel_set(impl) -> tuple:
+    """(2D, 3D, cylinder) pair kernels of a kernels module; plain functions, so detectors pickle"""
+    return impl.pair_violations_2d, impl.pair_violations_3d, impl.pair_violations_cylinder
+
 
 class ConflictDetector:
     """
     Enhanced conflict detector for both 2D and 3D missions
     """
 
-    def __init__(self, safety_distance: float = 10.0, time_step: float = 1.0, mode: str = "auto"):
+    def __init__(self, safety_distance: float = 10.0, time_step: float = 1.0, mode: str = "auto",
+                 error_models: Dict[str, "ErrorModel"] = None, engine: str = "python",
+                 workers: int = 1, separation: "SeparationTable" = None):
         """
         :param safety_distance: Minimum safe distance between drones in meters.
         :param time_step: Interval in seconds to check positions.
         :param mode: "2d", "3d", or "auto" (auto-detect based on mission data)
+        :param error_models: Optional drone_id -> ErrorModel used by the uncertainty mode.
+        :param engine: "python" or "numpy" sampling kernels (identical results).
+        :param workers: Threads used to check a primary against many missions; the
+            threaded path samples whole chunks of pairs in single NumPy passes.
+        :param separation: Optional SeparationTable of per-drone-class horizontal /
+            vertical minima (cylinders); replaces safety_distance in conflict checks.
         """
         self.safety_distance = safety_distance
         self.time_step = time_step
         self.mode = mode
+        self.error_models = dict(error_models or {})
+        self.engine = engine
+        self.workers = workers
+        self.separation = separation
+        if engine == "numpy":
+            from src import kernels_numpy as impl
+        elif engine == "python":
+            impl = kernels
+        else:
+            raise ValueError(f"Unknown engine: {engine}")
+        self._kernels = kernel_set(impl)
+
+    def set_error_model(self, drone_id: str, model: "ErrorModel"):
+        """Attach a position/timing error model to a drone for probabilistic checks"""
+        self.error_models[drone_id] = model
+
+    def pair_threshold(self, mission1: Mission, mission2: Mission) -> float:
+        """
+        Safety distance widened by any simplification error carried by the missions
+        (the horizontal minimum when a separation table is set)
+        """
+        return self.pair_minima(mission1, mission2)[0]
+
+    def pair_minima(self, mission1: Mission, mission2: Mission) -> Tuple[float, Optional[float]]:
+        """
+        (horizontal, vertical) thresholds of the pair, widened by their position
+        tolerances; vertical is None for the spherical safety_distance check
+        """
+        tolerance = mission1.position_tolerance + mission2.position_tolerance
+        if self.separation is None:
+            return self.safety_distance + tolerance, None
+        horizontal, vertical = self.separation.minima(mission1.drone_class, mission2.drone_class)
+        return horizontal + tolerance, vertical + tolerance
+
+    def minima_against(self, primary: Mission, others: List[Mission]) -> List[Tuple[float, Optional[float]]]:
+        """pair_minima of the primary with each of `others`, read as one row of the class matrix"""
+        if self.separation is None:
+            return [(self.safety_distance + primary.position_tolerance + other.position_tolerance, None)
+                    for other in others]
+        horizontal, vertical = self.separation.row(primary.drone_class, [other.drone_class for other in others])
+        return [(h + primary.position_tolerance + other.position_tolerance,
+                 v + primary.position_tolerance + other.position_tolerance)
+                for h, v, other in zip(horizontal, vertical, others)]
+
+    def sample_times(self, start: float, end: float) -> List[float]:
+        """The sample instants used by the conflict check over [start, end]"""
+        return kernels.sample_times(start, end, self.time_step)
+
+    def is_3d_pair(self, mission1: Mission, mission2: Mission) -> bool:
+        return (self.mode == "3d" or
+                (self.mode == "auto" and (mission1.compiled().is_3d or mission2.compiled().is_3d)))
 
     @staticmethod
     def interpolate_position_3d(wp1: waypoint, wp2: waypoint, t: float) -> Tuple[float, float, float]:
@@ -53,8 +132,8 @@ class ConflictDetector:
         """
         wps = mission.waypoints
         
-        # Determine if this is 3D mission
-        is_3d = self.mode == "3d" or (self.mode == "auto" and mission.is_3d_mission())
+        # Determine if this is 3D mission (flag cached on the compiled trajectory)
+        is_3d = self.mode == "3d" or (self.mode == "auto" and mission.compiled().is_3d)
         
         # If before first waypoint
         if t <= wps[0].time:
@@ -83,62 +162,174 @@ class ConflictDetector:
     def distance_2d(p1: Tuple[float, float], p2: Tuple[float, float]) -> float:
         return math.sqrt((p1[0] - p2[0]) ** 2 + (p1[1] - p2[1]) ** 2)
 
+    @staticmethod
+    def format_conflict_2d(id1: str, id2: str, t: float, pos1: Tuple, pos2: Tuple, d: float) -> str:
+        return (
+            f"CONFLICT: {id1} and {id2} "
+            f"too close at time {t:.1f}s "
+            f"({pos1[0]:.1f}, {pos1[1]:.1f}) vs ({pos2[0]:.1f}, {pos2[1]:.1f}), "
+            f"2D distance {d:.2f}m"
+        )
+
+    @staticmethod
+    def format_conflict_3d(id1: str, id2: str, t: float, pos1: Tuple, pos2: Tuple, d: float) -> str:
+        return (
+            f"CONFLICT: {id1} and {id2} "
+            f"too close at time {t:.1f}s "
+            f"({pos1[0]:.1f}, {pos1[1]:.1f}, {pos1[2]:.1f}) vs "
+            f"({pos2[0]:.1f}, {pos2[1]:.1f}, {pos2[2]:.1f}), "
+            f"3D distance {d:.2f}m"
+        )
+
+    def format_conflict(self, record: ConflictRecord) -> str:
+        fmt = self.format_conflict_3d if len(record.pos1) == 3 else self.format_conflict_2d
+        return fmt(*record)
+
+    def find_conflicts(self, mission1: Mission, mission2: Mission) -> List[ConflictRecord]:
+        """
+        Structured conflict detection for both 2D and 3D missions.
+        The 2D/3D mode is resolved once per pair and the sampling runs in a
+        dimension-specific kernel with no per-sample branching.
+        """
+        # Find overlapping time window
+        start = max(mission1.start_time, mission2.start_time)
+        end = min(mission1.end_time, mission2.end_time)
+        if end < start:
+            return []
+
+        return self._find_conflicts(mission1, mission2, start, end, self._kernels)
+
+    def _screen(self, mission1: Mission, mission2: Mission,
+                minima: Tuple[float, Optional[float]] = None) -> Optional[Tuple[bool, float, Optional[float]]]:
+        """(is_3d, horizontal, vertical) the pair is sampled with, or None if it cannot conflict"""
+        is_3d = self.is_3d_pair(mission1, mission2)
+        horizontal, vertical = self.pair_minima(mission1, mission2) if minima is None else minima
+        # Every position lies in the trajectory's bounding box, so boxes further
+        # apart than the threshold on any axis can never produce a violation
+        limits = (horizontal, horizontal, horizontal if vertical is None else vertical)
+        b1, b2 = mission1.compiled().bounds, mission2.compiled().bounds
+        for axis in range(3 if is_3d else 2):
+            if b2[axis] - b1[axis + 3] > limits[axis] or b1[axis] - b2[axis + 3] > limits[axis]:
+                return None
+        return is_3d, horizontal, vertical
+
+    def _find_conflicts(self, mission1: Mission, mission2: Mission, start: float, end: float,
+                        kernel_set: tuple, minima: Tuple[float, Optional[float]] = None) -> List[ConflictRecord]:
+        """Sample the pair with the given kernel_set() (minima defaults to pair_minima)"""
+        screened = self._screen(mission1, mission2, minima)
+        if screened is None:
+            return []
+        traj1, traj2 = mission1.compiled(), mission2.compiled()
+        is_3d, horizontal, vertical = screened
+
+        kernel_2d, kernel_3d, kernel_cylinder = kernel_set
+        if not is_3d:
+            violations = kernel_2d(traj1, traj2, start, end, self.time_step, horizontal)
+        elif vertical is None:
+            violations = kernel_3d(traj1, traj2, start, end, self.time_step, horizontal)
+        else:
+            violations = kernel_cylinder(traj1, traj2, start, end, self.time_step, horizontal, vertical)
+        id1, id2 = mission1.drone_id, mission2.drone_id
+        return [ConflictRecord(id1, id2, t, pos1, pos2, d) for t, pos1, pos2, d in violations]
+
     def check_conflicts_between_missions(self, mission1: Mission, mission2: Mission) -> List[str]:
         """
         Enhanced conflict detection for both 2D and 3D missions
         """
-        conflicts = []
-        
-        # Determine if we're working in 3D
-        is_3d = (self.mode == "3d" or 
-                (self.mode == "auto" and (mission1.is_3d_mission() or mission2.is_3d_mission())))
-        
-        # Find overlapping time window
+        if self.is_3d_pair(mission1, mission2):
+            fmt = self.format_conflict_3d
+        else:
+            fmt = self.format_conflict_2d
+        return [fmt(*record) for record in self.find_conflicts(mission1, mission2)]
+
+    def conflict_probability(self, mission1: Mission, mission2: Mission,
+                             n_samples: int = 2000, seed=None) -> float:
+        """
+        Probability that the two missions lose separation when flown with their
+        error models (Monte Carlo, pruned by the deterministic geometry first).
+        """
+        from src.uncertainty import ErrorModel, loss_of_separation_probability
+
         start = max(mission1.start_time, mission2.start_time)
         end = min(mission1.end_time, mission2.end_time)
+        horizontal, vertical = self.pair_minima(mission1, mission2)
+        return loss_of_separation_probability(
+            mission1, mission2,
+            self.error_models.get(mission1.drone_id, ErrorModel()),
+            self.error_models.get(mission2.drone_id, ErrorModel()),
+            self.sample_times(start, end), horizontal,
+            self.is_3d_pair(mission1, mission2), n_samples=n_samples, seed=seed,
+            vertical_distance=vertical
+        )
 
-        t = start
-        while t <= end:
-            pos1 = self.get_position_at_time(mission1, t)
-            pos2 = self.get_position_at_time(mission2, t)
-            
-            if is_3d:
-                d = self.distance_3d(pos1, pos2)
-                conflict_msg = (
-                    f"CONFLICT: {mission1.drone_id} and {mission2.drone_id} "
-                    f"too close at time {t:.1f}s "
-                    f"({pos1[0]:.1f}, {pos1[1]:.1f}, {pos1[2]:.1f}) vs "
-                    f"({pos2[0]:.1f}, {pos2[1]:.1f}, {pos2[2]:.1f}), "
-                    f"3D distance {d:.2f}m"
-                )
-            else:
-                d = self.distance_2d(pos1, pos2)
-                conflict_msg = (
-                    f"CONFLICT: {mission1.drone_id} and {mission2.drone_id} "
-                    f"too close at time {t:.1f}s "
-                    f"({pos1[0]:.1f}, {pos1[1]:.1f}) vs ({pos2[0]:.1f}, {pos2[1]:.1f}), "
-                    f"2D distance {d:.2f}m"
-                )
-
-            if d < self.safety_distance:
-                conflicts.append(conflict_msg)
-            
-            t += self.time_step
-        
-        return conflicts
+    def check_mission_probabilistic(self, primary: Mission, others: List[Mission], threshold: float,
+                                    n_samples: int = 2000, seed=None) -> List[Tuple[str, float]]:
+        """
+        Return (drone_id, probability) for every other mission whose loss-of-separation
+        probability with the primary exceeds threshold.
+        """
+        from src.uncertainty import probabilities_against_others
 
-    def check_mission_against_others(self, primary: Mission, others: List[Mission]) -> List[str]:
+        return [
+            (drone_id, p)
+            for drone_id, p in probabilities_against_others(self, primary, others, n_samples, seed)
+            if p > threshold
+        ]
+
+    def separation_series(self, mission1: Mission, mission2: Mission):
+        """(times, distances) NumPy arrays of the pair's separation at every sample instant"""
+        from src.separation import separation_series
+        return separation_series(self, mission1, mission2)
+
+    def closest_approach(self, mission1: Mission, mission2: Mission) -> Tuple[float, float]:
+        """(time, distance) of the exact minimum separation of the piecewise-linear paths"""
+        from src.separation import closest_approach
+        return closest_approach(self, mission1, mission2)
+
+    def find_conflicts_against_others(self, primary: Mission, others: List[Mission]) -> List[ConflictRecord]:
         """
-        Check primary mission against a list of other missions.
+        Structured version of check_mission_against_others.
         """
+        start, end = primary.start_time, primary.end_time
+        others = self._overlapping(primary, others)
+        if self.workers > 1 and len(others) >= THREADED_MIN_PAIRS:
+            from src.parallel import find_conflicts_threaded
+            return find_conflicts_threaded(self, primary, others, self.workers)
+
+        # One row of the class-pair matrix covers every pair: no per-pair table lookups
         all_conflicts = []
-        for other in others:
-            if primary.drone_id != other.drone_id:
-                all_conflicts.extend(
-                    self.check_conflicts_between_missions(primary, other)
-                )
+        for other, minima in zip(others, self.minima_against(primary, others)):
+            all_conflicts.extend(self._find_conflicts(primary, other,
+                                                      max(start, other.start_time), min(end, other.end_time),
+                                                      self._kernels, minima))
         return all_conflicts
 
+    @staticmethod
+    def _overlapping(primary: Mission, others: List[Mission]) -> List[Mission]:
+        """Skip missions flying entirely before or after the primary (and the primary's own drone)"""
+        start, end = primary.start_time, primary.end_time
+        return [other for other in others
+                if other.end_time >= start and other.start_time <= end and other.drone_id != primary.drone_id]
+
+    def find_conflicts_many(self, jobs: List[Tuple[Mission, List[Mission]]]) -> List[List[ConflictRecord]]:
+        """
+        find_conflicts_against_others for several independent (primary, others)
+        jobs. With workers > 1 the pairs of every job go to the thread pool
+        together, so a batch of small checks still keeps the workers busy.
+        """
+        jobs = [(primary, self._overlapping(primary, others)) for primary, others in jobs]
+        if self.workers > 1 and sum(len(others) for _, others in jobs) >= THREADED_MIN_PAIRS:
+            from src.parallel import find_conflicts_many_threaded
+            return find_conflicts_many_threaded(self, jobs, self.workers)
+        return [self.find_conflicts_against_others(primary, others) for primary, others in jobs]
+
+    def check_mission_against_others(self, primary: Mission, others: List[Mission]) -> List[str]:
+        """
+        Check primary mission against a list of other missions.
+        """
+        return [self.format_conflict(record)
+                for record in self.find_conflicts_against_others(primary, others)]
+
 
 # Test both 2D and 3D conflict detection
 if __name__ == "__main__":
@@ -0,0 +1,284 @@
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+import json
+import math
+import os
+import socket
+import time
+
+from src.conflict_detector import ConflictRecord
+from src.kernels import track_3d
+from src.models import waypoint, Mission
+
+
+class PositionReport(NamedTuple):
+    drone_id: str
+    time: float
+    x: float
+    y: float
+    z: float = 0.0
+
+
+class Deviation(NamedTuple):
+    """A report too far from the drone's approved plan, with the tactical re-check result"""
+    drone_id: str
+    time: float
+    reported: Tuple[float, float, float]
+    planned: Optional[Tuple[float, float, float]]  # None: no approved mission covers this time
+    distance: float  # inf without a plan
+    conflicts: List[ConflictRecord]
+
+
+def parse_report(line: str) -> PositionReport:
+    """
+    One report per line: CSV "drone_id,time,x,y[,z]" or a JSON object
+    {"drone_id": .., "time": .., "x": .., "y": .., "z": .. (optional)}
+    """
+    try:
+        if line.startswith("{"):
+            data = json.loads(line)
+            report = PositionReport(str(data["drone_id"]), float(data["time"]), float(data["x"]),
+                                    float(data["y"]), float(data.get("z", 0.0)))
+        else:
+            fields = line.split(",")
+            report = PositionReport(fields[0], *map(float, fields[1:5]))
+        if not all(map(math.isfinite, report[1:])):
+            raise ValueError("time and position must be finite numbers")
+    except (KeyError, TypeError, ValueError) as exc:
+        raise ValueError(f"Invalid position report {line.strip()!r}: {exc!r}") from None
+    return report
+
+
+class _Cursor:
+    """Where one drone is in its plan: the segment used for its previous report"""
+    __slots__ = ("mission", "traj", "k", "is_3d", "next_check")
+
+    def __init__(self, mission: Mission, is_3d: bool):
+        self.mission = mission
+        self.traj = mission.compiled()
+        self.k = 0
+        self.is_3d = is_3d
+        self.next_check = -math.inf
+
+    def planned(self, t: float) -> Tuple[float, float, float]:
+        """
+        Planned position at t, with the arithmetic of the sampling kernels.
+        Reports arrive in time order, so the segment index only moves forward by
+        the odd waypoint passed since the last report: O(1) amortized per report.
+        """
+        traj = self.traj
+        ts = traj.times
+        if t <= ts[0]:
+            return traj.xs[0], traj.ys[0], traj.zs[0]
+        if t >= ts[-1]:
+            return traj.xs[-1], traj.ys[-1], traj.zs[-1]
+        k = self.k
+        while ts[k + 1] < t:
+            k += 1
+        while ts[k] >= t:  # a late (out-of-order) report steps back
+            k -= 1
+        self.k = k
+        dt = t - ts[k]
+        return traj.xs[k] + dt * traj.vxs[k], traj.ys[k] + dt * traj.vys[k], traj.zs[k] + dt * traj.vzs[k]
+
+
+class ConformanceMonitor:
+    """
+    Compares live position reports with the approved plans of a DeconflictionSystem.
+
+    A report further than max_deviation from the planned position (3D in 3D
+    pairs, horizontal otherwise, as the detector would measure it) is flagged.
+    The drone is then re-checked tactically: its plan over the next `lookahead`
+    seconds, shifted by the observed offset, is checked against the approved
+    missions the occupancy pre-screen finds nearby. A drone is re-checked at
+    most once per `recheck_interval` seconds of report time.
+
+    ingest_lines() skips lines that do not parse (counted in `malformed`), so
+    one corrupt report cannot stop a long-running feed.
+    """
+
+    def __init__(self, system, max_deviation: float, lookahead: float = 60.0, recheck_interval: float = 5.0,
+                 on_deviation: Callable[[Deviation], None] = None,
+                 on_malformed: Callable[[str, ValueError], None] = None):
+        """
+        :param system: DeconflictionSystem whose approved missions are the plans.
+        :param max_deviation: Allowed distance from the planned position in meters.
+        :param lookahead: Seconds of (shifted) plan covered by the tactical re-check.
+        :param recheck_interval: Minimum report time between two flags of one drone.
+        :param on_deviation: Optional callback for every flagged Deviation.
+        :param on_malformed: Optional callback (line, error) for every skipped line.
+        """
+        self.system = system
+        self.max_deviation = max_deviation
+        self.lookahead = lookahead
+        self.recheck_interval = recheck_interval
+        self.on_deviation = on_deviation
+        self.on_malformed = on_malformed
+        self.reports = 0
+        self.deviations = 0
+        self.malformed = 0
+        self._plans: Dict[str, List[Mission]] = {}
+        self._cursors: Dict[str, _Cursor] = {}
+        self._unplanned_next: Dict[str, float] = {}
+        self._version = None
+
+    def _reindex(self):
+        """Rebuild drone_id -> plans after the approved store changed, keeping live cursors"""
+        plans: Dict[str, List[Mission]] = {}
+        for mission in self.system.approved_missions:
+            plans.setdefault(mission.drone_id, []).append(mission)
+        for missions in plans.values():
+            missions.sort(key=lambda m: m.start_time)
+        self._plans = plans
+        self._cursors = {drone_id: cursor for drone_id, cursor in self._cursors.items()
+                         if any(m is cursor.mission for m in plans.get(drone_id, ()))}
+        self._version = self.system._version
+
+    def _cursor(self, drone_id: str, t: float) -> Optional[_Cursor]:
+        cursor = self._cursors.get(drone_id)
+        if cursor is not None and cursor.mission.start_time <= t <= cursor.mission.end_time:
+            return cursor
+        for mission in self._plans.get(drone_id, ()):
+            if mission.start_time <= t <= mission.end_time:
+                detector = self.system.detector
+                is_3d = detector.mode == "3d" or (detector.mode == "auto" and mission.compiled().is_3d)
+                replacement = _Cursor(mission, is_3d)
+                if cursor is not None:
+                    replacement.next_check = cursor.next_check
+                self._cursors[drone_id] = replacement
+                return replacement
+        return None
+
+    def ingest(self, report: PositionReport) -> Optional[Deviation]:
+        """Check one report; returns the Deviation if it was flagged"""
+        with self.system._lock:
+            self.system._sync_index()
+        if self._version != self.system._version:
+            self._reindex()
+        self.reports += 1
+        drone_id, t = report.drone_id, report.time
+        cursor = self._cursor(drone_id, t)
+        if cursor is None:
+            if t < self._unplanned_next.get(drone_id, -math.inf):
+                return None
+            self._unplanned_next[drone_id] = t + self.recheck_interval
+            return self._flag(report, None, None, math.inf)
+
+        px, py, pz = cursor.planned(t)
+        dx, dy = report.x - px, report.y - py
+        if cursor.is_3d:
+            dz = report.z - pz
+            distance = math.sqrt(dx * dx + dy * dy + dz * dz)
+        else:
+            distance = math.sqrt(dx * dx + dy * dy)
+        if distance <= self.max_deviation or t < cursor.next_check:
+            return None
+        cursor.next_check = t + self.recheck_interval
+        return self._flag(report, cursor, (px, py, pz), distance)
+
+    def ingest_lines(self, lines: Iterable[str]) -> Iterator[Deviation]:
+        """Parse and check a stream of report lines, yielding deviations as they are flagged"""
+        ingest = self.ingest
+        for line in lines:
+            if line.strip():
+                try:
+                    report = parse_report(line)
+                except ValueError as exc:
+                    self.malformed += 1
+                    if self.on_malformed is not None:
+                        self.on_malformed(line, exc)
+                    continue
+                deviation = ingest(report)
+                if deviation is not None:
+                    yield deviation
+
+    def _flag(self, report: PositionReport, cursor: Optional[_Cursor],
+              planned: Optional[Tuple[float, float, float]], distance: float) -> Deviation:
+        tactical = self._tactical_mission(report, cursor, planned)
+        # Nearby traffic only: the occupancy pre-screen of the approved store
+        with self.system._lock:
+            conflicts = self.system.detector.find_conflicts_against_others(tactical, self.system._prescreen(tactical))
+        deviation = Deviation(report.drone_id, report.time, (report.x, report.y, report.z),
+                              planned, distance, conflicts)
+        self.deviations += 1
+        if self.on_deviation is not None:
+            self.on_deviation(deviation)
+        return deviation
+
+    def _tactical_mission(self, report: PositionReport, cursor: Optional[_Cursor],
+                          planned: Optional[Tuple[float, float, float]]) -> Mission:
+        """
+        Where the drone is expected over the lookahead: the rest of its plan shifted
+        by the current offset (a hover at the reported position without a plan)
+        """
+        t, end = report.time, report.time + self.lookahead
+        if cursor is None:
+            wps = [waypoint(report.x, report.y, report.z, t), waypoint(report.x, report.y, report.z, end)]
+            return Mission(wps, t, end, report.drone_id)
+
+        # A 2D check ignores the reported altitude: keep the planned one
+        z = report.z if cursor.is_3d else planned[2]
+        ox, oy, oz = report.x - planned[0], report.y - planned[1], z - planned[2]
+        mission = cursor.mission
+        end = min(end, mission.end_time)
+        wps = [waypoint(report.x, report.y, z, t)]
+        wps.extend(waypoint(wp.x + ox, wp.y + oy, wp.z + oz, wp.time)
+                   for wp in mission.waypoints if t < wp.time < end)
+        x, y, z = track_3d(cursor.traj, [end])[0]
+        wps.append(waypoint(x + ox, y + oy, z + oz, end))
+        return Mission(wps, t, end, report.drone_id, position_tolerance=mission.position_tolerance,
+                       drone_class=mission.drone_class)
+
+
+def follow_file(path: str, poll_interval: float = 0.05, stop: Callable[[], bool] = None,
+                from_start: bool = True) -> Iterator[str]:
+    """
+    Yield complete lines appended to a file, like `tail -f`, until stop() returns
+    True (checked while idle). Reopens the file if it is rotated or truncated.
+    """
+    stream = open(path, "r", encoding="utf-8", errors="replace")
+    try:
+        if not from_start:
+            stream.seek(0, os.SEEK_END)
+        partial = ""
+        while True:
+            line = stream.readline()
+            if line:
+                if line.endswith("\n"):
+                    yield partial + line
+                    partial = ""
+                else:
+                    partial += line
+                continue
+            if stop is not None and stop():
+                return
+            time.sleep(poll_interval)
+            try:
+                rotated = os.stat(path).st_ino != os.fstat(stream.fileno()).st_ino
+                truncated = os.stat(path).st_size < stream.tell()
+            except FileNotFoundError:
+                continue
+            if rotated or truncated:
+                stream.close()
+                stream = open(path, "r", encoding="utf-8", errors="replace")
+                partial = ""
+    finally:
+        stream.close()
+
+
+def receive_datagrams(host: str, port: int, stop: Callable[[], bool] = None,
+                      bufsize: int = 65536, timeout: float = 0.2) -> Iterator[str]:
+    """Yield report lines from UDP datagrams on (host, port); one datagram may carry many lines"""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4 * 1024 * 1024)
+        sock.bind((host, port))
+        sock.settimeout(timeout)
+        while stop is None or not stop():
+            try:
+                data = sock.recv(bufsize)
+            except socket.timeout:
+                continue
+            # Undecodable bytes become U+FFFD: the line fails to parse and is skipped
+            yield from data.decode("utf-8", errors="replace").splitlines()
+    finally:
+        sock.close()
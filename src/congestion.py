@@ -0,0 +1,154 @@
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.kernels_numpy import sample_times, track
+from src.models import Mission
+from src.sweep import iter_overlapping_pairs
+
+
+class CongestionGrid:
+    """
+    Traffic histogram over (time, x, y) or (time, x, y, z) bins.
+
+    `occupancy` counts drone samples per bin (times time_step gives drone-seconds);
+    `near_misses` counts sampled instants at which two drones were closer than
+    near_miss_distance, binned at the midpoint between them.
+    """
+
+    def __init__(self, edges: Tuple[np.ndarray, ...], occupancy: np.ndarray, near_misses: np.ndarray,
+                 time_step: float, near_miss_distance: Optional[float]):
+        self.edges = edges
+        self.occupancy = occupancy
+        self.near_misses = near_misses
+        self.time_step = time_step
+        self.near_miss_distance = near_miss_distance
+
+    @property
+    def is_3d(self) -> bool:
+        return len(self.edges) == 4
+
+    def drone_seconds(self) -> np.ndarray:
+        return self.occupancy * self.time_step
+
+    def spatial(self, counts: np.ndarray = None) -> np.ndarray:
+        """counts (default occupancy) summed over time and altitude: an (x, y) map"""
+        counts = self.occupancy if counts is None else counts
+        summed = counts.sum(axis=0)
+        return summed.sum(axis=2) if self.is_3d else summed
+
+    def timeline(self, counts: np.ndarray = None) -> np.ndarray:
+        """counts (default occupancy) per time bin"""
+        counts = self.occupancy if counts is None else counts
+        return counts.reshape(counts.shape[0], -1).sum(axis=1)
+
+    def hotspots(self, k: int = 10, counts: np.ndarray = None) -> List[tuple]:
+        """The k busiest bins as (t0, x0, y0[, z0], count), by lower bin edge"""
+        counts = self.occupancy if counts is None else counts
+        flat = counts.ravel()
+        k = min(k, int(np.count_nonzero(flat)))
+        if k == 0:
+            return []
+        top = np.argpartition(flat, -k)[-k:]
+        top = top[np.argsort(flat[top])[::-1]]
+        spots = []
+        for index in zip(*np.unravel_index(top, counts.shape)):
+            lower = tuple(float(edges[i]) for edges, i in zip(self.edges, index))
+            spots.append(lower + (int(counts[index]),))
+        return spots
+
+
+def _edges(lo: float, hi: float, width: float) -> np.ndarray:
+    """Bin edges of the given width aligned to multiples of it, covering [lo, hi]"""
+    first = np.floor(lo / width) * width
+    count = max(1, int(np.ceil((hi - first) / width)))
+    if first + count * width <= hi:
+        count += 1
+    return first + width * np.arange(count + 1)
+
+
+def compute_congestion(missions: Sequence[Mission], time_step: float = 1.0, cell_size: float = 500.0,
+                       time_bin: float = 900.0, altitude_bin: float = None,
+                       near_miss_distance: float = None, mode: str = "auto") -> CongestionGrid:
+    """
+    Sample every mission on one shared time grid (vectorized interpolation per
+    mission) and histogram the positions into time/space bins.
+
+    :param time_step: Spacing of the shared sample grid in seconds.
+    :param cell_size: Horizontal bin edge in meters.
+    :param time_bin: Bin length in seconds.
+    :param altitude_bin: Vertical bin height in meters; None bins in 2D (x, y) only.
+    :param near_miss_distance: If set, also count sampled instants at which two
+        drones are closer than this (time-overlapping pairs only, via the sweep line).
+    :param mode: How near-miss distances are measured, as in ConflictDetector:
+        "2d", "3d", or "auto" (3D when either mission of the pair is 3D).
+        Independent of altitude_bin, which only adds a histogram axis.
+    """
+    dims = 3 if altitude_bin is not None else 2
+    missions = list(missions)
+    if not missions:
+        empty = tuple(np.zeros(2) for _ in range(dims + 1))
+        shape = (1,) * (dims + 1)
+        return CongestionGrid(empty, np.zeros(shape, dtype=np.int64), np.zeros(shape, dtype=np.int64),
+                              time_step, near_miss_distance)
+
+    start = min(m.start_time for m in missions)
+    end = max(m.end_time for m in missions)
+    grid = sample_times(start, end, time_step)
+
+    windows = []  # (first grid index, end grid index, positions[dims, n]) per mission
+    chunks = []
+    for mission in missions:
+        lo = int(np.searchsorted(grid, mission.start_time, side="left"))
+        hi = int(np.searchsorted(grid, mission.end_time, side="right"))
+        times = grid[lo:hi]
+        positions = track(mission.compiled(), times, 3)
+        windows.append((lo, hi, positions))
+        chunks.append(np.vstack((times, positions[:dims])))
+    points = np.hstack(chunks)
+
+    bounds = [m.compiled().bounds for m in missions]
+    edges = [_edges(start, end, time_bin),
+             _edges(min(b[0] for b in bounds), max(b[3] for b in bounds), cell_size),
+             _edges(min(b[1] for b in bounds), max(b[4] for b in bounds), cell_size)]
+    if dims == 3:
+        edges.append(_edges(min(b[2] for b in bounds), max(b[5] for b in bounds), altitude_bin))
+    occupancy, _ = np.histogramdd(points.T, bins=edges)
+
+    near = np.zeros_like(occupancy)
+    if near_miss_distance is not None:
+        midpoints = _near_miss_points(missions, windows, grid, dims, near_miss_distance, mode)
+        if midpoints.shape[1]:
+            near, _ = np.histogramdd(midpoints.T, bins=edges)
+
+    return CongestionGrid(tuple(edges), occupancy.astype(np.int64), near.astype(np.int64),
+                          time_step, near_miss_distance)
+
+
+def _near_miss_points(missions: List[Mission], windows: List[tuple], grid: np.ndarray,
+                      dims: int, distance: float, mode: str) -> np.ndarray:
+    """
+    (1 + dims, n) time and midpoint (on the histogram axes) of every sampled instant
+    a pair is closer than distance, measured in 2D or 3D as the detector would
+    """
+    out = []
+    for i, j in iter_overlapping_pairs(missions):
+        a, b = missions[i].compiled(), missions[j].compiled()
+        axes = 3 if mode == "3d" or (mode == "auto" and (a.is_3d or b.is_3d)) else 2
+        # Bounding boxes further apart than the distance on any measured axis cannot come close
+        if any(b.bounds[k] - a.bounds[k + 3] > distance or a.bounds[k] - b.bounds[k + 3] > distance
+               for k in range(axes)):
+            continue
+        lo_i, hi_i, pos_i = windows[i]
+        lo_j, hi_j, pos_j = windows[j]
+        lo, hi = max(lo_i, lo_j), min(hi_i, hi_j)
+        if hi <= lo:
+            continue
+        # Positions were already sampled on the shared grid: just slice the overlap
+        times = grid[lo:hi]
+        p1 = pos_i[:, lo - lo_i:hi - lo_i]
+        p2 = pos_j[:, lo - lo_j:hi - lo_j]
+        close = np.flatnonzero(((p1[:axes] - p2[:axes]) ** 2).sum(axis=0) < distance * distance)
+        if close.size:
+            out.append(np.vstack((times[close], (p1[:dims, close] + p2[:dims, close]) / 2)))
+    return np.hstack(out) if out else np.empty((dims + 1, 0))
@@ -0,0 +1,434 @@
+from src.models import Mission, simplify_mission
+from src.conflict_detector import ConflictDetector, ConflictRecord
+from src.altitude_shards import AltitudeShards
+from src.occupancy_map import OccupancyMap
+from src.separation_minima import SeparationTable
+from typing import List
+import contextlib
+import functools
+
+
+def _serialized(method):
+    """Run a store-touching method under the system's lock (the replan scheduler's, once enabled)"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+class DeconflictionSystem:
+    """
+    Main deconfliction system - serves as final authority for mission approval
+    """
+    
+    def __init__(self, safety_distance: float = 10.0, time_step: float = 1.0, mode: str = "auto",
+                 index_cell_size: float = None, index_time_bucket: float = None,
+                 probability_threshold: float = None, monte_carlo_samples: int = 2000,
+                 verbose: bool = True, simplify_epsilon: float = None, workers: int = 1,
+                 separation: SeparationTable = None, altitude_layer: float = None):
+        """
+        Initialize the deconfliction system
+        
+        Args:
+            safety_distance: Minimum safe distance between drones (meters)
+            time_step: Time resolution for conflict checking (seconds)  
+            mode: "2d", "3d", or "auto" for detection mode
+            index_cell_size: Voxel edge of the occupancy pre-screen (default 4x safety distance)
+            index_time_bucket: Time bucket of the occupancy pre-screen (default 10x time step)
+            probability_threshold: If set, also reject missions whose loss-of-separation
+                probability (from the detector's error models) exceeds this value
+            monte_carlo_samples: Perturbed trajectories per pair in the probabilistic check
+            verbose: Print a line for every approval / rejection
+            simplify_epsilon: If set, compress each queried mission's waypoints with
+                this error bound (meters) before checking and storing it
+            workers: Threads used when a query has many candidate missions to check
+            separation: Per-drone-class horizontal / vertical minima (SeparationTable);
+                replaces safety_distance in conflict checks, and the pre-screen
+                is sized from its largest minimum
+            altitude_layer: If set (3d / auto mode only), shard the approved store
+                into altitude layers of this thickness; a query is only screened
+                against the layers its own altitude range touches
+        """
+        if altitude_layer is not None and mode == "2d":
+            raise ValueError("altitude_layer needs altitude data: use mode '3d' or 'auto'")
+        self.detector = ConflictDetector(safety_distance, time_step, mode, workers=workers,
+                                         separation=separation)
+        # The pre-screen must cover the widest class pair on every axis
+        reach = separation.max_separation() if separation is not None else safety_distance
+        self.approved_missions = []  # Store approved missions
+        self.rejected_missions = []  # Store rejected missions with reasons
+        if altitude_layer is None:
+            self.occupancy = OccupancyMap(
+                cell_size=index_cell_size or 4 * reach,
+                time_bucket=index_time_bucket or 10 * time_step,
+                margin=reach / 2,
+                use_z=(mode != "2d")
+            )
+        else:
+            self.occupancy = AltitudeShards(
+                altitude_layer,
+                reach=separation.max_vertical() if separation is not None else safety_distance,
+                cell_size=index_cell_size or 4 * reach,
+                time_bucket=index_time_bucket or 10 * time_step,
+                margin=reach / 2
+            )
+        self.probability_threshold = probability_threshold
+        self.monte_carlo_samples = monte_carlo_samples
+        self.verbose = verbose
+        self.simplify_epsilon = simplify_epsilon
+        self.replan_queue = None  # see enable_replanning()
+        self.geofences = None  # GeofenceIndex, see add_geofences()
+        self._version = 0  # bumped on every change to the approved store (what-if sessions)
+        self._indexed = self.approved_missions  # the list the occupancy index mirrors
+        # Replaced by the replan scheduler's RLock in enable_replanning(): its background
+        # thread retries missions against the same store as the public entry points
+        self._lock = contextlib.nullcontext()
+        
+    @_serialized
+    def query_mission_safety(self, primary_mission: Mission, other_missions: List[Mission] = None,
+                             response_format: str = "full", sample_limit: int = 5):
+        """
+        PRIMARY QUERY FUNCTION: Check if a mission is safe to execute
+        
+        Args:
+            primary_mission: The mission requesting approval
+            other_missions: List of already approved missions to check against
+            response_format: "full" (every conflict message), "summary" (counts,
+                coalesced conflict intervals and at most sample_limit messages),
+                "json" (summary as a compact JSON string) or "binary" (summary as bytes)
+            sample_limit: Number of conflict messages kept in summary responses
+            
+        Returns:
+            dict: {
+                "status": "APPROVED" or "REJECTED",
+                "conflicts": [...],
+                "recommendations": [...],
+                "mission_id": str,
+                "timestamp": float
+            }
+            (or the summary dict / str / bytes for the other response formats)
+        """
+        if response_format not in ("full", "summary", "json", "binary"):
+            raise ValueError(f"Unknown response format: {response_format}")
+        if self.simplify_epsilon is not None:
+            primary_mission = simplify_mission(primary_mission, self.simplify_epsilon)
+
+        probabilistic_pool = other_missions
+        if other_missions is None:
+            probabilistic_pool = self.approved_missions
+            # Pre-screen the approved store: only missions sharing a voxel can conflict
+            other_missions = self._prescreen(primary_mission)
+            
+        result, conflicts, probable_conflicts = self._evaluate(
+            primary_mission, other_missions, probabilistic_pool, response_format, sample_limit
+        )
+        self._record(primary_mission, result, conflicts, probable_conflicts)
+        return self._encode(result, response_format)
+
+    def _record(self, primary_mission: Mission, result: dict, conflicts: List[ConflictRecord],
+                probable_conflicts: list):
+        """Store a decision: approve into the store, or keep the rejection (and park it for replanning)"""
+        if result["status"] == "APPROVED":
+            self._add_approved(primary_mission)
+            if self.verbose:
+                print(f"✅ MISSION APPROVED: {primary_mission.drone_id}")
+        else:
+            self.rejected_missions.append((primary_mission, result))
+            zones = result.get("geofence_violations", [])
+            if self.replan_queue is not None:
+                blockers = {c.drone_b for c in conflicts} | {drone_id for drone_id, _ in probable_conflicts}
+                # A restricted zone never goes away by itself: don't park the mission
+                self.replan_queue.add(primary_mission, blockers if not zones else ())
+            if self.verbose:
+                print(f"❌ MISSION REJECTED: {primary_mission.drone_id} - {len(conflicts)} conflicts detected"
+                      + (f", {len(probable_conflicts)} probable" if probable_conflicts else "")
+                      + (f", enters {len(zones)} restricted zones" if zones else ""))
+
+    def _evaluate(self, primary_mission: Mission, other_missions: List[Mission],
+                  probabilistic_pool: List[Mission], response_format: str, sample_limit: int,
+                  conflicts: List[ConflictRecord] = None):
+        """Decide a mission against the given traffic (or its precomputed conflicts) without storing anything"""
+        # Detect conflicts
+        if conflicts is None:
+            conflicts = self.detector.find_conflicts_against_others(primary_mission, other_missions)
+
+        # Static restricted volumes (no-fly zones)
+        geofence_violations = []
+        if self.geofences is not None:
+            use_altitude = self.detector.mode == "3d" or (
+                self.detector.mode == "auto" and primary_mission.is_3d_mission())
+            geofence_violations = self.geofences.check_mission(primary_mission, use_altitude)
+
+        # Uncertainty mode: only worth sampling when the nominal plans are already clear
+        probable_conflicts = []
+        if self.probability_threshold is not None and not conflicts and not geofence_violations:
+            probable_conflicts = self.detector.check_mission_probabilistic(
+                primary_mission, probabilistic_pool, self.probability_threshold,
+                n_samples=self.monte_carlo_samples
+            )
+        
+        # Generate recommendations
+        recommendations = self._generate_recommendations(primary_mission, conflicts)
+        if probable_conflicts:
+            worst = max(probable_conflicts, key=lambda item: item[1])
+            recommendations = [
+                f"Loss-of-separation probability with {worst[0]} is {worst[1]:.1%} "
+                f"(limit {self.probability_threshold:.1%}) - increase spatial or temporal margins"
+            ]
+        if geofence_violations:
+            if not conflicts:
+                recommendations = []
+            recommendations.extend(
+                f"Route enters restricted zone {v.zone_id} at {v.time:.1f}s - reroute around it"
+                for v in geofence_violations
+            )
+        
+        # Make decision
+        status = "APPROVED" if not (conflicts or probable_conflicts or geofence_violations) else "REJECTED"
+        
+        if response_format == "full":
+            result = {
+                "status": status,
+                "mission_id": primary_mission.drone_id,
+                "conflicts_detected": len(conflicts),
+                "conflicts": [self.detector.format_conflict(c) for c in conflicts],
+                "recommendations": recommendations,
+                "safety_distance": self.detector.safety_distance,
+                "detection_mode": self.detector.mode
+            }
+        else:
+            from src.serialization import coalesce_intervals
+
+            # Only the sampled messages are ever formatted
+            result = {
+                "status": status,
+                "mission_id": primary_mission.drone_id,
+                "conflicts_detected": len(conflicts),
+                "conflict_intervals": coalesce_intervals(conflicts, self.detector.time_step),
+                "conflict_sample": [self.detector.format_conflict(c) for c in conflicts[:sample_limit]],
+                "recommendations": recommendations,
+                "safety_distance": self.detector.safety_distance,
+                "detection_mode": self.detector.mode
+            }
+        if self.probability_threshold is not None:
+            result["probable_conflicts"] = [
+                {"drone_id": drone_id, "probability": p} for drone_id, p in probable_conflicts
+            ]
+        if self.geofences is not None:
+            result["geofence_violations"] = [
+                {"zone_id": v.zone_id, "time": v.time, "position": list(v.position)} for v in geofence_violations
+            ]
+        
+        return result, conflicts, probable_conflicts
+
+    @staticmethod
+    def _encode(result: dict, response_format: str):
+        if response_format == "json":
+            from src.serialization import encode_json
+            return encode_json(result)
+        if response_format == "binary":
+            from src.serialization import encode_binary
+            return encode_binary(result)
+        return result
+    
+    @_serialized
+    def query_mission_batch(self, missions: List[Mission], response_format: str = "summary",
+                            sample_limit: int = 5) -> list:
+        """
+        Decide a batch of missions in arrival order. Each approval is visible to
+        the missions after it, exactly as if they had been queried one by one.
+
+        The checks against the store as it stood before the batch are independent,
+        so they run first, in one pass (a single thread-pool job when workers > 1).
+        Only the checks against missions approved earlier in the same batch run in
+        order, directly against that short list.
+        """
+        if response_format not in ("full", "summary", "json", "binary"):
+            raise ValueError(f"Unknown response format: {response_format}")
+        if self.simplify_epsilon is not None:
+            missions = [simplify_mission(m, self.simplify_epsilon) for m in missions]
+        self._sync_index()
+        stored = self.detector.find_conflicts_many([(m, self.occupancy.candidates(m)) for m in missions])
+
+        results = []
+        approved_here = []
+        for mission, conflicts in zip(missions, stored):
+            conflicts = conflicts + self.detector.find_conflicts_against_others(mission, approved_here)
+            result, conflicts, probable_conflicts = self._evaluate(
+                mission, None, self.approved_missions, response_format, sample_limit, conflicts
+            )
+            self._record(mission, result, conflicts, probable_conflicts)
+            if result["status"] == "APPROVED":
+                approved_here.append(mission)
+            results.append(self._encode(result, response_format))
+        return results
+
+    def _add_approved(self, mission: Mission):
+        self.approved_missions.append(mission)
+        self.occupancy.add_mission(mission)
+        self._version += 1
+        if self.replan_queue is not None:
+            self.replan_queue.discard(mission.drone_id)
+
+    def _remove_approved(self, missions: List[Mission]):
+        removed = {id(m) for m in missions}
+        self.approved_missions = self._indexed = [m for m in self.approved_missions if id(m) not in removed]
+        for mission in missions:
+            self.occupancy.remove_mission(mission)
+        self._version += 1
+        if self.replan_queue is not None:
+            self.replan_queue.notify_removed(missions)
+
+    def _sync_index(self):
+        """Rebuild the occupancy index if approved_missions was replaced or resized directly"""
+        if self._indexed is not self.approved_missions or len(self.occupancy) != len(self.approved_missions):
+            self.occupancy.rebuild(self.approved_missions)
+            self._indexed = self.approved_missions
+            self._version += 1
+
+    def _prescreen(self, mission: Mission) -> List[Mission]:
+        """Return the approved missions that may conflict with `mission`"""
+        self._sync_index()
+        return self.occupancy.candidates(mission)
+
+    @_serialized
+    def expire_missions(self, current_time: float) -> List[Mission]:
+        """Remove approved missions that finished before current_time and free their airspace"""
+        expired = [m for m in self.approved_missions if m.end_time < current_time]
+        if expired:
+            self._remove_approved(expired)
+        return expired
+
+    @_serialized
+    def cancel_mission(self, drone_id: str) -> List[Mission]:
+        """Withdraw the approved mission(s) of a drone and free their airspace"""
+        cancelled = [m for m in self.approved_missions if m.drone_id == drone_id]
+        if cancelled:
+            self._remove_approved(cancelled)
+        return cancelled
+
+    def enable_replanning(self, replanner=None, priority=None, max_attempts: int = 5):
+        """
+        Park future rejections in a ReplanScheduler that retries them when the
+        missions blocking them expire or are cancelled. Returns the scheduler
+        (call process_pending() or start() on it). From then on the system's
+        entry points share the scheduler's lock, so a started scheduler can
+        retry while other threads query.
+        """
+        from src.replan_queue import ReplanScheduler
+
+        self.replan_queue = ReplanScheduler(self, replanner=replanner, priority=priority,
+                                            max_attempts=max_attempts)
+        self._lock = self.replan_queue.lock
+        return self.replan_queue
+
+    def add_geofences(self, zones, cell_size: float = 1000.0):
+        """
+        Register static restricted volumes (GeoZone) that every query is checked
+        against. The first call builds the spatial index with the given cell size.
+        """
+        from src.geofence import GeofenceIndex
+
+        if self.geofences is None:
+            self.geofences = GeofenceIndex(cell_size=cell_size)
+        for zone in zones:
+            self.geofences.add_zone(zone)
+        return self.geofences
+
+    def what_if(self):
+        """
+        Open a copy-on-write session over the approved store: queries and
+        cancellations inside it are only visible to the session until commit().
+        Any number of sessions can be open at once.
+        """
+        from src.what_if import WhatIfSession
+
+        return WhatIfSession(self)
+
+    def congestion(self, cell_size: float = None, time_bin: float = 900.0, altitude_bin: float = None):
+        """
+        CongestionGrid of the approved missions, sampled at the detector's time step,
+        with near misses counted below the safety distance, measured in 2D or 3D
+        like the detector's mode. altitude_bin adds a vertical histogram axis
+        (ignored in "2d" mode). Render it with
+        visualizations/visualize_congestion.py.
+        """
+        from src.congestion import compute_congestion
+
+        return compute_congestion(
+            self.approved_missions,
+            time_step=self.detector.time_step,
+            cell_size=cell_size or 10 * self.detector.safety_distance,
+            time_bin=time_bin,
+            altitude_bin=altitude_bin if self.detector.mode != "2d" else None,
+            near_miss_distance=self.detector.safety_distance,
+            mode=self.detector.mode
+        )
+
+    @_serialized
+    def snapshot(self) -> tuple:
+        """Capture the approved / rejected stores for a later restore()"""
+        return (tuple(self.approved_missions), len(self.rejected_missions))
+
+    @_serialized
+    def restore(self, snapshot: tuple):
+        """Roll the stores back (or forward) to a snapshot taken on this system"""
+        approved, n_rejected = snapshot
+        kept = {id(m) for m in approved}
+        dropped = [m for m in self.approved_missions if id(m) not in kept]
+        self.approved_missions = self._indexed = list(approved)
+        del self.rejected_missions[n_rejected:]
+        self.occupancy.rebuild(self.approved_missions)
+        self._version += 1
+        if self.replan_queue is not None and dropped:
+            self.replan_queue.notify_removed(dropped)
+
+    def _generate_recommendations(self, mission: Mission, conflicts: List[ConflictRecord]) -> List[str]:
+        """Generate recommendations to resolve conflicts"""
+        recommendations = []
+        
+        if not conflicts:
+            recommendations.append("Mission approved - no conflicts detected")
+            return recommendations
+            
+        # Analyze conflict patterns
+        altitude_conflicts = sum(1 for c in conflicts if len(c.pos1) == 3)
+        spatial_conflicts = len(conflicts)
+        
+        if altitude_conflicts > 0 and mission.is_3d_mission():
+            recommendations.append("Consider altitude adjustment: fly 20-30m higher or lower")
+            
+        if spatial_conflicts > 0:
+            recommendations.append("Consider route modification to avoid congested areas")
+            recommendations.append("Consider time delay: start mission 10-15 seconds later")
+            
+        # Specific recommendations based on conflict locations
+        # Rounded like the times shown in the conflict messages
+        conflict_times = [round(c.time, 1) for c in conflicts]
+                
+        if conflict_times:
+            avg_conflict_time = sum(conflict_times) / len(conflict_times)
+            recommendations.append(f"Peak conflict time around {avg_conflict_time:.1f}s - consider avoiding this window")
+            
+        return recommendations
+    
+    def get_system_status(self) -> dict:
+        """Get overall system status"""
+        return {
+            "approved_missions": len(self.approved_missions),
+            "rejected_missions": len(self.rejected_missions),
+            "total_queries": len(self.approved_missions) + len(self.rejected_missions),
+            "approval_rate": len(self.approved_missions) / max(1, len(self.approved_missions) + len(self.rejected_missions)) * 100
+        }
+    
+    @_serialized
+    def clear_approved_missions(self):
+        """Clear all approved missions (for testing)"""
+        self.approved_missions = self._indexed = []
+        self.rejected_missions = []
+        self.occupancy.clear()
+        self._version += 1
+        if self.replan_queue is not None:
+            self.replan_queue.clear()
+        print("System cleared - all missions removed")
@@ -0,0 +1,376 @@
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+import math
+
+from src.models import Mission
+
+INF = float("inf")
+
+
+@dataclass
+class GeoZone:
+    """
+    A static restricted volume: a simple polygon (x, y vertices) extruded from
+    floor to ceiling, optionally active only between start_time and end_time.
+    """
+    zone_id: str
+    polygon: List[Tuple[float, float]]
+    floor: float = -INF
+    ceiling: float = INF
+    start_time: float = -INF
+    end_time: float = INF
+    bbox: Tuple[float, float, float, float] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.polygon = [(float(x), float(y)) for x, y in self.polygon]
+        if len(self.polygon) < 3:
+            raise ValueError(f"zone {self.zone_id}: a polygon needs at least 3 vertices")
+        if self.ceiling < self.floor:
+            raise ValueError(f"zone {self.zone_id}: ceiling {self.ceiling} is below floor {self.floor}")
+        if self.end_time < self.start_time:
+            raise ValueError(f"zone {self.zone_id}: end_time {self.end_time} is before start_time {self.start_time}")
+        xs = [x for x, _ in self.polygon]
+        ys = [y for _, y in self.polygon]
+        self.bbox = (min(xs), min(ys), max(xs), max(ys))
+
+    def contains_xy(self, x: float, y: float) -> bool:
+        """Even-odd point-in-polygon test (points on an edge count as inside)"""
+        inside = False
+        poly = self.polygon
+        x1, y1 = poly[-1]
+        for x2, y2 in poly:
+            if _on_edge(x, y, x1, y1, x2, y2):
+                return True
+            if (y1 > y) != (y2 > y) and x < x1 + (y - y1) * (x2 - x1) / (y2 - y1):
+                inside = not inside
+            x1, y1 = x2, y2
+        return inside
+
+
+class GeofenceViolation(NamedTuple):
+    """First entry of a mission into a restricted zone"""
+    drone_id: str
+    zone_id: str
+    time: float
+    position: Tuple[float, float, float]
+
+
+def _on_edge(x, y, x1, y1, x2, y2, eps=1e-9) -> bool:
+    cross = (x2 - x1) * (y - y1) - (y2 - y1) * (x - x1)
+    if abs(cross) > eps * max(1.0, abs(x2 - x1) + abs(y2 - y1)):
+        return False
+    return min(x1, x2) - eps <= x <= max(x1, x2) + eps and min(y1, y2) - eps <= y <= max(y1, y2) + eps
+
+
+def _edge_crossings(zone: GeoZone, ax, ay, dx, dy, lo: float, hi: float) -> List[float]:
+    """Parameters s in [lo, hi] where a + s*d meets a polygon edge"""
+    hits = []
+    poly = zone.polygon
+    x1, y1 = poly[-1]
+    for x2, y2 in poly:
+        ex, ey = x2 - x1, y2 - y1
+        denom = dx * ey - dy * ex
+        if denom != 0.0:
+            qx, qy = x1 - ax, y1 - ay
+            s = (qx * ey - qy * ex) / denom
+            u = (qx * dy - qy * dx) / denom
+            if lo <= s <= hi and 0.0 <= u <= 1.0:
+                hits.append(s)
+        x1, y1 = x2, y2
+    return hits
+
+
+def _interval(a: float, b: float, low: float, high: float, lo: float, hi: float):
+    """Sub-range of [lo, hi] where low <= a + s*b <= high (None if empty)"""
+    if b == 0.0:
+        return (lo, hi) if low <= a <= high else None
+    s0, s1 = (low - a) / b, (high - a) / b
+    lo, hi = max(lo, min(s0, s1)), min(hi, max(s0, s1))
+    return (lo, hi) if lo <= hi else None
+
+
+def _disk_entry(ax, ay, dx, dy, cx, cy, r: float, lo: float, hi: float) -> Optional[float]:
+    """First s in [lo, hi] where a + s*d lies within r of (cx, cy)"""
+    qx, qy = ax - cx, ay - cy
+    a = dx * dx + dy * dy
+    b = 2.0 * (qx * dx + qy * dy)
+    c = qx * qx + qy * qy - r * r
+    if a == 0.0:
+        return lo if c <= 0.0 else None
+    disc = b * b - 4.0 * a * c
+    if disc < 0.0:
+        return None
+    root = math.sqrt(disc)
+    s0, s1 = (-b - root) / (2.0 * a), (-b + root) / (2.0 * a)
+    if s1 < lo or s0 > hi:
+        return None
+    return max(lo, s0)
+
+
+def _capsule_entry(ax, ay, dx, dy, x1, y1, x2, y2, r: float, lo: float, hi: float) -> Optional[float]:
+    """First s in [lo, hi] where a + s*d comes within r of the polygon edge (x1, y1) -> (x2, y2)"""
+    entries = [s for s in (_disk_entry(ax, ay, dx, dy, x1, y1, r, lo, hi),
+                           _disk_entry(ax, ay, dx, dy, x2, y2, r, lo, hi)) if s is not None]
+    ex, ey = x2 - x1, y2 - y1
+    length = math.hypot(ex, ey)
+    if length > 0.0:
+        # The rectangle around the edge: perpendicular offset within r, projection on the edge
+        ux, uy = ex / length, ey / length
+        qx, qy = ax - x1, ay - y1
+        band = _interval(qx * uy - qy * ux, dx * uy - dy * ux, -r, r, lo, hi)
+        if band is not None:
+            span = _interval(qx * ux + qy * uy, dx * ux + dy * uy, 0.0, length, *band)
+            if span is not None:
+                entries.append(span[0])
+    return min(entries) if entries else None
+
+
+def segment_entry(zone: GeoZone, p0: Tuple[float, float, float], p1: Tuple[float, float, float],
+                  t0: float, t1: float, use_altitude: bool = True, tolerance: float = 0.0) -> Optional[float]:
+    """
+    Exact test of the straight space-time segment p0@t0 -> p1@t1 against the
+    zone's prism and active window. Returns the segment parameter s in [0, 1] of
+    the first point inside the zone, or None if the segment never enters it.
+
+    With a tolerance (the mission's position_tolerance), the prism is grown by
+    it: floor and ceiling move out, and the polygon gains a margin of that width.
+    Any path within tolerance of the segment that touches the zone is caught.
+    """
+    lo, hi = 0.0, 1.0
+
+    # Active window, as a range of s
+    if t1 > t0:
+        lo = max(lo, (zone.start_time - t0) / (t1 - t0))
+        hi = min(hi, (zone.end_time - t0) / (t1 - t0))
+    elif not zone.start_time <= t0 <= zone.end_time:
+        return None
+
+    # Altitude slab
+    if use_altitude:
+        slab = _interval(p0[2], p1[2] - p0[2], zone.floor - tolerance, zone.ceiling + tolerance, lo, hi)
+        if slab is None:
+            return None
+        lo, hi = slab
+    if lo > hi:
+        return None
+
+    # Polygon: inside at the start of the range, or crossing an edge later on
+    ax, ay = p0[0], p0[1]
+    dx, dy = p1[0] - ax, p1[1] - ay
+    if zone.contains_xy(ax + lo * dx, ay + lo * dy):
+        return lo
+    if tolerance > 0.0:
+        # Entering the grown polygon means first coming within tolerance of an edge
+        entries = []
+        poly = zone.polygon
+        x1, y1 = poly[-1]
+        for x2, y2 in poly:
+            s = _capsule_entry(ax, ay, dx, dy, x1, y1, x2, y2, tolerance, lo, hi)
+            if s is not None:
+                entries.append(s)
+            x1, y1 = x2, y2
+        return min(entries) if entries else None
+    hits = _edge_crossings(zone, ax, ay, dx, dy, lo, hi)
+    return min(hits) if hits else None
+
+
+class GeofenceIndex:
+    """
+    Uniform grid over the zones' horizontal bounding boxes. A mission segment is
+    tested exactly only against the zones registered in the cells its own
+    bounding box covers, so the cost per segment depends on local zone density,
+    not on the total number of zones.
+    """
+
+    def __init__(self, zones: Iterable[GeoZone] = (), cell_size: float = 1000.0,
+                 max_cells_per_zone: int = 4096):
+        """
+        :param cell_size: Edge of an index cell in meters.
+        :param max_cells_per_zone: Zones covering more cells than this (very large
+            areas) are kept in a small list that every query checks by bounding box.
+        """
+        if cell_size <= 0:
+            raise ValueError("cell_size must be positive")
+        self.cell_size = cell_size
+        self.max_cells_per_zone = max_cells_per_zone
+        self._zones: Dict[str, GeoZone] = {}
+        self._cells: Dict[Tuple[int, int], Set[str]] = {}
+        self._large: Set[str] = set()
+        for zone in zones:
+            self.add_zone(zone)
+
+    def __len__(self) -> int:
+        return len(self._zones)
+
+    def __contains__(self, zone_id: str) -> bool:
+        return zone_id in self._zones
+
+    def zones(self) -> List[GeoZone]:
+        return list(self._zones.values())
+
+    def _cell_range(self, min_x, min_y, max_x, max_y):
+        size = self.cell_size
+        return (range(math.floor(min_x / size), math.floor(max_x / size) + 1),
+                range(math.floor(min_y / size), math.floor(max_y / size) + 1))
+
+    def add_zone(self, zone: GeoZone):
+        """Index a zone; a zone with an existing zone_id replaces it"""
+        if zone.zone_id in self._zones:
+            self.remove_zone(zone.zone_id)
+        self._zones[zone.zone_id] = zone
+        ix, iy = self._cell_range(*zone.bbox)
+        if len(ix) * len(iy) > self.max_cells_per_zone:
+            self._large.add(zone.zone_id)
+            return
+        for cx in ix:
+            for cy in iy:
+                self._cells.setdefault((cx, cy), set()).add(zone.zone_id)
+
+    def remove_zone(self, zone_id: str) -> Optional[GeoZone]:
+        zone = self._zones.pop(zone_id, None)
+        if zone is None:
+            return None
+        if zone_id in self._large:
+            self._large.discard(zone_id)
+            return zone
+        ix, iy = self._cell_range(*zone.bbox)
+        for cx in ix:
+            for cy in iy:
+                members = self._cells.get((cx, cy))
+                if members is not None:
+                    members.discard(zone_id)
+                    if not members:
+                        del self._cells[(cx, cy)]
+        return zone
+
+    def candidates(self, min_x: float, min_y: float, max_x: float, max_y: float) -> List[GeoZone]:
+        """Zones whose bounding box overlaps the given box"""
+        ix, iy = self._cell_range(min_x, min_y, max_x, max_y)
+        if len(ix) * len(iy) > len(self._cells):
+            ids = set(self._zones)  # box larger than the occupied index: scan instead
+        else:
+            ids = set(self._large)
+            for cx in ix:
+                for cy in iy:
+                    members = self._cells.get((cx, cy))
+                    if members:
+                        ids.update(members)
+        out = []
+        for zone_id in ids:
+            zone = self._zones[zone_id]
+            zx0, zy0, zx1, zy1 = zone.bbox
+            if zx0 <= max_x and min_x <= zx1 and zy0 <= max_y and min_y <= zy1:
+                out.append(zone)
+        return out
+
+    def segment_candidates(self, p0: Tuple[float, ...], p1: Tuple[float, ...],
+                           tolerance: float = 0.0) -> List[GeoZone]:
+        """
+        Zones registered in the cells the horizontal segment p0 -> p1 passes
+        through (a supercover walk, one column of cells at a time), whose bounding
+        box also overlaps the segment's. Any zone the segment enters, or comes
+        within tolerance of, is included.
+        """
+        x0, y0, x1, y1 = p0[0], p0[1], p1[0], p1[1]
+        if x1 < x0:
+            x0, y0, x1, y1 = x1, y1, x0, y0
+        size = self.cell_size
+        pad = 1e-9 * size + tolerance  # keep cells the segment only grazes at a boundary
+        ids = set(self._large)
+        cells = self._cells
+        first, last = math.floor((x0 - tolerance) / size), math.floor((x1 + tolerance) / size)
+        for cx in range(first, last + 1):
+            if x1 > x0:
+                # Points of the column lie within tolerance of this slice of the segment
+                xa = min(max(x0, cx * size - tolerance), x1)
+                xb = max(min(x1, (cx + 1) * size + tolerance), x0)
+                ya = y0 + (xa - x0) * (y1 - y0) / (x1 - x0)
+                yb = y0 + (xb - x0) * (y1 - y0) / (x1 - x0)
+            else:
+                ya, yb = y0, y1
+            for cy in range(math.floor((min(ya, yb) - pad) / size), math.floor((max(ya, yb) + pad) / size) + 1):
+                members = cells.get((cx, cy))
+                if members:
+                    ids.update(members)
+        min_x, min_y = x0 - tolerance, min(y0, y1) - tolerance
+        max_x, max_y = x1 + tolerance, max(y0, y1) + tolerance
+        out = []
+        for zone_id in ids:
+            zone = self._zones[zone_id]
+            zx0, zy0, zx1, zy1 = zone.bbox
+            if zx0 <= max_x and min_x <= zx1 and zy0 <= max_y and min_y <= zy1:
+                out.append(zone)
+        return out
+
+    def check_mission(self, mission: Mission, use_altitude: bool = True) -> List[GeofenceViolation]:
+        """
+        First entry into every zone the mission flies through during its window,
+        ordered by time. The drone holds its first / last waypoint outside the
+        waypoint times, like the conflict check assumes. Zones are grown by the
+        mission's position_tolerance, so a simplified path stays conservative.
+        """
+        if not self._zones:
+            return []
+        tolerance = mission.position_tolerance
+        entries: Dict[str, Tuple[float, Tuple[float, float, float]]] = {}
+        for p0, p1, t0, t1 in _flown_segments(mission):
+            for zone in self.segment_candidates(p0, p1, tolerance):
+                if zone.zone_id in entries and entries[zone.zone_id][0] <= t0:
+                    continue
+                s = segment_entry(zone, p0, p1, t0, t1, use_altitude, tolerance)
+                if s is None:
+                    continue
+                t = t0 + s * (t1 - t0)
+                if zone.zone_id not in entries or t < entries[zone.zone_id][0]:
+                    position = tuple(a + s * (b - a) for a, b in zip(p0, p1))
+                    entries[zone.zone_id] = (t, position)
+        violations = [GeofenceViolation(mission.drone_id, zone_id, t, position)
+                      for zone_id, (t, position) in entries.items()]
+        violations.sort(key=lambda v: (v.time, v.zone_id))
+        return violations
+
+
+def _flown_segments(mission: Mission):
+    """
+    (p0, p1, t0, t1) straight pieces of the path, clipped to the mission window.
+    Zero-duration segments are kept as instantaneous jumps, so they are checked too.
+    """
+    traj = mission.compiled()
+    ts, xs, ys, zs = traj.times, traj.xs, traj.ys, traj.zs
+    start, end = mission.start_time, mission.end_time
+
+    def at(t):
+        # Clamped position from the precompiled segment velocities
+        if t <= ts[0]:
+            return (xs[0], ys[0], zs[0])
+        if t >= ts[-1]:
+            return (xs[-1], ys[-1], zs[-1])
+        k = bisect_left(ts, t) - 1
+        dt = t - ts[k]
+        return (xs[k] + dt * traj.vxs[k], ys[k] + dt * traj.vys[k], zs[k] + dt * traj.vzs[k])
+
+    first, last = bisect_right(ts, start), bisect_left(ts, end)
+    times = [start] + ts[first:last] + [end]
+    points = [at(start)] + [(xs[i], ys[i], zs[i]) for i in range(first, last)] + [at(end)]
+    for k in range(len(times) - 1):
+        yield points[k], points[k + 1], times[k], times[k + 1]
+
+
+def zone_from_dict(data: Dict) -> GeoZone:
+    """
+    Build a GeoZone from its JSON form:
+    {"zone_id": str, "polygon": [[x, y], ...], "floor": .., "ceiling": ..,
+     "start_time": .., "end_time": ..}  (the last four optional)
+    """
+    try:
+        return GeoZone(
+            zone_id=data["zone_id"],
+            polygon=[tuple(vertex) for vertex in data["polygon"]],
+            floor=data.get("floor", -INF),
+            ceiling=data.get("ceiling", INF),
+            start_time=data.get("start_time", -INF),
+            end_time=data.get("end_time", INF),
+        )
+    except (KeyError, TypeError) as exc:
+        raise ValueError(f"Invalid zone record: {exc!r}") from exc
@@ -0,0 +1,100 @@
+from math import sqrt
+from typing import List, Tuple
+
+from src.models import CompiledTrajectory
+
+# A violation is (time, position1, position2, distance)
+Violation = Tuple[float, tuple, tuple, float]
+
+
+def sample_times(start: float, end: float, step: float) -> List[float]:
+    """Sample instants start, start + step, ... <= end (accumulated exactly like the reference loop)"""
+    times = []
+    t = start
+    while t <= end:
+        times.append(t)
+        t += step
+    return times
+
+
+def track_2d(traj: CompiledTrajectory, times: List[float]) -> List[Tuple[float, float]]:
+    """
+    (x, y) at each of the ascending sample times, from the precompiled segment
+    velocities. A cursor walks the segments alongside the samples, so the whole
+    track costs O(samples + waypoints).
+    """
+    ts, xs, ys = traj.times, traj.xs, traj.ys
+    vxs, vys = traj.vxs, traj.vys
+    first, last = ts[0], ts[-1]
+    out = []
+    i = 1
+    for t in times:
+        if t <= first:
+            out.append((xs[0], ys[0]))
+        elif t >= last:
+            out.append((xs[-1], ys[-1]))
+        else:
+            while ts[i] < t:
+                i += 1
+            k = i - 1  # segment k = waypoints k -> k + 1, with ts[k] < t <= ts[k + 1]
+            dt = t - ts[k]
+            out.append((xs[k] + dt * vxs[k], ys[k] + dt * vys[k]))
+    return out
+
+
+def track_3d(traj: CompiledTrajectory, times: List[float]) -> List[Tuple[float, float, float]]:
+    """(x, y, z) at each of the ascending sample times (see track_2d)"""
+    ts, xs, ys, zs = traj.times, traj.xs, traj.ys, traj.zs
+    vxs, vys, vzs = traj.vxs, traj.vys, traj.vzs
+    first, last = ts[0], ts[-1]
+    out = []
+    i = 1
+    for t in times:
+        if t <= first:
+            out.append((xs[0], ys[0], zs[0]))
+        elif t >= last:
+            out.append((xs[-1], ys[-1], zs[-1]))
+        else:
+            while ts[i] < t:
+                i += 1
+            k = i - 1
+            dt = t - ts[k]
+            out.append((xs[k] + dt * vxs[k], ys[k] + dt * vys[k], zs[k] + dt * vzs[k]))
+    return out
+
+
+def pair_violations_2d(traj1: CompiledTrajectory, traj2: CompiledTrajectory,
+                       start: float, end: float, step: float, threshold: float) -> List[Violation]:
+    times = sample_times(start, end, step)
+    out = []
+    for t, p1, p2 in zip(times, track_2d(traj1, times), track_2d(traj2, times)):
+        d = sqrt((p1[0] - p2[0]) ** 2 + (p1[1] - p2[1]) ** 2)
+        if d < threshold:
+            out.append((t, p1, p2, d))
+    return out
+
+
+def pair_violations_3d(traj1: CompiledTrajectory, traj2: CompiledTrajectory,
+                       start: float, end: float, step: float, threshold: float) -> List[Violation]:
+    times = sample_times(start, end, step)
+    out = []
+    for t, p1, p2 in zip(times, track_3d(traj1, times), track_3d(traj2, times)):
+        d = sqrt((p1[0] - p2[0]) ** 2 + (p1[1] - p2[1]) ** 2 + (p1[2] - p2[2]) ** 2)
+        if d < threshold:
+            out.append((t, p1, p2, d))
+    return out
+
+
+def pair_violations_cylinder(traj1: CompiledTrajectory, traj2: CompiledTrajectory, start: float, end: float,
+                             step: float, horizontal: float, vertical: float) -> List[Violation]:
+    """3D samples closer than `horizontal` in x/y and `vertical` in z; distance is still the 3D one"""
+    times = sample_times(start, end, step)
+    out = []
+    for t, p1, p2 in zip(times, track_3d(traj1, times), track_3d(traj2, times)):
+        dz = abs(p1[2] - p2[2])
+        if dz >= vertical:
+            continue
+        h2 = (p1[0] - p2[0]) ** 2 + (p1[1] - p2[1]) ** 2
+        if sqrt(h2) < horizontal:
+            out.append((t, p1, p2, sqrt(h2 + dz * dz)))
+    return out
@@ -0,0 +1,190 @@
+from typing import List
+
+import numpy as np
+
+from src.models import CompiledTrajectory
+from src.kernels import Violation
+
+
+def trajectory_arrays(traj: CompiledTrajectory):
+    """(times, coords[3, n]) float64 arrays, cached on the compiled trajectory"""
+    return _arrays(traj)[:2]
+
+
+def segment_velocities(traj: CompiledTrajectory) -> np.ndarray:
+    """velocities[3, n - 1] of the precompiled segments"""
+    return _arrays(traj)[2]
+
+
+def _arrays(traj: CompiledTrajectory):
+    if traj.arrays is None:
+        traj.arrays = (np.array(traj.times, dtype=float),
+                       np.array([traj.xs, traj.ys, traj.zs], dtype=float),
+                       np.array([traj.vxs, traj.vys, traj.vzs], dtype=float))
+    return traj.arrays
+
+
+def sample_times(start: float, end: float, step: float) -> np.ndarray:
+    """Same instants as kernels.sample_times: a sequential cumulative sum, trimmed at end"""
+    if end < start:
+        return np.empty(0)
+    count = int((end - start) // step) + 3
+    times = np.full(count, step, dtype=float)
+    times[0] = start
+    times = np.cumsum(times)
+    return times[times <= end]
+
+
+def track(traj: CompiledTrajectory, times: np.ndarray, dims: int, side: str = None) -> np.ndarray:
+    """
+    (dims, len(times)) clamped linear positions, same arithmetic as the pure-Python
+    kernels. At the instant of a jump (a zero-duration segment that moves) that
+    means the position before it, except at the last waypoint time.
+    side="left" / "right" instead give the one-sided limits: the position just
+    before / just after each instant.
+    """
+    ts, coords, velocities = _arrays(traj)
+    coords = coords[:dims]
+    k = np.clip(np.searchsorted(ts, times, side=side or "left"), 1, ts.size - 1) - 1
+    pos = coords[:, k] + (times - ts[k]) * velocities[:dims, k]
+
+    pos = np.where(times > ts[-1] if side == "left" else times >= ts[-1], coords[:, -1:], pos)
+    return np.where(times < ts[0] if side == "right" else times <= ts[0], coords[:, :1], pos)
+
+
+def _violations(traj1, traj2, start, end, step, threshold, dims, vertical=None) -> List[Violation]:
+    times = sample_times(start, end, step)
+    if times.size == 0:
+        return []
+    p1 = track(traj1, times, dims)
+    p2 = track(traj2, times, dims)
+    diff = p1 - p2
+    total = diff[0] ** 2 + diff[1] ** 2
+    if vertical is None:
+        if dims == 3:
+            total = total + diff[2] ** 2
+        d = np.sqrt(total)
+        hit = np.flatnonzero(d < threshold)
+    else:
+        # Cylinder: horizontal and vertical minima tested separately, 3D distance reported
+        hit = np.flatnonzero((np.sqrt(total) < threshold) & (np.abs(diff[2]) < vertical))
+        d = np.sqrt(total + diff[2] ** 2)
+    if hit.size == 0:
+        return []
+    p1 = p1[:, hit].T.tolist()
+    p2 = p2[:, hit].T.tolist()
+    return [(t, tuple(a), tuple(b), dist)
+            for t, a, b, dist in zip(times[hit].tolist(), p1, p2, d[hit].tolist())]
+
+
+def pair_violations_2d(traj1: CompiledTrajectory, traj2: CompiledTrajectory,
+                       start: float, end: float, step: float, threshold: float) -> List[Violation]:
+    return _violations(traj1, traj2, start, end, step, threshold, 2)
+
+
+def pair_violations_3d(traj1: CompiledTrajectory, traj2: CompiledTrajectory,
+                       start: float, end: float, step: float, threshold: float) -> List[Violation]:
+    return _violations(traj1, traj2, start, end, step, threshold, 3)
+
+
+def pair_violations_cylinder(traj1: CompiledTrajectory, traj2: CompiledTrajectory, start: float, end: float,
+                             step: float, horizontal: float, vertical: float) -> List[Violation]:
+    return _violations(traj1, traj2, start, end, step, horizontal, 3, vertical)
+
+
+def _stack(trajs: List[CompiledTrajectory]):
+    """
+    (times, coords[3, N], velocities[3, N], first index, last index, search keys)
+    of several trajectories laid end to end. Velocities get a zero column per
+    trajectory so that a segment's velocity shares its start waypoint's index.
+    """
+    arrays = [_arrays(traj) for traj in trajs]
+    sizes = np.array([times.size for times, _, _ in arrays])
+    last = np.cumsum(sizes) - 1
+    pad = np.zeros((3, 1))
+    ts = np.concatenate([times for times, _, _ in arrays])
+    # Each waypoint time as its rank among all of them, offset by trajectory:
+    # integers that sort by (trajectory, time), so one searchsorted finds the
+    # segments of samples that belong to different trajectories
+    ranked = np.sort(ts)
+    keys = np.repeat(np.arange(len(trajs)), sizes) * (ts.size + 1) + np.searchsorted(ranked, ts)
+    return (ts,
+            np.concatenate([coords for _, coords, _ in arrays], axis=1),
+            np.concatenate([part for _, _, v in arrays for part in (v, pad)], axis=1),
+            last - sizes + 1, last, (ranked, keys))
+
+
+def _track_stacked(stacked, labels: np.ndarray, times: np.ndarray, ranks: np.ndarray) -> np.ndarray:
+    """
+    (3, len(times)) positions of trajectory labels[i] at times[i], with the
+    arithmetic of track(traj, times, 3); ranks are the times' ranks among the
+    stacked waypoint times, shared by every call on the same samples.
+    """
+    ts, coords, velocities, first, last, (_, keys) = stacked
+    # t > waypoint time exactly when t ranks above it among all waypoint times
+    after = np.searchsorted(keys, labels * (ts.size + 1) + ranks)
+
+    lo, hi = first[labels], last[labels]
+    k = np.clip(after, lo + 1, np.maximum(hi, lo + 1)) - 1
+    pos = np.take(coords, k, axis=1) + (times - ts[k]) * np.take(velocities, k, axis=1)
+    pos = np.where(times >= ts[hi], np.take(coords, hi, axis=1), pos)
+    return np.where(times <= ts[lo], np.take(coords, lo, axis=1), pos)
+
+
+def pairs_violations(pairs: List[tuple], step: float) -> List[List[Violation]]:
+    """
+    Violations of many pairs in one pass, each list equal to what the pair
+    kernels above return for it. pairs holds (traj1, traj2, start, end, is_3d,
+    horizontal, vertical) tuples with start <= end; a 3D pair with a vertical
+    minimum is tested as a cylinder.
+    """
+    if not pairs:
+        return []
+    trajs, slots = [], {}
+    labels1, labels2 = [], []
+    for traj1, traj2, *_ in pairs:
+        for traj, labels in ((traj1, labels1), (traj2, labels2)):
+            slot = slots.get(id(traj))
+            if slot is None:
+                slot = slots[id(traj)] = len(trajs)
+                trajs.append(traj)
+            labels.append(slot)
+
+    # sample_times for every pair: one sequential cumsum per row, trimmed at each end
+    starts = np.array([pair[2] for pair in pairs], dtype=float)
+    ends = np.array([pair[3] for pair in pairs], dtype=float)
+    width = int(((ends - starts) // step).max()) + 3
+    grid = np.full((len(pairs), width), step, dtype=float)
+    grid[:, 0] = starts
+    grid = np.cumsum(grid, axis=1)
+    keep = grid <= ends[:, None]
+    counts = keep.sum(axis=1)
+    times = grid[keep]
+    owner = np.repeat(np.arange(len(pairs)), counts)
+
+    stacked = _stack(trajs)
+    ranks = np.searchsorted(stacked[-1][0], times)
+    p1 = _track_stacked(stacked, np.array(labels1)[owner], times, ranks)
+    p2 = _track_stacked(stacked, np.array(labels2)[owner], times, ranks)
+    diff = p1 - p2
+    horizontal = np.repeat(np.array([pair[5] for pair in pairs], dtype=float), counts)
+    vertical = np.repeat(np.array([np.nan if pair[6] is None else pair[6] for pair in pairs]), counts)
+    is_3d = np.repeat(np.array([pair[4] for pair in pairs], dtype=bool), counts)
+    cylinder = is_3d & ~np.isnan(vertical)
+
+    total = diff[0] ** 2 + diff[1] ** 2
+    planar = np.sqrt(total)
+    d = np.where(is_3d, np.sqrt(total + diff[2] ** 2), planar)
+    hit = np.flatnonzero(np.where(cylinder, (planar < horizontal) & (np.abs(diff[2]) < vertical),
+                                  d < horizontal))
+
+    found = [[] for _ in pairs]
+    if hit.size == 0:
+        return found
+    p1 = zip(*np.take(p1, hit, axis=1).tolist())
+    p2 = zip(*np.take(p2, hit, axis=1).tolist())
+    for pair, t, a, b, dist in zip(owner[hit].tolist(), times[hit].tolist(), p1, p2, d[hit].tolist()):
+        if not pairs[pair][4]:
+            a, b = a[:2], b[:2]
+        found[pair].append((t, a, b, dist))
+    return found
@@ -0,0 +1,68 @@
+from typing import Dict, Iterator, List
+import json
+import sys
+
+from src.models import waypoint, Mission
+
+
+def mission_from_dict(data: Dict) -> Mission:
+    """
+    Build a Mission from its JSON form:
+    {"drone_id": str, "drone_class": str (optional), "start_time": float, "end_time": float,
+     "waypoints": [{"x": .., "y": .., "z": .. (optional), "time": ..}, ...]}
+    """
+    try:
+        wps = [waypoint(wp["x"], wp["y"], wp.get("z", 0.0), wp["time"]) for wp in data["waypoints"]]
+        drone_id, drone_class = data.get("drone_id", "unknown"), data.get("drone_class", "default")
+        for name, value in (("drone_id", drone_id), ("drone_class", drone_class)):
+            if not isinstance(value, str):
+                raise TypeError(f"{name} must be a string, got {value!r}")
+        return Mission(
+            waypoints=wps,
+            start_time=data["start_time"],
+            end_time=data["end_time"],
+            drone_id=drone_id,
+            drone_class=drone_class
+        )
+    except (KeyError, TypeError, AttributeError) as exc:
+        raise ValueError(f"Invalid mission record: {exc!r}") from exc
+
+
+def mission_to_dict(mission: Mission) -> Dict:
+    return {
+        "drone_id": mission.drone_id,
+        "drone_class": mission.drone_class,
+        "start_time": mission.start_time,
+        "end_time": mission.end_time,
+        "waypoints": [{"x": wp.x, "y": wp.y, "z": wp.z, "time": wp.time} for wp in mission.waypoints],
+    }
+
+
+def iter_missions(path: str) -> Iterator[Mission]:
+    """
+    Yield missions from a file: a JSON array of mission objects, or JSON Lines
+    (one mission object per line, read incrementally). "-" reads from stdin.
+    """
+    stream = sys.stdin if path == "-" else open(path, "r", encoding="utf-8")
+    try:
+        first = stream.read(1)
+        while first and first.isspace():
+            first = stream.read(1)
+        if not first:
+            return
+        if first == "[":
+            for data in json.loads(first + stream.read()):
+                yield mission_from_dict(data)
+            return
+        line = first + stream.readline()
+        while line:
+            if line.strip():
+                yield mission_from_dict(json.loads(line))
+            line = stream.readline()
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+def load_missions(path: str) -> List[Mission]:
+    return list(iter_missions(path))
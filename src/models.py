@@ -1,5 +1,5 @@
-from dataclasses import dataclass
-from typing import List
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
 import math
 
 @dataclass
@@ -29,6 +29,93 @@ class waypoint:
         "check if this waypoint has meaningful altitude data"
         return self.z != 0.0
 
+class WaypointList(list):
+    """
+    A mission's waypoint list. Every change to the list bumps `version`, so the
+    compiled trajectory is checked for staleness in O(1); edits to a waypoint's
+    own fields are not seen (use Mission.invalidate_trajectory).
+    """
+
+    version = 0  # a class default, so copies rebuilt item by item (pickle) work too
+
+    def _changed(method):
+        def wrapper(self, *args):
+            result = method(self, *args)
+            self.version += 1
+            return result
+        wrapper.__name__ = method.__name__
+        return wrapper
+
+    __setitem__ = _changed(list.__setitem__)
+    __delitem__ = _changed(list.__delitem__)
+    __iadd__ = _changed(list.__iadd__)
+    __imul__ = _changed(list.__imul__)
+    append = _changed(list.append)
+    extend = _changed(list.extend)
+    insert = _changed(list.insert)
+    pop = _changed(list.pop)
+    remove = _changed(list.remove)
+    clear = _changed(list.clear)
+    reverse = _changed(list.reverse)
+
+    def sort(self, *, key=None, reverse=False):
+        super().sort(key=key, reverse=reverse)
+        self.version += 1
+
+    del _changed
+
+
+class CompiledTrajectory:
+    """
+    Flat per-axis arrays of a mission's waypoints plus per-segment geometry
+    (durations, velocities, bounding boxes), validated and built once and reused
+    by the detector kernels. Segment k runs from waypoint k to waypoint k + 1.
+    """
+    __slots__ = ("source", "version", "count", "times", "xs", "ys", "zs", "is_3d",
+                 "durations", "vxs", "vys", "vzs", "bboxes", "bounds", "arrays")
+
+    def __init__(self, waypoints: List[waypoint]):
+        if len(waypoints) < 2:
+            raise ValueError(f"a mission needs at least 2 waypoints, got {len(waypoints)} "
+                             "(hold a position with two waypoints at the same place)")
+        self.source = waypoints
+        self.version = getattr(waypoints, "version", None)  # WaypointList version compiled
+        self.count = len(waypoints)
+        self.times = [wp.time for wp in waypoints]
+        self.xs = [wp.x for wp in waypoints]
+        self.ys = [wp.y for wp in waypoints]
+        self.zs = [wp.z for wp in waypoints]
+        for name, values in (("time", self.times), ("x", self.xs), ("y", self.ys), ("z", self.zs)):
+            if not all(map(math.isfinite, values)):
+                raise ValueError(f"waypoint {name} values must be finite numbers")
+        for k in range(self.count - 1):
+            if self.times[k + 1] < self.times[k]:
+                raise ValueError(f"waypoint times must be non-decreasing: "
+                                 f"waypoint {k + 1} at {self.times[k + 1]} follows {self.times[k]}")
+        self.is_3d = any(wp.is_3d() for wp in waypoints)
+
+        self.durations = []
+        self.vxs, self.vys, self.vzs = [], [], []
+        self.bboxes = []  # (min_x, min_y, min_z, max_x, max_y, max_z) per segment
+        for k in range(self.count - 1):
+            x1, y1, z1 = self.xs[k], self.ys[k], self.zs[k]
+            x2, y2, z2 = self.xs[k + 1], self.ys[k + 1], self.zs[k + 1]
+            dt = self.times[k + 1] - self.times[k]
+            self.durations.append(dt)
+            if dt > 0:
+                self.vxs.append((x2 - x1) / dt)
+                self.vys.append((y2 - y1) / dt)
+                self.vzs.append((z2 - z1) / dt)
+            else:
+                # Zero-length segment: the drone is taken to be at its first waypoint
+                self.vxs.append(0.0)
+                self.vys.append(0.0)
+                self.vzs.append(0.0)
+            self.bboxes.append((min(x1, x2), min(y1, y2), min(z1, z2), max(x1, x2), max(y1, y2), max(z1, z2)))
+        self.bounds = (min(self.xs), min(self.ys), min(self.zs), max(self.xs), max(self.ys), max(self.zs))
+        self.arrays = None  # NumPy copies, filled in lazily by the vectorized kernels
+
+
 @dataclass
 class Mission:
     """A complete drone mission with multiple waypoints"""
@@ -36,7 +123,106 @@ class Mission:
     start_time: float # when mission starts in seconds
     end_time: float #when mission must finish in seconds
     drone_id: str = "unknown"
+    position_tolerance: float = 0.0  # max deviation from the flown path (set by simplify_mission)
+    drone_class: str = "default"  # row of the detector's SeparationTable
+    _compiled: Optional[CompiledTrajectory] = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.validate()
+
+    def __setattr__(self, name, value):
+        if name == "waypoints" and type(value) is not WaypointList:
+            value = WaypointList(value)
+        object.__setattr__(self, name, value)
+
+    def validate(self):
+        "check the waypoints and mission window (ValueError) and compile the trajectory"
+        if not (math.isfinite(self.start_time) and math.isfinite(self.end_time)):
+            raise ValueError(f"mission {self.drone_id}: start_time and end_time must be finite")
+        if self.end_time < self.start_time:
+            raise ValueError(f"mission {self.drone_id}: end_time {self.end_time} is before start_time {self.start_time}")
+        try:
+            traj = self.compiled()
+        except ValueError as exc:
+            raise ValueError(f"mission {self.drone_id}: {exc}") from None
+        if self.start_time > traj.times[-1] or self.end_time < traj.times[0]:
+            raise ValueError(f"mission {self.drone_id}: window [{self.start_time}, {self.end_time}] "
+                             f"does not overlap the waypoint times [{traj.times[0]}, {traj.times[-1]}]")
     
+    def compiled(self) -> CompiledTrajectory:
+        "cached trajectory; rebuilt when waypoints is reassigned or the list is changed"
+        traj = self._compiled
+        waypoints = self.waypoints
+        if traj is None or traj.source is not waypoints or traj.version != waypoints.version:
+            traj = self._compiled = CompiledTrajectory(waypoints)
+        return traj
+
+    def invalidate_trajectory(self):
+        "call after editing a waypoint's fields in place so the cached trajectory is rebuilt"
+        self._compiled = None
+
     def is_3d_mission(self):
         "check if this mission uses 3D coordinates"
-        return any(wp.is_3d() for wp in self.waypoints)
\ No newline at end of file
+        return self.compiled().is_3d
+
+
+def _sed(wp: waypoint, a: waypoint, b: waypoint) -> float:
+    "synchronized euclidean distance: how far wp is from where segment a->b puts the drone at wp.time"
+    if b.time == a.time:
+        return wp.distance_to(a)
+    ratio = (wp.time - a.time) / (b.time - a.time)
+    return math.sqrt(
+        (wp.x - (a.x + ratio * (b.x - a.x)))**2 +
+        (wp.y - (a.y + ratio * (b.y - a.y)))**2 +
+        (wp.z - (a.z + ratio * (b.z - a.z)))**2
+    )
+
+
+def simplify_waypoints(waypoints: List[waypoint], epsilon: float) -> Tuple[List[waypoint], float]:
+    """
+    Douglas-Peucker in space-time: drop waypoints while the simplified path stays
+    within epsilon of the original at every instant. Returns (kept waypoints, max error).
+    """
+    n = len(waypoints)
+    if n <= 2:
+        return list(waypoints), 0.0
+
+    keep = [False] * n
+    keep[0] = keep[-1] = True
+    max_error = 0.0
+    stack = [(0, n - 1)]
+    while stack:
+        i, j = stack.pop()
+        if j - i < 2:
+            continue
+        a, b = waypoints[i], waypoints[j]
+        worst, worst_k = -1.0, i
+        for k in range(i + 1, j):
+            d = _sed(waypoints[k], a, b)
+            if d > worst:
+                worst, worst_k = d, k
+        if worst > epsilon:
+            keep[worst_k] = True
+            stack.append((i, worst_k))
+            stack.append((worst_k, j))
+        else:
+            # Both paths are linear between original waypoints, so this bounds every instant
+            max_error = max(max_error, worst)
+    return [wp for wp, kept in zip(waypoints, keep) if kept], max_error
+
+
+def simplify_mission(mission: Mission, epsilon: float) -> Mission:
+    """
+    Return a copy of the mission with near-collinear waypoints removed (error <= epsilon).
+    The error is recorded in position_tolerance so the detector widens its
+    separation check by it and results stay conservative.
+    """
+    wps, error = simplify_waypoints(mission.waypoints, epsilon)
+    return Mission(
+        waypoints=wps,
+        start_time=mission.start_time,
+        end_time=mission.end_time,
+        drone_id=mission.drone_id,
+        position_tolerance=mission.position_tolerance + error,
+        drone_class=mission.drone_class
+    )
@@ -0,0 +1,180 @@
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterable, List, Set, Tuple
+import math
+
+from src.models import Mission
+
+
+class OccupancyMap:
+    """
+    Sparse 4D occupancy map (x, y, z cells per time bucket) over approved missions.
+
+    Each mission is rasterized into the voxels its swept volume touches, grown by
+    `margin` plus its position_tolerance on every side. Two missions that come
+    closer than the sum of their growths at the same instant always share at least
+    one voxel, so only missions sharing voxels with a candidate need an exact check.
+    """
+
+    def __init__(self, cell_size: float, time_bucket: float, margin: float,
+                 use_z: bool = True, max_cells_per_mission: int = 20000):
+        """
+        :param cell_size: Edge length of a spatial cell in meters.
+        :param time_bucket: Length of a time bucket in seconds.
+        :param margin: Distance each swept volume is grown by (half the safety distance).
+        :param use_z: Rasterize altitude as well; False collapses everything onto one layer.
+        :param max_cells_per_mission: Missions needing more voxels than this are kept
+            in an overflow set that is always sent to exact checking instead.
+        """
+        if cell_size <= 0 or time_bucket <= 0:
+            raise ValueError("cell_size and time_bucket must be positive")
+        self.cell_size = cell_size
+        self.time_bucket = time_bucket
+        self.margin = margin
+        self.use_z = use_z
+        self.max_cells_per_mission = max_cells_per_mission
+
+        self._voxels: Dict[Tuple[int, int, int, int], Set[int]] = {}
+        self._keys: Dict[int, List[Tuple[int, int, int, int]]] = {}
+        self._missions: Dict[int, Mission] = {}
+        self._order: Dict[int, int] = {}  # id(mission) -> insertion sequence
+        self._sequence = 0
+        self._overflow: Set[int] = set()
+
+    def __len__(self) -> int:
+        return len(self._missions)
+
+    def __contains__(self, mission: Mission) -> bool:
+        return id(mission) in self._missions
+
+    @property
+    def voxel_count(self) -> int:
+        """Number of non-empty voxels currently stored"""
+        return len(self._voxels)
+
+    def add_mission(self, mission: Mission):
+        """Record the voxels occupied by an approved mission"""
+        key = id(mission)
+        if key in self._missions:
+            return
+        self._missions[key] = mission
+        self._order[key] = self._sequence
+        self._sequence += 1
+        cells = self.rasterize(mission)
+        if cells is None:
+            self._overflow.add(key)
+            return
+        self._keys[key] = cells
+        for cell in cells:
+            occupants = self._voxels.get(cell)
+            if occupants is None:
+                self._voxels[cell] = {key}
+            else:
+                occupants.add(key)
+
+    def remove_mission(self, mission: Mission):
+        """Drop a mission (expired or cancelled) and free any voxels left empty"""
+        key = id(mission)
+        if self._missions.pop(key, None) is None:
+            return
+        del self._order[key]
+        self._overflow.discard(key)
+        for cell in self._keys.pop(key, ()):
+            occupants = self._voxels.get(cell)
+            if occupants is None:
+                continue
+            occupants.discard(key)
+            if not occupants:
+                del self._voxels[cell]
+
+    def rebuild(self, missions: Iterable[Mission]):
+        """Reset the map to exactly the given missions"""
+        self.clear()
+        for mission in missions:
+            self.add_mission(mission)
+
+    def clear(self):
+        self._voxels.clear()
+        self._keys.clear()
+        self._missions.clear()
+        self._order.clear()
+        self._overflow.clear()
+
+    def candidates(self, mission: Mission) -> List[Mission]:
+        """
+        Return the stored missions sharing at least one voxel with `mission`,
+        plus overflow missions. Everything else is guaranteed conflict-free.
+        """
+        return self.candidates_in(self.rasterize(mission))
+
+    def candidates_in(self, cells) -> List[Mission]:
+        """candidates() for an already rasterized mission (None: it overflowed)"""
+        if cells is None:
+            return list(self._missions.values())
+
+        hits = set(self._overflow)
+        for cell in cells:
+            occupants = self._voxels.get(cell)
+            if occupants:
+                hits.update(occupants)
+        # Keep insertion (approval) order so downstream conflict lists stay stable:
+        # sort the hits only, never walk the whole store
+        missions = self._missions
+        return [missions[key] for key in sorted(hits, key=self._order.__getitem__)]
+
+    def rasterize(self, mission: Mission):
+        """
+        List the voxels touched by the mission over [start_time, end_time], or
+        None if that would exceed max_cells_per_mission.
+        """
+        wps = mission.waypoints
+        if not wps or mission.end_time < mission.start_time:
+            return []
+        times = [wp.time for wp in wps]
+        size = self.cell_size
+        bucket = self.time_bucket
+        margin = self.margin + mission.position_tolerance
+
+        cells = []
+        b = math.floor(mission.start_time / bucket)
+        last = math.floor(mission.end_time / bucket)
+        while b <= last:
+            t0 = max(mission.start_time, b * bucket)
+            t1 = min(mission.end_time, (b + 1) * bucket)
+
+            # Bounding box of the clamped piecewise-linear path over [t0, t1]; waypoints
+            # exactly at t0 / t1 are included, so a jump on a boundary keeps both ends
+            points = [_position(wps, times, t0), _position(wps, times, t1)]
+            for i in range(bisect_left(times, t0), bisect_right(times, t1)):
+                points.append((wps[i].x, wps[i].y, wps[i].z))
+            xs, ys, zs = zip(*points)
+
+            ix = range(math.floor((min(xs) - margin) / size), math.floor((max(xs) + margin) / size) + 1)
+            iy = range(math.floor((min(ys) - margin) / size), math.floor((max(ys) + margin) / size) + 1)
+            if self.use_z:
+                iz = range(math.floor((min(zs) - margin) / size), math.floor((max(zs) + margin) / size) + 1)
+            else:
+                iz = range(0, 1)
+
+            if len(cells) + len(ix) * len(iy) * len(iz) > self.max_cells_per_mission:
+                return None
+            cells.extend((x, y, z, b) for x in ix for y in iy for z in iz)
+            b += 1
+        return cells
+
+
+def _position(wps, times, t) -> Tuple[float, float, float]:
+    """Clamped linear interpolation of (x, y, z) at time t"""
+    if t <= times[0]:
+        return (wps[0].x, wps[0].y, wps[0].z)
+    if t >= times[-1]:
+        return (wps[-1].x, wps[-1].y, wps[-1].z)
+    i = bisect_left(times, t) - 1
+    wp1, wp2 = wps[i], wps[i + 1]
+    if wp2.time == wp1.time:
+        return (wp1.x, wp1.y, wp1.z)
+    ratio = (t - wp1.time) / (wp2.time - wp1.time)
+    return (
+        wp1.x + ratio * (wp2.x - wp1.x),
+        wp1.y + ratio * (wp2.y - wp1.y),
+        wp1.z + ratio * (wp2.z - wp1.z),
+    )
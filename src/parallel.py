@@ -0,0 +1,108 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+import threading
+
+from src import kernels_numpy
+from src.conflict_detector import ConflictDetector, ConflictRecord
+from src.models import Mission
+
+# Pairs below which a chunk is not worth a task of its own: one array pass costs
+# about the same for a handful of pairs as for none
+MIN_CHUNK_PAIRS = 16
+
+# One long-lived pool per worker count, so a query pays no thread start-up
+_executors: Dict[int, ThreadPoolExecutor] = {}
+_executors_lock = threading.Lock()
+
+
+def thread_pool(workers: int) -> ThreadPoolExecutor:
+    with _executors_lock:
+        executor = _executors.get(workers)
+        if executor is None:
+            executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="conflict-check")
+            _executors[workers] = executor
+        return executor
+
+
+def _check_tasks(detector: ConflictDetector, chunk: List[tuple]) -> List[tuple]:
+    """
+    (job, records) for every (job, primary, (other, minima)) task of a chunk. The
+    pairs that can conflict are sampled together by one kernels_numpy.pairs_violations
+    call, so a chunk is a handful of large array operations rather than a Python
+    loop over pairs.
+    """
+    screened, pairs = [], []
+    for job, primary, (other, minima) in chunk:
+        start = max(primary.start_time, other.start_time)
+        end = min(primary.end_time, other.end_time)
+        if end < start or other.drone_id == primary.drone_id:
+            continue
+        modes = detector._screen(primary, other, minima)
+        if modes is not None:
+            screened.append((job, primary, other))
+            pairs.append((primary.compiled(), other.compiled(), start, end) + modes)
+    violations = kernels_numpy.pairs_violations(pairs, detector.time_step)
+    return [(job, [ConflictRecord(primary.drone_id, other.drone_id, t, pos1, pos2, d)
+                   for t, pos1, pos2, d in found])
+            for (job, primary, other), found in zip(screened, violations)]
+
+
+def _check_chunk(detector: ConflictDetector, primary: Mission, chunk: List[tuple]) -> List[ConflictRecord]:
+    return [record for _, found in _check_tasks(detector, [(0, primary, pair) for pair in chunk])
+            for record in found]
+
+
+def _map_chunks(function, items: List, workers: int, chunks_per_worker: int) -> List:
+    """function over contiguous chunks of items, on the pool unless there is only one chunk"""
+    size = max(MIN_CHUNK_PAIRS, -(-len(items) // (workers * chunks_per_worker)))
+    chunks = [items[i:i + size] for i in range(0, len(items), size)]
+    if len(chunks) == 1:
+        return [function(chunks[0])]
+    return list(thread_pool(workers).map(function, chunks))
+
+
+def find_conflicts_many_threaded(detector: ConflictDetector, jobs: List[tuple], workers: int,
+                                 chunks_per_worker: int = 2) -> List[List[ConflictRecord]]:
+    """
+    find_conflicts_threaded for several (primary, others) jobs in one pass over
+    the pool: the pairs of all jobs are chunked together. Returns the records of
+    each job, in the order of its `others`.
+    """
+    tasks = []
+    for job, (primary, others) in enumerate(jobs):
+        kernels_numpy.trajectory_arrays(primary.compiled())
+        for other in others:
+            kernels_numpy.trajectory_arrays(other.compiled())
+        tasks.extend((job, primary, pair) for pair in zip(others, detector.minima_against(primary, others)))
+    records: List[List[ConflictRecord]] = [[] for _ in jobs]
+    if not tasks:
+        return records
+    for part in _map_chunks(lambda chunk: _check_tasks(detector, chunk), tasks, workers, chunks_per_worker):
+        for job, found in part:
+            records[job].extend(found)
+    return records
+
+
+def find_conflicts_threaded(detector: ConflictDetector, primary: Mission, others: List[Mission],
+                            workers: int, chunks_per_worker: int = 2) -> List[ConflictRecord]:
+    """
+    Same records, in the same order, as detector.find_conflicts_against_others,
+    computed by a shared thread pool. Each task samples a contiguous chunk of
+    `others` with a single kernels_numpy.pairs_violations call, so the time goes
+    into large array operations that release the GIL and chunks can overlap;
+    there is no pickling or start-up cost as with processes.
+    """
+    if not others:
+        return []
+    # Compile trajectories up front: the per-mission caches are filled once, here,
+    # instead of racing in the workers
+    kernels_numpy.trajectory_arrays(primary.compiled())
+    for other in others:
+        kernels_numpy.trajectory_arrays(other.compiled())
+
+    # Thresholds for the whole batch come from one row of the class-pair matrix
+    pairs = list(zip(others, detector.minima_against(primary, others)))
+    records = []
+    for part in _map_chunks(lambda chunk: _check_chunk(detector, primary, chunk), pairs, workers, chunks_per_worker):
+        records.extend(part)
+    return records
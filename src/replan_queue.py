@@ -0,0 +1,192 @@
+from typing import Callable, Dict, Iterable, List, Optional, Set
+import heapq
+import itertools
+import threading
+
+from src.models import waypoint, Mission
+
+
+def delay_replanner(delay: float) -> Callable:
+    """Replanner that retries a still-blocked mission `delay` seconds later"""
+    def replan(mission: Mission, blockers: Set[str]) -> Mission:
+        return Mission(
+            waypoints=[waypoint(wp.x, wp.y, wp.z, wp.time + delay) for wp in mission.waypoints],
+            start_time=mission.start_time + delay,
+            end_time=mission.end_time + delay,
+            drone_id=mission.drone_id,
+            position_tolerance=mission.position_tolerance,
+            drone_class=mission.drone_class
+        )
+    return replan
+
+
+class _Entry:
+    __slots__ = ("mission", "blockers", "priority", "attempts", "queued")
+
+    def __init__(self, mission: Mission, blockers: Set[str], priority: float, attempts: int):
+        self.mission = mission
+        self.blockers = blockers
+        self.priority = priority
+        self.attempts = attempts
+        self.queued = False
+
+
+class ReplanScheduler:
+    """
+    Holds rejected missions until the airspace that blocked them changes.
+
+    Each rejected mission is parked with the drone_ids it conflicted with, and a
+    reverse dependency map (blocker -> waiting missions) is kept. When approved
+    missions expire or are cancelled, only the missions that depended on them are
+    moved to the priority queue and retried; everything else stays parked.
+    Approvals only ever add conflicts, so they never wake anything up.
+    """
+
+    def __init__(self, system, replanner: Callable = None, priority: Callable = None, max_attempts: int = 5):
+        """
+        :param system: DeconflictionSystem whose airspace the retries go through.
+        :param replanner: Optional (mission, blockers) -> Mission producing an alternative
+            plan to try when a woken mission is still rejected as filed.
+        :param priority: mission -> sort key, lower retried first (default: start_time).
+        :param max_attempts: Retries per mission before it is dropped.
+        """
+        self.system = system
+        self.replanner = replanner
+        self.priority = priority or (lambda mission: mission.start_time)
+        self.max_attempts = max_attempts
+        # Shared with the system: its public entry points take it too, so the
+        # background thread and foreground queries never touch the store at once
+        self.lock = threading.RLock()
+
+        self._entries: Dict[str, _Entry] = {}           # drone_id -> parked / queued mission
+        self._dependents: Dict[str, Set[str]] = {}      # blocker drone_id -> waiting drone_ids
+        self._heap = []
+        self._seq = itertools.count()
+        self._wake = threading.Event()
+        self._thread = None
+        self._stop = threading.Event()
+        self._carry_attempts = None  # attempts of the entry being retried, inherited on re-park
+
+        self.retries = 0
+        self.cleared = 0
+        self.dropped = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def ready(self) -> int:
+        """Number of missions queued for a retry"""
+        return sum(1 for entry in self._entries.values() if entry.queued)
+
+    def add(self, mission: Mission, blockers: Iterable[str]):
+        """Park a rejected mission; a newer rejection for the same drone replaces the old one"""
+        with self.lock:
+            attempts = self._carry_attempts or 0
+            self.discard(mission.drone_id)
+            blockers = set(blockers)
+            if not blockers:
+                return  # nothing in the airspace to wait for (e.g. a static restriction)
+            entry = _Entry(mission, blockers, self.priority(mission), attempts)
+            self._entries[mission.drone_id] = entry
+            for blocker in blockers:
+                self._dependents.setdefault(blocker, set()).add(mission.drone_id)
+
+    def discard(self, drone_id: str):
+        with self.lock:
+            entry = self._entries.pop(drone_id, None)
+            if entry is None:
+                return
+            for blocker in entry.blockers:
+                waiting = self._dependents.get(blocker)
+                if waiting is not None:
+                    waiting.discard(drone_id)
+                    if not waiting:
+                        del self._dependents[blocker]
+
+    def notify_removed(self, missions: Iterable[Mission]):
+        """Approved missions left the airspace: queue everything they were blocking"""
+        with self.lock:
+            for mission in missions:
+                for drone_id in self._dependents.pop(mission.drone_id, ()):
+                    entry = self._entries.get(drone_id)
+                    if entry is not None and not entry.queued:
+                        entry.queued = True
+                        heapq.heappush(self._heap, (entry.priority, next(self._seq), drone_id, entry))
+            if self._heap:
+                self._wake.set()
+
+    def process_pending(self, limit: int = None) -> List[tuple]:
+        """
+        Retry queued missions in priority order. Returns (original mission, result)
+        for every mission that got approved.
+        """
+        cleared = []
+        with self.lock:
+            while self._heap and (limit is None or len(cleared) < limit):
+                _, _, drone_id, entry = heapq.heappop(self._heap)
+                if self._entries.get(drone_id) is not entry:
+                    continue  # resubmitted or discarded since it was queued
+                result = self._retry(entry)
+                if result is not None:
+                    cleared.append((entry.mission, result))
+            if not self._heap:
+                self._wake.clear()
+        return cleared
+
+    def clear(self):
+        with self.lock:
+            self._entries.clear()
+            self._dependents.clear()
+            self._heap.clear()
+            self._wake.clear()
+
+    def _retry(self, entry: _Entry) -> Optional[dict]:
+        self.discard(entry.mission.drone_id)
+        entry.attempts += 1
+        self.retries += 1
+
+        candidates = [entry.mission]
+        if self.replanner is not None:
+            candidates.append(self.replanner(entry.mission, entry.blockers))
+
+        self._carry_attempts = entry.attempts
+        try:
+            for candidate in candidates:
+                # A rejection re-parks the candidate through the system's hook
+                result = self.system.query_mission_safety(candidate, response_format="summary")
+                if result["status"] == "APPROVED":
+                    self.cleared += 1
+                    return result
+        finally:
+            self._carry_attempts = None
+
+        parked = self._entries.get(entry.mission.drone_id)
+        if parked is not None and parked.attempts >= self.max_attempts:
+            self.discard(entry.mission.drone_id)
+            self.dropped += 1
+        return None
+
+    # ---- background mode --------------------------------------------------
+
+    def start(self, poll_interval: float = 1.0):
+        """Retry woken missions on a daemon thread until stop() is called"""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+
+        def run():
+            while not self._stop.is_set():
+                if self._wake.wait(poll_interval):
+                    self.process_pending()
+
+        self._thread = threading.Thread(target=run, name="replan-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._wake.set()
+        self._thread.join()
+        self._thread = None
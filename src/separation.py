@@ -0,0 +1,113 @@
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from src import kernels
+from src.kernels_numpy import sample_times, track, trajectory_arrays
+from src.models import Mission
+
+# Below this many samples the pure-Python cursor walk beats NumPy's per-call overhead
+SMALL_SERIES = 512
+
+
+def separation_series(detector, mission1: Mission, mission2: Mission) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    (times, distances) at the detector's sample instants over the overlapping
+    window - the same `d` values check_conflicts_between_missions compares.
+    """
+    is_3d = detector.is_3d_pair(mission1, mission2)
+    start = max(mission1.start_time, mission2.start_time)
+    end = min(mission1.end_time, mission2.end_time)
+    if end < start:
+        return np.empty(0), np.empty(0)
+
+    if (end - start) / detector.time_step < SMALL_SERIES:
+        times = kernels.sample_times(start, end, detector.time_step)
+        walk = kernels.track_3d if is_3d else kernels.track_2d
+        pos1 = np.array(walk(mission1.compiled(), times))
+        pos2 = np.array(walk(mission2.compiled(), times))
+        return np.array(times), np.sqrt(((pos1 - pos2) ** 2).sum(axis=1))
+
+    times = sample_times(start, end, detector.time_step)
+    dims = 3 if is_3d else 2
+    diff = track(mission1.compiled(), times, dims) - track(mission2.compiled(), times, dims)
+    return times, np.sqrt((diff ** 2).sum(axis=0))
+
+
+def separation_against_others(detector, primary: Mission,
+                              others: List[Mission]) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+    """drone_id -> (times, distances) for every other mission overlapping the primary in time"""
+    curves = {}
+    for other in others:
+        if other.drone_id == primary.drone_id:
+            continue
+        times, distances = separation_series(detector, primary, other)
+        if times.size:
+            curves[other.drone_id] = (times, distances)
+    return curves
+
+
+def downsample_minmax(times: np.ndarray, values: np.ndarray, max_points: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Reduce a curve to at most max_points samples, keeping the minimum and maximum
+    of every bucket (in time order) so no near-miss dip or peak is smoothed away.
+    """
+    n = values.size
+    if n <= max_points:
+        return times, values
+    buckets = max(1, max_points // 2)
+    width = -(-n // buckets)
+    padded = np.full(buckets * width, np.nan)
+    padded[:n] = values
+    rows = padded.reshape(buckets, width)
+    offsets = np.arange(buckets) * width
+    valid = offsets < n
+    min_idx = (offsets + np.argmin(np.where(np.isnan(rows), np.inf, rows), axis=1))[valid]
+    max_idx = (offsets + np.argmax(np.where(np.isnan(rows), -np.inf, rows), axis=1))[valid]
+    keep = np.unique(np.concatenate((min_idx, max_idx)))
+    return times[keep], values[keep]
+
+
+def segment_minima(detector, mission1: Mission, mission2: Mission) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Exact minimum separation on every interval where both drones fly a straight
+    leg: the relative position is linear there, so |r(t)|^2 is a quadratic with a
+    closed-form minimum. Returns (times, distances): one entry per interval, then
+    the separation at each breakpoint as the sampled check positions the drones.
+    """
+    dims = 3 if detector.is_3d_pair(mission1, mission2) else 2
+    start = max(mission1.start_time, mission2.start_time)
+    end = min(mission1.end_time, mission2.end_time)
+    if end < start:
+        return np.empty(0), np.empty(0)
+
+    t1, _ = trajectory_arrays(mission1.compiled())
+    t2, _ = trajectory_arrays(mission2.compiled())
+    breaks = np.concatenate(([start, end], t1, t2))
+    breaks = np.unique(breaks[(breaks >= start) & (breaks <= end)])
+    if breaks.size == 1:
+        diff = track(mission1.compiled(), breaks, dims) - track(mission2.compiled(), breaks, dims)
+        return breaks, np.sqrt((diff ** 2).sum(axis=0))
+
+    a, b = breaks[:-1], breaks[1:]
+    # Each interval starts after any jump at `a` and ends before any at `b`
+    rel_a = track(mission1.compiled(), a, dims, "right") - track(mission2.compiled(), a, dims, "right")
+    rel_b = track(mission1.compiled(), b, dims, "left") - track(mission2.compiled(), b, dims, "left")
+    velocity = (rel_b - rel_a) / (b - a)
+    speed2 = (velocity ** 2).sum(axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        tau = np.where(speed2 > 0, -(rel_a * velocity).sum(axis=0) / speed2, 0.0)
+    tau = np.clip(tau, 0.0, b - a)
+    closest = rel_a + velocity * tau
+    at_breaks = track(mission1.compiled(), breaks, dims) - track(mission2.compiled(), breaks, dims)
+    return (np.concatenate((a + tau, breaks)),
+            np.concatenate((np.sqrt((closest ** 2).sum(axis=0)), np.sqrt((at_breaks ** 2).sum(axis=0)))))
+
+
+def closest_approach(detector, mission1: Mission, mission2: Mission) -> Tuple[float, float]:
+    """(time, distance) of the exact minimum separation, or (nan, inf) if the windows never overlap"""
+    times, distances = segment_minima(detector, mission1, mission2)
+    if times.size == 0:
+        return float("nan"), float("inf")
+    k = int(np.argmin(distances))
+    return float(times[k]), float(distances[k])
@@ -0,0 +1,113 @@
+from typing import Dict, Iterable, List, NamedTuple, Tuple
+import json
+
+DEFAULT_CLASS = "default"
+
+
+class SeparationMinima(NamedTuple):
+    """
+    Separation required between two drones, as a vertical cylinder: they are in
+    conflict only when closer than `horizontal` in x/y AND than `vertical` in z
+    """
+    horizontal: float
+    vertical: float
+
+
+class SeparationTable:
+    """
+    Symmetric drone-class pair -> SeparationMinima table.
+
+    Classes are numbered as they are first mentioned; index 0 is the default row
+    used for any class without entries of its own. `matrix()` exposes the table as
+    dense horizontal/vertical threshold matrices, so batched checks look a pair up
+    by two integer indices, exactly as cheap as reading a scalar.
+    """
+
+    def __init__(self, default: SeparationMinima, pairs: Dict[Tuple[str, str], SeparationMinima] = None):
+        """
+        :param default: Minima between classes with no entry in the table.
+        :param pairs: (class_a, class_b) -> minima; order within the key is irrelevant.
+        """
+        self.default = SeparationMinima(*default)
+        self._index: Dict[str, int] = {DEFAULT_CLASS: 0}
+        self._pairs: Dict[Tuple[int, int], SeparationMinima] = {}
+        self._matrix = None
+        for (class_a, class_b), minima in (pairs or {}).items():
+            self.set(class_a, class_b, *minima)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "SeparationTable":
+        """
+        Build from the JSON form:
+        {"default": {"horizontal": .., "vertical": ..},
+         "pairs": [{"classes": [a, b], "horizontal": .., "vertical": ..}, ...]}
+        """
+        try:
+            default = SeparationMinima(data["default"]["horizontal"], data["default"]["vertical"])
+            table = cls(default)
+            for entry in data.get("pairs", []):
+                class_a, class_b = entry["classes"]
+                table.set(class_a, class_b, entry["horizontal"], entry["vertical"])
+        except (KeyError, TypeError, ValueError) as exc:
+            raise ValueError(f"Invalid separation table: {exc!r}") from exc
+        return table
+
+    @classmethod
+    def load(cls, path: str) -> "SeparationTable":
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+    def set(self, class_a: str, class_b: str, horizontal: float, vertical: float):
+        if horizontal < 0 or vertical < 0:
+            raise ValueError("separation minima must be non-negative")
+        i, j = sorted((self._class_index(class_a), self._class_index(class_b)))
+        self._pairs[(i, j)] = SeparationMinima(float(horizontal), float(vertical))
+        self._matrix = None
+
+    def _class_index(self, drone_class: str) -> int:
+        index = self._index.get(drone_class)
+        if index is None:
+            index = self._index[drone_class] = len(self._index)
+        return index
+
+    def index(self, drone_class: str) -> int:
+        """Row/column of a class in matrix(); unknown classes share the default row"""
+        return self._index.get(drone_class, 0)
+
+    @property
+    def classes(self) -> List[str]:
+        return list(self._index)
+
+    def matrix(self) -> Tuple[List[List[float]], List[List[float]]]:
+        """(horizontal, vertical) dense symmetric threshold matrices, rebuilt after set()"""
+        if self._matrix is None:
+            n = len(self._index)
+            horizontal = [[self.default.horizontal] * n for _ in range(n)]
+            vertical = [[self.default.vertical] * n for _ in range(n)]
+            for (i, j), minima in self._pairs.items():
+                horizontal[i][j] = horizontal[j][i] = minima.horizontal
+                vertical[i][j] = vertical[j][i] = minima.vertical
+            self._matrix = (horizontal, vertical)
+        return self._matrix
+
+    def minima(self, class_a: str, class_b: str) -> SeparationMinima:
+        horizontal, vertical = self.matrix()
+        i, j = self.index(class_a), self.index(class_b)
+        return SeparationMinima(horizontal[i][j], vertical[i][j])
+
+    def row(self, drone_class: str, others: Iterable[str]) -> Tuple[List[float], List[float]]:
+        """(horizontal, vertical) minima between one class and each of `others`"""
+        horizontal, vertical = self.matrix()
+        i = self.index(drone_class)
+        columns = [self.index(other) for other in others]
+        h_row, v_row = horizontal[i], vertical[i]
+        return [h_row[j] for j in columns], [v_row[j] for j in columns]
+
+    def max_separation(self) -> float:
+        """Largest minimum on any axis: a conservative radius for spatial indexes"""
+        return max(self.default.horizontal, self.default.vertical,
+                   *(max(minima) for minima in self._pairs.values()))
+
+    def max_vertical(self) -> float:
+        """Largest vertical minimum: pairs further apart in altitude never conflict"""
+        return max(self.default.vertical, *(minima.vertical for minima in self._pairs.values()))
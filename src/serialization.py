@@ -0,0 +1,149 @@
+from typing import Dict, List
+import json
+import struct
+
+from src.conflict_detector import ConflictRecord
+
+# Built once: compact separators, no circular-reference bookkeeping
+_JSON_ENCODER = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False, check_circular=False)
+
+_STATUS_CODES = {"APPROVED": 0, "REJECTED": 1}
+_STATUS_NAMES = {code: name for name, code in _STATUS_CODES.items()}
+_MODE_CODES = {"2d": 0, "3d": 1, "auto": 2}
+_MODE_NAMES = {code: name for name, code in _MODE_CODES.items()}
+
+# magic, version, status, mode, safety_distance, conflicts_detected, interval count, probable count
+# (version 3 widened the counts from H to I: a mission can have more than 65535 intervals)
+_HEADER = struct.Struct("<4sBBBdIII")
+_HEADER_V2 = struct.Struct("<4sBBBdIHH")
+# start, end, min_distance, samples
+_INTERVAL = struct.Struct("<dddI")
+_PROBABLE = struct.Struct("<d")
+# Version 2 appends the restricted zones entered: count, then (zone_id, entry time) each
+_GEOFENCE_COUNT = struct.Struct("<I")
+_GEOFENCE_COUNT_V2 = struct.Struct("<H")
+_GEOFENCE = struct.Struct("<d")
+_MAGIC = b"DCNF"
+_VERSION = 3
+
+
+def coalesce_intervals(records: List[ConflictRecord], time_step: float) -> List[Dict]:
+    """
+    Merge consecutive conflict samples against the same drone into intervals:
+    {"drone_id", "start", "end", "samples", "min_distance"}. Only a sample at most
+    1.5 steps after an interval's end extends it; records of another mission of
+    the same drone that start earlier open a new interval.
+    """
+    intervals = []
+    open_by_drone = {}
+    gap = 1.5 * time_step
+    for record in records:
+        current = open_by_drone.get(record.drone_b)
+        if current is not None and 0.0 <= record.time - current["end"] <= gap:
+            current["end"] = record.time
+            current["samples"] += 1
+            if record.distance < current["min_distance"]:
+                current["min_distance"] = record.distance
+        else:
+            current = {
+                "drone_id": record.drone_b,
+                "start": record.time,
+                "end": record.time,
+                "samples": 1,
+                "min_distance": record.distance,
+            }
+            open_by_drone[record.drone_b] = current
+            intervals.append(current)
+    return intervals
+
+
+def encode_json(response: Dict) -> str:
+    return _JSON_ENCODER.encode(response)
+
+
+def _pack_str(text: str) -> bytes:
+    raw = text.encode("utf-8")
+    return struct.pack("<H", len(raw)) + raw
+
+
+def _unpack_str(buf: bytes, offset: int):
+    (size,) = struct.unpack_from("<H", buf, offset)
+    offset += 2
+    return buf[offset:offset + size].decode("utf-8"), offset + size
+
+
+def encode_binary(summary: Dict) -> bytes:
+    """
+    Pack a summary response into a little-endian binary frame for machine clients.
+    Recommendations and sample messages are human-facing and are not included.
+    """
+    intervals = summary["conflict_intervals"]
+    probable = summary.get("probable_conflicts", [])
+    parts = [
+        _HEADER.pack(_MAGIC, _VERSION, _STATUS_CODES[summary["status"]],
+                     _MODE_CODES[summary["detection_mode"]],
+                     summary["safety_distance"], summary["conflicts_detected"],
+                     len(intervals), len(probable)),
+        _pack_str(summary["mission_id"]),
+    ]
+    for interval in intervals:
+        parts.append(_pack_str(interval["drone_id"]))
+        parts.append(_INTERVAL.pack(interval["start"], interval["end"],
+                                    interval["min_distance"], interval["samples"]))
+    for item in probable:
+        parts.append(_pack_str(item["drone_id"]))
+        parts.append(_PROBABLE.pack(item["probability"]))
+    zones = summary.get("geofence_violations", [])
+    parts.append(_GEOFENCE_COUNT.pack(len(zones)))
+    for item in zones:
+        parts.append(_pack_str(item["zone_id"]))
+        parts.append(_GEOFENCE.pack(item["time"]))
+    return b"".join(parts)
+
+
+def decode_binary(buf: bytes) -> Dict:
+    """Inverse of encode_binary"""
+    magic, version = struct.unpack_from("<4sB", buf, 0)
+    if magic != _MAGIC or version not in (1, 2, _VERSION):
+        raise ValueError("Not a deconfliction response frame")
+    header = _HEADER if version >= 3 else _HEADER_V2
+    _, _, status, mode, safety, detected, n_intervals, n_probable = header.unpack_from(buf, 0)
+    offset = header.size
+    mission_id, offset = _unpack_str(buf, offset)
+
+    intervals = []
+    for _ in range(n_intervals):
+        drone_id, offset = _unpack_str(buf, offset)
+        start, end, min_distance, samples = _INTERVAL.unpack_from(buf, offset)
+        offset += _INTERVAL.size
+        intervals.append({"drone_id": drone_id, "start": start, "end": end,
+                          "samples": samples, "min_distance": min_distance})
+
+    probable = []
+    for _ in range(n_probable):
+        drone_id, offset = _unpack_str(buf, offset)
+        (probability,) = _PROBABLE.unpack_from(buf, offset)
+        offset += _PROBABLE.size
+        probable.append({"drone_id": drone_id, "probability": probability})
+
+    zones = []
+    if version >= 2:
+        zone_count = _GEOFENCE_COUNT if version >= 3 else _GEOFENCE_COUNT_V2
+        (n_zones,) = zone_count.unpack_from(buf, offset)
+        offset += zone_count.size
+        for _ in range(n_zones):
+            zone_id, offset = _unpack_str(buf, offset)
+            (entry_time,) = _GEOFENCE.unpack_from(buf, offset)
+            offset += _GEOFENCE.size
+            zones.append({"zone_id": zone_id, "time": entry_time})
+
+    return {
+        "status": _STATUS_NAMES[status],
+        "mission_id": mission_id,
+        "conflicts_detected": detected,
+        "conflict_intervals": intervals,
+        "probable_conflicts": probable,
+        "geofence_violations": zones,
+        "safety_distance": safety,
+        "detection_mode": _MODE_NAMES[mode],
+    }
@@ -0,0 +1,31 @@
+from heapq import heappop, heappush
+from typing import Iterator, List, Sequence, Tuple
+
+from src.models import Mission
+
+
+def windows_overlap(mission1: Mission, mission2: Mission) -> bool:
+    """True if the two missions share at least one instant"""
+    return max(mission1.start_time, mission2.start_time) <= min(mission1.end_time, mission2.end_time)
+
+
+def iter_overlapping_pairs(missions: Sequence[Mission]) -> Iterator[Tuple[int, int]]:
+    """
+    Yield (i, j) index pairs, i < j, of missions whose time windows overlap.
+
+    Missions are swept in start_time order while an active set (a heap keyed on
+    end_time) holds the ones still flying; each mission is paired only with the
+    active set when it enters, so the cost is O(N log N + K) for K overlapping
+    pairs instead of O(N^2). Pairs come out grouped by the later-starting mission.
+    """
+    order = sorted(range(len(missions)), key=lambda k: missions[k].start_time)
+    active: List[Tuple[float, int]] = []
+    for k in order:
+        mission = missions[k]
+        if mission.end_time < mission.start_time:
+            continue  # empty window, overlaps nothing
+        while active and active[0][0] < mission.start_time:
+            heappop(active)
+        for _, other in active:
+            yield (other, k) if other < k else (k, other)
+        heappush(active, (mission.end_time, k))
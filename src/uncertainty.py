@@ -0,0 +1,124 @@
+from dataclasses import dataclass
+from typing import List, Sequence
+import math
+
+import numpy as np
+
+from src.models import Mission
+
+
+@dataclass
+class ErrorModel:
+    """Per-mission deviation from the planned waypoints (1-sigma values)"""
+    horizontal_sigma: float = 0.0  # meters, applied independently to x and y
+    vertical_sigma: float = 0.0    # meters, applied to z
+    timing_sigma: float = 0.0      # seconds the drone runs ahead of / behind schedule
+
+    def is_exact(self) -> bool:
+        return self.horizontal_sigma == 0.0 and self.vertical_sigma == 0.0 and self.timing_sigma == 0.0
+
+
+def _trajectory_arrays(mission: Mission):
+    times = np.array([wp.time for wp in mission.waypoints], dtype=float)
+    coords = np.array([[wp.x, wp.y, wp.z] for wp in mission.waypoints], dtype=float)
+    return times, coords
+
+
+def _positions(times, coords, query, dims):
+    """Clamped linear interpolation of the first `dims` axes at every query time (any shape)"""
+    return np.stack([np.interp(query, times, coords[:, k]) for k in range(dims)], axis=-1)
+
+
+def _max_speed(times, coords, dims) -> float:
+    dt = np.diff(times)
+    moving = dt > 0
+    if not moving.any():
+        return 0.0
+    step = np.linalg.norm(np.diff(coords[:, :dims], axis=0)[moving], axis=1)
+    return float((step / dt[moving]).max())
+
+
+def _deviation_bound(model: ErrorModel, speed: float, dims: int, prune_sigma: float) -> float:
+    """Largest displacement a sample can cause, truncating the Gaussians at prune_sigma"""
+    spatial = 2 * model.horizontal_sigma ** 2 + (model.vertical_sigma ** 2 if dims == 3 else 0.0)
+    return prune_sigma * (math.sqrt(spatial) + speed * model.timing_sigma)
+
+
+def _inside(diff, distance: float, vertical: float = None):
+    """Mask of separation vectors (last axis) within the sphere, or the cylinder when vertical is set"""
+    if vertical is None:
+        return np.linalg.norm(diff, axis=-1) < distance
+    return (np.linalg.norm(diff[..., :2], axis=-1) < distance) & (np.abs(diff[..., 2]) < vertical)
+
+
+def _perturbed(times, coords, model: ErrorModel, sample_times, n, dims, rng):
+    """(n, len(sample_times), dims) positions of n independently perturbed flights"""
+    shift = rng.normal(0.0, model.timing_sigma, size=(n, 1)) if model.timing_sigma else np.zeros((n, 1))
+    pos = _positions(times, coords, sample_times[None, :] - shift, dims)
+    sigma = np.array([model.horizontal_sigma, model.horizontal_sigma, model.vertical_sigma][:dims])
+    if sigma.any():
+        pos += rng.normal(0.0, 1.0, size=(n, 1, dims)) * sigma
+    return pos
+
+
+def loss_of_separation_probability(mission1: Mission, mission2: Mission,
+                                   model1: ErrorModel, model2: ErrorModel,
+                                   sample_times: Sequence[float], safety_distance: float,
+                                   is_3d: bool, n_samples: int = 2000, seed=None,
+                                   prune_sigma: float = 5.0, batch_size: int = 512,
+                                   vertical_distance: float = None) -> float:
+    """
+    Estimate P(separation < safety_distance at any sample time) for a pair of missions.
+    With vertical_distance set (3D pairs), the separation is a cylinder instead:
+    safety_distance horizontally and vertical_distance in altitude.
+
+    Each sampled flight gets one timing offset and one constant position bias
+    (wind drift / GPS offset). Before sampling, the nominal separation is used to
+    discard every sample time that no deviation within prune_sigma can bring under
+    the safety distance; if none remain, the probability is 0 without sampling.
+    """
+    if len(sample_times) == 0:
+        return 0.0
+    dims = 3 if is_3d else 2
+    times1, coords1 = _trajectory_arrays(mission1)
+    times2, coords2 = _trajectory_arrays(mission2)
+    grid = np.asarray(sample_times, dtype=float)
+
+    if not is_3d:
+        vertical_distance = None
+    nominal = _positions(times1, coords1, grid, dims) - _positions(times2, coords2, grid, dims)
+    if model1.is_exact() and model2.is_exact():
+        return 1.0 if _inside(nominal, safety_distance, vertical_distance).any() else 0.0
+
+    reach = (_deviation_bound(model1, _max_speed(times1, coords1, dims), dims, prune_sigma) +
+             _deviation_bound(model2, _max_speed(times2, coords2, dims), dims, prune_sigma))
+    grid = grid[_inside(nominal, safety_distance + reach,
+                        None if vertical_distance is None else vertical_distance + reach)]
+    if grid.size == 0:
+        return 0.0
+
+    rng = np.random.default_rng(seed)
+    hits = 0
+    done = 0
+    while done < n_samples:
+        n = min(batch_size, n_samples - done)
+        pos1 = _perturbed(times1, coords1, model1, grid, n, dims, rng)
+        pos2 = _perturbed(times2, coords2, model2, grid, n, dims, rng)
+        hits += int(_inside(pos1 - pos2, safety_distance, vertical_distance).any(axis=1).sum())
+        done += n
+    return hits / n_samples
+
+
+def probabilities_against_others(detector, primary: Mission, others: List[Mission],
+                                 n_samples: int = 2000, seed=None) -> List[tuple]:
+    """(drone_id, probability) for every other mission with a non-zero estimate"""
+    rng = np.random.default_rng(seed)
+    results = []
+    for other in others:
+        if other.drone_id == primary.drone_id:
+            continue
+        p = detector.conflict_probability(primary, other, n_samples=n_samples,
+                                          seed=int(rng.integers(2 ** 32)))
+        if p > 0.0:
+            results.append((other.drone_id, p))
+    return results
@@ -0,0 +1,123 @@
+from typing import List
+
+from src.models import Mission, simplify_mission
+from src.occupancy_map import OccupancyMap
+
+
+class WhatIfSession:
+    """
+    Copy-on-write overlay over a DeconflictionSystem's approved store.
+
+    The session never copies the fleet: it keeps the missions it approved (with
+    a small occupancy map of their own) and the ids of the live missions it
+    cancelled, and answers queries from the live index minus its removals plus
+    its own additions. Opening, querying and discarding all cost O(changes).
+    """
+
+    def __init__(self, system):
+        self.system = system
+        base = system.occupancy
+        self.occupancy = OccupancyMap(base.cell_size, base.time_bucket, base.margin,
+                                      use_z=base.use_z, max_cells_per_mission=base.max_cells_per_mission)
+        self.added: List[Mission] = []
+        self.removed: List[Mission] = []
+        self.rejected = []  # (mission, result), like DeconflictionSystem.rejected_missions
+        self._removed_ids = set()
+        self._base_version = system._version
+        self.closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if not self.closed:
+            self.discard()
+
+    @property
+    def approved_missions(self) -> List[Mission]:
+        """The approved store as this session sees it (builds a full list)"""
+        return [m for m in self.system.approved_missions if id(m) not in self._removed_ids] + self.added
+
+    def _candidates(self, mission: Mission) -> List[Mission]:
+        live = [m for m in self.system._prescreen(mission) if id(m) not in self._removed_ids]
+        return live + self.occupancy.candidates(mission)
+
+    def _check_open(self):
+        if self.closed:
+            raise ValueError("what-if session is already committed or discarded")
+
+    def query_mission_safety(self, primary_mission: Mission, response_format: str = "full",
+                             sample_limit: int = 5):
+        """Same decision as DeconflictionSystem.query_mission_safety, recorded only in the session"""
+        self._check_open()
+        if response_format not in ("full", "summary", "json", "binary"):
+            raise ValueError(f"Unknown response format: {response_format}")
+        system = self.system
+        if system.simplify_epsilon is not None:
+            primary_mission = simplify_mission(primary_mission, system.simplify_epsilon)
+
+        with system._lock:
+            pool = self.approved_missions if system.probability_threshold is not None else None
+            result, _, _ = system._evaluate(primary_mission, self._candidates(primary_mission), pool,
+                                            response_format, sample_limit)
+        if result["status"] == "APPROVED":
+            self.added.append(primary_mission)
+            self.occupancy.add_mission(primary_mission)
+        else:
+            self.rejected.append((primary_mission, result))
+        return system._encode(result, response_format)
+
+    def cancel_mission(self, drone_id: str) -> List[Mission]:
+        """Withdraw a drone's mission(s) within the session only"""
+        self._check_open()
+        cancelled = [m for m in self.added if m.drone_id == drone_id]
+        if cancelled:
+            self.added = [m for m in self.added if m.drone_id != drone_id]
+            for mission in cancelled:
+                self.occupancy.remove_mission(mission)
+        for mission in self.system.approved_missions:
+            if mission.drone_id == drone_id and id(mission) not in self._removed_ids:
+                self._removed_ids.add(id(mission))
+                self.removed.append(mission)
+                cancelled.append(mission)
+        return cancelled
+
+    def commit(self) -> List[Mission]:
+        """
+        Apply the session to the live system and close it; returns the missions
+        added. If the live store changed since the session was opened, every
+        added mission is re-checked first and nothing is applied when one of
+        them no longer clears (ValueError).
+        """
+        self._check_open()
+        with self.system._lock:
+            return self._commit()
+
+    def _commit(self) -> List[Mission]:
+        system = self.system
+        if system._version != self._base_version:
+            stale = []
+            for mission in self.added:
+                others = self._candidates(mission)
+                pool = self.approved_missions if system.probability_threshold is not None else None
+                result, _, _ = system._evaluate(mission, others, pool, "summary", 0)
+                if result["status"] != "APPROVED":
+                    stale.append(mission.drone_id)
+            if stale:
+                raise ValueError(f"what-if session is stale: {', '.join(stale)} no longer clear the live airspace")
+
+        live = [m for m in self.removed if m in system.occupancy]
+        if live:
+            system._remove_approved(live)
+        for mission in self.added:
+            system._add_approved(mission)
+        self.closed = True
+        return list(self.added)
+
+    def discard(self):
+        """Drop the session; the live system is untouched"""
+        self.added = []
+        self.removed = []
+        self._removed_ids.clear()
+        self.occupancy.clear()
+        self.closed = True
@@ -0,0 +1,70 @@
+import pytest
+
+from src.altitude_shards import AltitudeShards
+from src.deconfliction_system import DeconflictionSystem
+from src.models import waypoint, Mission
+from src.separation_minima import SeparationMinima, SeparationTable
+from tests_support import generated_missions
+
+
+def level(drone_id, z, y=0.0, z_end=None):
+    z_end = z if z_end is None else z_end
+    return Mission([waypoint(0, y, z, 0), waypoint(1000, y, z_end, 100)], 0, 100, drone_id)
+
+
+def shards():
+    return AltitudeShards(layer_height=30.0, reach=10.0, cell_size=40.0, time_bucket=10.0, margin=5.0)
+
+
+def test_missions_are_stored_in_the_layers_their_grown_range_touches():
+    store = shards()
+    low, high, climb = level("LOW", 45), level("HIGH", 105), level("CLIMB", 40, z_end=130)
+    for mission in (low, high, climb):
+        store.add_mission(mission)
+    assert list(store.stored_layers(low)) == [1]  # 35..55
+    assert list(store.stored_layers(climb)) == [1, 2, 3, 4]  # 30..140
+    assert sorted(store.shards) == [1, 2, 3, 4]
+
+    # 58 m is 13 m above LOW: outside the 10 m reach, but still in layer 1 with it
+    assert store.candidates(level("Q", 58)) == [low, climb]
+    assert store.candidates(level("Q", 75)) == [climb]
+    # Each mission is reported once, even when it shares several touched layers
+    assert store.candidates(level("Q", 50, z_end=110)) == [low, high, climb]
+
+    store.remove_mission(climb)
+    assert climb not in store and len(store) == 2
+    assert sorted(store.shards) == [1, 3]
+
+
+def test_sharding_needs_altitude():
+    with pytest.raises(ValueError):
+        DeconflictionSystem(mode="2d", altitude_layer=30.0)
+
+
+@pytest.mark.parametrize("mode", ["3d", "auto"])
+@pytest.mark.parametrize("seed", range(4))
+def test_sharded_store_reaches_the_same_decisions(mode, seed):
+    plain = DeconflictionSystem(safety_distance=35.0, time_step=0.7, mode=mode, verbose=False)
+    sharded = DeconflictionSystem(safety_distance=35.0, time_step=0.7, mode=mode, verbose=False,
+                                  altitude_layer=12.0)
+    missions = generated_missions(seed, count=24)
+    decided = lambda result: {key: value for key, value in result.items() if key != "timestamp"}
+    for mission in missions:
+        assert decided(plain.query_mission_safety(mission)) == decided(sharded.query_mission_safety(mission))
+    assert plain.approved_missions == sharded.approved_missions
+
+    sharded.expire_missions(60.0)
+    assert len(sharded.occupancy) == len(sharded.approved_missions)
+    assert all(m in sharded.occupancy for m in sharded.approved_missions)
+
+
+def test_layers_are_grown_by_the_largest_vertical_minimum():
+    table = SeparationTable(SeparationMinima(20.0, 10.0), {("heavy", "heavy"): (80.0, 40.0)})
+    system = DeconflictionSystem(mode="3d", separation=table, altitude_layer=30.0, verbose=False)
+    assert system.occupancy.reach == 40.0
+    assert system.occupancy.margin == 40.0  # max(horizontal, vertical) / 2
+    heavy = lambda drone_id, z: Mission([waypoint(0, 0, z, 0), waypoint(1000, 0, z, 100)], 0, 100,
+                                        drone_id, drone_class="heavy")
+    assert system.query_mission_safety(heavy("H1", 45), response_format="summary")["status"] == "APPROVED"
+    # One layer up and 35 m apart: inside the 40 m vertical minimum of two heavies
+    assert system.query_mission_safety(heavy("H2", 80), response_format="summary")["status"] == "REJECTED"
@@ -0,0 +1,179 @@
+import asyncio
+import json
+import random
+
+import pytest
+
+from approval_server import ApprovalServer
+from benchmarks.load_generator import random_mission
+from src.deconfliction_system import DeconflictionSystem
+from src.mission_io import mission_to_dict
+from data.sample_missions import create_sample_missions_3d
+
+
+async def post(reader, writer, body):
+    writer.write(f"POST /missions HTTP/1.1\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line == b"\r\n":
+            break
+        name, _, value = line.decode().partition(":")
+        headers[name.lower()] = value.strip()
+    return status, headers, await reader.readexactly(int(headers["content-length"]))
+
+
+def run_against_server(scenario, **server_options):
+    async def main():
+        system = DeconflictionSystem(safety_distance=5.0, mode="3d", verbose=False)
+        server = await ApprovalServer(system, port=0, **server_options).start()
+        reader, writer = await asyncio.open_connection(server.host, server.port)
+        try:
+            return await scenario(reader, writer)
+        finally:
+            writer.close()
+            await server.close()
+    return asyncio.run(main())
+
+
+def test_keep_alive_connection_decides_missions_in_order():
+    bodies = [json.dumps(mission_to_dict(m)).encode() for m in create_sample_missions_3d()]
+
+    async def scenario(reader, writer):
+        return [await post(reader, writer, body) for body in bodies]
+
+    responses = run_against_server(scenario)
+    assert [status for status, _, _ in responses] == [200, 200, 200]
+    assert all(headers["connection"] == "keep-alive" for _, headers, _ in responses)
+    assert [json.loads(payload)["status"] for _, _, payload in responses] == ["APPROVED", "APPROVED", "REJECTED"]
+
+
+def test_overload_is_shed_with_retry_after():
+    body = json.dumps(mission_to_dict(create_sample_missions_3d()[0])).encode()
+
+    async def scenario(reader, writer):
+        return await post(reader, writer, body)
+
+    status, headers, _ = run_against_server(scenario, max_pending=0)
+    assert status == 503
+    assert headers["retry-after"] == "1"
+
+
+def test_malformed_mission_is_rejected():
+    async def scenario(reader, writer):
+        return await post(reader, writer, b'{"drone_id": "X"}')
+
+    status, _, _ = run_against_server(scenario)
+    assert status == 400
+
+
+def test_oversized_body_is_refused_without_stalling_the_server():
+    async def main():
+        system = DeconflictionSystem(safety_distance=5.0, mode="3d", verbose=False)
+        server = await ApprovalServer(system, port=0).start()
+        try:
+            # Announce a 5 MB body, send 100 bytes of it and hang up
+            reader, writer = await asyncio.open_connection(server.host, server.port)
+            writer.write(b"POST /missions HTTP/1.1\r\nContent-Length: 5000000\r\n\r\n" + b"x" * 100)
+            await writer.drain()
+            refused = await asyncio.wait_for(reader.readline(), 5)
+            writer.close()
+
+            reader, writer = await asyncio.open_connection(server.host, server.port)
+            writer.write(b"GET /status HTTP/1.1\r\nConnection: close\r\n\r\n")
+            await writer.drain()
+            status = await asyncio.wait_for(reader.readline(), 5)
+            writer.close()
+            return refused, status
+        finally:
+            await server.close()
+
+    refused, status = asyncio.run(main())
+    assert refused.split()[1] == b"413"
+    assert status.split()[1] == b"200"
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_batch_decides_like_one_by_one_queries(workers):
+    rng = random.Random(30)
+    store = [random_mission(rng, f"S{i}", area=3000.0) for i in range(60)]
+    batch = [random_mission(rng, f"B{i}", area=3000.0) for i in range(40)]
+    decided = lambda result: {key: value for key, value in result.items() if key != "timestamp"}
+
+    one_by_one = DeconflictionSystem(safety_distance=50.0, mode="3d", verbose=False)
+    batched = DeconflictionSystem(safety_distance=50.0, mode="3d", verbose=False, workers=workers)
+    for system in (one_by_one, batched):
+        system.approved_missions = list(store)
+    expected = [decided(one_by_one.query_mission_safety(m, response_format="summary")) for m in batch]
+    assert [decided(r) for r in batched.query_mission_batch(batch)] == expected
+    assert {"APPROVED", "REJECTED"} <= {r["status"] for r in expected}
+    assert batched.approved_missions == one_by_one.approved_missions
+
+
+def test_concurrent_requests_are_coalesced_into_batches():
+    rng = random.Random(31)
+    bodies = [json.dumps(mission_to_dict(random_mission(rng, f"M{i}", area=3000.0))).encode() for i in range(24)]
+
+    async def main():
+        system = DeconflictionSystem(safety_distance=5.0, mode="3d", verbose=False)
+        server = await ApprovalServer(system, port=0, batch_window=0.05).start()
+
+        async def one(body):
+            reader, writer = await asyncio.open_connection(server.host, server.port)
+            try:
+                return await post(reader, writer, body)
+            finally:
+                writer.close()
+
+        try:
+            responses = await asyncio.gather(*(one(body) for body in bodies))
+            return responses, server.batches_run
+        finally:
+            await server.close()
+
+    responses, batches_run = asyncio.run(main())
+    assert [status for status, _, _ in responses] == [200] * len(bodies)
+    assert batches_run < len(bodies)
+
+
+def test_one_bad_request_does_not_fail_its_batch():
+    good = [json.dumps(mission_to_dict(m)).encode() for m in create_sample_missions_3d()[:2]]
+    bad_id = json.dumps({**mission_to_dict(create_sample_missions_3d()[2]), "drone_id": 7}).encode()
+
+    class UnencodableSystem(DeconflictionSystem):
+        """Hands back one result the binary encoder cannot pack"""
+        def query_mission_batch(self, missions, response_format="summary", sample_limit=5):
+            results = super().query_mission_batch(missions, response_format, sample_limit)
+            for result in results:
+                if result["mission_id"] == "BROKEN":
+                    result["mission_id"] = 7
+            return results
+
+    async def main():
+        system = UnencodableSystem(safety_distance=5.0, mode="3d", verbose=False)
+        server = await ApprovalServer(system, port=0, batch_window=0.05).start()
+
+        async def one(body, binary=False):
+            reader, writer = await asyncio.open_connection(server.host, server.port)
+            accept = "Accept: application/octet-stream\r\n" if binary else ""
+            writer.write(f"POST /missions HTTP/1.1\r\n{accept}Content-Length: {len(body)}\r\n\r\n".encode() + body)
+            await writer.drain()
+            try:
+                return int((await asyncio.wait_for(reader.readline(), 5)).split()[1])
+            finally:
+                writer.close()
+
+        broken = json.dumps({**mission_to_dict(create_sample_missions_3d()[2]), "drone_id": "BROKEN"}).encode()
+        try:
+            first = await asyncio.gather(one(good[0]), one(bad_id, binary=True), one(good[1]))
+            second = await asyncio.gather(one(broken, binary=True), one(good[0]))
+            return first, second, [m.drone_id for m in system.approved_missions]
+        finally:
+            await server.close()
+
+    first, second, approved = asyncio.run(main())
+    assert first == [200, 400, 200]  # a non-string drone_id never reaches the system
+    assert second == [500, 200]      # an encoding failure only fails its own request
+    assert 7 not in approved
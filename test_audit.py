@@ -0,0 +1,42 @@
+import json
+import random
+
+from audit_missions import main
+from src.audit import iter_conflicts, iter_conflicts_parallel
+from src.conflict_detector import ConflictDetector
+from src.mission_io import mission_to_dict
+from tests_support import random_mission
+
+
+def sample_missions():
+    rng = random.Random(32)
+    return [random_mission(rng, f"M{i}") for i in range(25)]
+
+
+def test_parallel_audit_streams_same_conflicts_in_same_order():
+    missions = sample_missions()
+    detector = ConflictDetector(safety_distance=30.0, mode="3d")
+    serial = list(iter_conflicts(detector, missions))
+    assert serial
+    assert list(iter_conflicts_parallel(detector, missions, workers=2, max_in_flight=3)) == serial
+
+
+def test_primary_audit_matches_check_mission_against_others():
+    missions = sample_missions()
+    detector = ConflictDetector(safety_distance=30.0, mode="3d")
+    expected = detector.check_mission_against_others(missions[3], missions)
+    assert [detector.format_conflict(r) for r in iter_conflicts(detector, missions, primary_index=3)] == expected
+
+
+def test_cli_writes_jsonl(tmp_path):
+    missions = sample_missions()
+    source = tmp_path / "missions.jsonl"
+    source.write_text("\n".join(json.dumps(mission_to_dict(m)) for m in missions))
+    target = tmp_path / "conflicts.jsonl"
+
+    status = main([str(source), "--mode", "3d", "--safety-distance", "30", "--format", "jsonl",
+                   "-o", str(target), "--fail-on-conflict"])
+    lines = target.read_text().splitlines()
+    assert status == 1
+    assert len(lines) == len(list(iter_conflicts(ConflictDetector(30.0, mode="3d"), missions)))
+    assert set(json.loads(lines[0])) == {"drone_a", "drone_b", "time", "pos1", "pos2", "distance"}
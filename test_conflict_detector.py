@@ -0,0 +1,38 @@
+import random
+
+from src.models import waypoint, Mission
+from src.conflict_detector import ConflictDetector
+from data.sample_missions import create_sample_missions_2d, create_sample_missions_3d
+from tests_support import random_mission
+
+
+def test_engines_agree_on_sample_missions():
+    for missions, mode in ((create_sample_missions_2d(), "2d"), (create_sample_missions_3d(), "3d")):
+        python = ConflictDetector(safety_distance=5.0, mode=mode)
+        vectorized = ConflictDetector(safety_distance=5.0, mode=mode, engine="numpy")
+        expected = python.check_mission_against_others(missions[0], missions[1:])
+        assert expected
+        assert vectorized.check_mission_against_others(missions[0], missions[1:]) == expected
+
+
+def test_engines_agree_on_random_missions():
+    rng = random.Random(28)
+    missions = [random_mission(rng, f"M{i}", is_3d=(i % 2 == 0)) for i in range(30)]
+    for mode in ("2d", "3d", "auto"):
+        python = ConflictDetector(safety_distance=40.0, time_step=0.7, mode=mode)
+        vectorized = ConflictDetector(safety_distance=40.0, time_step=0.7, mode=mode, engine="numpy")
+        for m in missions[1:]:
+            assert (python.check_conflicts_between_missions(missions[0], m) ==
+                    vectorized.check_conflicts_between_missions(missions[0], m))
+
+
+def test_dimension_flag_follows_waypoint_changes():
+    mission = Mission([waypoint(0, 0, time=0), waypoint(5, 5, time=10)], 0, 10, "M")
+    assert not mission.is_3d_mission()
+    mission.waypoints.append(waypoint(5, 5, 20, 20))
+    assert mission.is_3d_mission()
+    mission.waypoints = [waypoint(0, 0, time=0), waypoint(5, 5, time=10)]
+    assert not mission.is_3d_mission()
+    mission.waypoints[0].z = 30
+    mission.invalidate_trajectory()
+    assert mission.is_3d_mission()
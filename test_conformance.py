@@ -0,0 +1,133 @@
+import socket
+import threading
+import time
+
+import pytest
+
+from src.conformance import ConformanceMonitor, PositionReport, follow_file, parse_report, receive_datagrams
+from src.deconfliction_system import DeconflictionSystem
+from src.kernels import track_3d
+from src.models import waypoint, Mission
+
+
+def east(drone_id, y, z=50.0, t0=0.0, t1=100.0):
+    return Mission([waypoint(0, y, z, t0), waypoint(500, y, z, t0 + 50), waypoint(1000, y, z, t1)],
+                   t0, t1, drone_id)
+
+
+def monitored_system():
+    system = DeconflictionSystem(safety_distance=20.0, mode="3d", verbose=False)
+    for mission in (east("A", 0), east("B", 100), east("FAR", 5000)):
+        assert system.query_mission_safety(mission)["status"] == "APPROVED"
+    return system
+
+
+def test_parse_report_formats():
+    assert parse_report("D1,12.5,1,2,3\n") == PositionReport("D1", 12.5, 1.0, 2.0, 3.0)
+    assert parse_report("D1,12.5,1,2") == PositionReport("D1", 12.5, 1.0, 2.0, 0.0)
+    assert parse_report('{"drone_id": "D1", "time": 3, "x": 1, "y": 2}') == PositionReport("D1", 3.0, 1.0, 2.0)
+    with pytest.raises(ValueError):
+        parse_report("D1,abc,1,2")
+    with pytest.raises(ValueError):
+        parse_report('{"drone_id": "D1"}')
+    with pytest.raises(ValueError):
+        parse_report("D1,nan,1,2")
+
+
+def test_cursor_lookup_matches_the_kernels_in_and_out_of_order():
+    system = monitored_system()
+    monitor = ConformanceMonitor(system, max_deviation=1.0)
+    traj = system.approved_missions[0].compiled()
+    times = [0.0, 0.5, 10.0, 50.0, 50.0, 75.3, 20.0, 99.9, 100.0, 60.0]
+    for t in times:
+        x, y, z = track_3d(traj, [t])[0]
+        assert monitor.ingest(PositionReport("A", t, x, y, z)) is None
+    assert monitor.reports == len(times) and monitor.deviations == 0
+
+
+def test_drift_is_flagged_and_rechecked_against_nearby_traffic():
+    system = monitored_system()
+    flagged = []
+    monitor = ConformanceMonitor(system, max_deviation=15.0, lookahead=30.0, recheck_interval=5.0,
+                                 on_deviation=flagged.append)
+    # A drifts north towards B's lane (y = 100), 5 m further each second
+    deviations = [d for t in range(0, 20)
+                  if (d := monitor.ingest(PositionReport("A", float(t), 10.0 * t, 5.0 * t, 50.0))) is not None]
+    assert [d.time for d in deviations] == [4.0, 9.0, 14.0, 19.0]
+    assert flagged == deviations
+    assert deviations[0].planned == (40.0, 0.0, 50.0) and deviations[0].distance == pytest.approx(20.0)
+    # 85 m north of plan at t = 19: the shifted plan runs within 20 m of B
+    assert {r.drone_b for r in deviations[-1].conflicts} == {"B"}
+    assert not deviations[0].conflicts
+
+
+def test_unplanned_drones_and_new_approvals():
+    system = monitored_system()
+    monitor = ConformanceMonitor(system, max_deviation=15.0, recheck_interval=10.0)
+    first = monitor.ingest(PositionReport("GHOST", 5.0, 500.0, 100.0, 50.0))
+    assert first.planned is None and first.distance == float("inf")
+    assert {r.drone_b for r in first.conflicts} == {"B"}
+    assert monitor.ingest(PositionReport("GHOST", 6.0, 500.0, 100.0, 50.0)) is None  # within recheck_interval
+
+    system.query_mission_safety(east("GHOST", 3000))
+    assert monitor.ingest(PositionReport("GHOST", 20.0, 200.0, 3000.0, 50.0)) is None  # now on plan
+
+
+def test_malformed_lines_are_skipped_and_counted():
+    system = monitored_system()
+    skipped = []
+    monitor = ConformanceMonitor(system, max_deviation=15.0, on_malformed=lambda line, exc: skipped.append(line))
+    lines = ["A,10,100,0,50", "A,11,garbage,0", "", b"A,12,\xff\xfe,0,50".decode("utf-8", "replace"),
+             "A,13", "A,14,140,0,50"]
+    assert list(monitor.ingest_lines(lines)) == []
+    assert monitor.reports == 2 and monitor.malformed == 3
+    assert skipped == [lines[1], lines[3], lines[4]]
+
+
+def test_follow_file_streams_appended_lines(tmp_path):
+    path = tmp_path / "telemetry.csv"
+    path.write_text("A,0,0,0,50\n")
+    done = threading.Event()
+
+    def writer():
+        with open(path, "a") as f:
+            for t in range(1, 5):
+                f.write(f"A,{t},{10 * t}")
+                f.flush()
+                time.sleep(0.01)
+                f.write(",0,50\n")
+                f.flush()
+        time.sleep(0.05)
+        done.set()
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    lines = list(follow_file(str(path), poll_interval=0.005, stop=done.is_set))
+    thread.join()
+    assert lines == [f"A,{t},{10 * t},0,50\n" for t in range(5)]
+
+
+def test_receive_datagrams():
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    received = []
+    stop = threading.Event()
+
+    def consume():
+        for line in receive_datagrams("127.0.0.1", port, stop=stop.is_set, timeout=0.01):
+            received.append(line)
+            if len(received) == 3:
+                stop.set()
+
+    thread = threading.Thread(target=consume)
+    thread.start()
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sender:
+        deadline = time.time() + 5
+        while not stop.is_set() and time.time() < deadline:
+            sender.sendto(b"A,0,0,0,50\nA,1,10,0,50\nA,2,20,\xff\xfe,50", ("127.0.0.1", port))
+            time.sleep(0.02)
+    stop.set()
+    thread.join()
+    # Invalid UTF-8 is replaced rather than stopping the receiver
+    assert received[:3] == ["A,0,0,0,50", "A,1,10,0,50", "A,2,20,\ufffd\ufffd,50"]
@@ -0,0 +1,58 @@
+import random
+
+import numpy as np
+
+from src.congestion import compute_congestion
+from src.deconfliction_system import DeconflictionSystem
+from src.models import waypoint, Mission
+from tests_support import random_mission
+
+
+def test_every_sample_lands_in_one_bin():
+    rng = random.Random(41)
+    missions = [random_mission(rng, f"M{i}") for i in range(40)]
+    grid = compute_congestion(missions, time_step=0.5, cell_size=50.0, time_bin=30.0, altitude_bin=20.0)
+    assert grid.occupancy.ndim == 4
+    grid_times = np.cumsum(np.r_[min(m.start_time for m in missions), np.full(2000, 0.5)])
+    expected = sum(int(((grid_times >= m.start_time) & (grid_times <= m.end_time)).sum()) for m in missions)
+    assert grid.occupancy.sum() == expected == grid.timeline().sum() == grid.spatial().sum()
+
+
+def test_near_misses_match_separation_curves():
+    rng = random.Random(7)
+    missions = [random_mission(rng, f"M{i}", is_3d=False) for i in range(25)]
+    system = DeconflictionSystem(safety_distance=30.0, mode="2d", verbose=False)
+    system.approved_missions = missions
+    grid = system.congestion(cell_size=60.0, time_bin=50.0)
+
+    # Brute force on the same shared grid with the reference sampler
+    detector = system.detector
+    grid_times = np.cumsum(np.r_[min(m.start_time for m in missions), np.full(400, 1.0)])
+    expected = 0
+    for i in range(len(missions)):
+        for j in range(i + 1, len(missions)):
+            a, b = missions[i], missions[j]
+            for t in grid_times[(grid_times >= max(a.start_time, b.start_time)) &
+                                (grid_times <= min(a.end_time, b.end_time))]:
+                d = detector.distance_2d(detector.get_position_at_time(a, t), detector.get_position_at_time(b, t))
+                expected += d < 30.0
+    assert expected and grid.near_misses.sum() == expected
+    assert grid.hotspots(1, grid.near_misses)[0][-1] == grid.near_misses.max()
+
+
+def test_hotspot_is_where_traffic_crosses():
+    cross = [Mission([waypoint(0, 500, 0, 0), waypoint(1000, 500, 0, 100)], 0, 100, "EW"),
+             Mission([waypoint(500, 0, 0, 0), waypoint(500, 1000, 0, 100)], 0, 100, "NS")]
+    grid = compute_congestion(cross, cell_size=100.0, time_bin=100.0, near_miss_distance=20.0)
+    t0, x0, y0, count = grid.hotspots(1, grid.near_misses)[0]
+    assert (x0, y0) == (500.0, 500.0) and count > 0
+
+
+def test_near_misses_follow_the_detector_mode_not_the_binning():
+    low = Mission([waypoint(0, 0, 20, 0), waypoint(1000, 0, 20, 100)], 0, 100, "LOW")
+    high = Mission([waypoint(0, 5, 400, 0), waypoint(1000, 5, 400, 100)], 0, 100, "HIGH")
+    for mode, expected in (("3d", 0), ("auto", 0), ("2d", 101)):
+        system = DeconflictionSystem(safety_distance=10.0, mode=mode, verbose=False)
+        system.approved_missions = [low, high]
+        assert system.congestion(cell_size=100.0, time_bin=50.0).near_misses.sum() == expected
+        assert system.congestion(cell_size=100.0, time_bin=50.0, altitude_bin=50.0).near_misses.sum() == expected
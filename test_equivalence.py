@@ -0,0 +1,195 @@
+"""
+Differential tests: every accelerated conflict path against the reference sampler.
+
+The oracle steps through the overlap window exactly like the original
+check_conflicts_between_missions loop, positioning each drone with
+ConflictDetector.get_position_at_time. Every sampled violation must be found
+by each fast path; anything a fast path finds beyond that must sit within float
+noise of the threshold, or (for the continuous closest-approach path) between
+sample instants.
+
+Run directly for a timing report alongside the checks:
+
+    python test_equivalence.py --seeds 40
+"""
+from itertools import combinations
+import time
+
+import pytest
+
+from src.audit import iter_conflicts
+from src.conflict_detector import ConflictDetector
+from src.deconfliction_system import DeconflictionSystem
+from src.models import Mission
+from src.parallel import find_conflicts_threaded
+from tests_support import generated_missions
+
+NOISE = 1e-9  # distance slack for ulp-level differences between interpolation formulas
+SEEDS = range(6)
+
+
+def reference_samples(detector: ConflictDetector, mission1: Mission, mission2: Mission):
+    """{time: distance} at every sample instant of the original per-sample loop"""
+    is_3d = detector.is_3d_pair(mission1, mission2)
+    distance = detector.distance_3d if is_3d else detector.distance_2d
+    start = max(mission1.start_time, mission2.start_time)
+    end = min(mission1.end_time, mission2.end_time)
+    samples = {}
+    t = start
+    while t <= end:
+        p1 = detector.get_position_at_time(mission1, t)
+        p2 = detector.get_position_at_time(mission2, t)
+        if is_3d:
+            # auto mode with a 2D mission in a 3D pair: its altitude is the waypoints' 0
+            p1, p2 = (p1 + (0.0,))[:3], (p2 + (0.0,))[:3]
+        samples[t] = distance(p1, p2)
+        t += detector.time_step
+    return samples
+
+
+def assert_matches_reference(detector, mission1, mission2, records, reference=None):
+    """Every sampled violation is found; extras only within float noise of the threshold"""
+    reference = reference_samples(detector, mission1, mission2) if reference is None else reference
+    threshold = detector.pair_threshold(mission1, mission2)
+    found = {record.time: record.distance for record in records}
+    for t, d in reference.items():
+        if d < threshold - NOISE:
+            assert t in found, f"{mission1.drone_id}/{mission2.drone_id}: missed violation at t={t} (d={d})"
+    for t, d in found.items():
+        assert t in reference, f"{mission1.drone_id}/{mission2.drone_id}: t={t} is not a sample instant"
+        assert d == pytest.approx(reference[t], abs=NOISE)
+        assert reference[t] < threshold + NOISE, f"extra violation at t={t} (reference d={reference[t]})"
+
+
+def detectors(mode):
+    return {
+        "python": ConflictDetector(safety_distance=35.0, time_step=0.7, mode=mode),
+        "numpy": ConflictDetector(safety_distance=35.0, time_step=0.7, mode=mode, engine="numpy"),
+    }
+
+
+def _reference(references, mission1, mission2):
+    """Reference samples of a pair in either order (distances are symmetric)"""
+    key = (mission1.drone_id, mission2.drone_id)
+    return references[key] if key in references else references[key[::-1]]
+
+
+def run_paths(seed: int, mode: str):
+    """
+    Check every fast path on one generated fleet. Returns
+    {path: (reference_seconds, path_seconds)} for the timing report.
+    """
+    missions = generated_missions(seed)
+    dets = detectors(mode)
+    reference_detector = dets["python"]
+
+    by_pair = {(a.drone_id, b.drone_id): (a, b) for a, b in combinations(missions, 2)}
+    started = time.perf_counter()
+    references = {key: reference_samples(reference_detector, a, b) for key, (a, b) in by_pair.items()}
+    reference_seconds = time.perf_counter() - started
+    timings = {}
+    assert any(d < reference_detector.safety_distance for samples in references.values() for d in samples.values())
+
+    # Pairwise engines
+    for name in ("python", "numpy"):
+        detector = dets[name]
+        started = time.perf_counter()
+        results = {key: detector.find_conflicts(a, b) for key, (a, b) in by_pair.items()}
+        timings[name] = (reference_seconds, time.perf_counter() - started)
+        for key, (a, b) in by_pair.items():
+            assert_matches_reference(detector, a, b, results[key], references[key])
+
+    # Thread pool, primary against the rest of the fleet (called directly: fleets this
+    # small stay below the detector's threading cut-over)
+    detector = dets["numpy"]
+    started = time.perf_counter()
+    results = [find_conflicts_threaded(detector, primary, [m for m in missions if m is not primary], workers=3)
+               for primary in missions]
+    timings["threads"] = (reference_seconds, time.perf_counter() - started)
+    for primary, records in zip(missions, results):
+        for other in missions:
+            if other is primary:
+                continue
+            reference = _reference(references, primary, other)
+            assert_matches_reference(detector, primary, other,
+                                     [r for r in records if r.drone_b == other.drone_id], reference)
+
+    # Sweep-line audit over all pairs
+    started = time.perf_counter()
+    records = list(iter_conflicts(reference_detector, missions))
+    timings["sweep audit"] = (reference_seconds, time.perf_counter() - started)
+    for key, (a, b) in by_pair.items():
+        assert_matches_reference(reference_detector, a, b,
+                                 [r for r in records if (r.drone_a, r.drone_b) == key], references[key])
+
+    # Occupancy-prescreened approval decisions (in a what-if session, so nothing is stored)
+    fleet, probes = missions[::2], missions[1::2]
+    system = DeconflictionSystem(safety_distance=35.0, time_step=0.7, mode=mode, verbose=False)
+    system.approved_missions = list(fleet)
+    started = time.perf_counter()
+    with system.what_if() as session:
+        decisions = [session.query_mission_safety(probe, "summary")["status"] for probe in probes]
+    timings["prescreen"] = (reference_seconds, time.perf_counter() - started)
+    threshold = system.detector.safety_distance
+    approved = list(fleet)  # approvals inside the session count for the probes after them
+    for probe, decision in zip(probes, decisions):
+        closest = min((d for other in approved for d in _reference(references, probe, other).values()),
+                      default=float("inf"))
+        if abs(closest - threshold) > NOISE:
+            assert decision == ("REJECTED" if closest < threshold else "APPROVED"), probe.drone_id
+        if decision == "APPROVED":
+            approved.append(probe)
+
+    # Continuous closest approach: anything found that sampling misses lies between samples
+    started = time.perf_counter()
+    approaches = {key: reference_detector.closest_approach(a, b) for key, (a, b) in by_pair.items()}
+    timings["closest approach"] = (reference_seconds, time.perf_counter() - started)
+    for key, (t_min, d_min) in approaches.items():
+        sampled = references[key]
+        if not sampled:
+            continue
+        sampled_min = min(sampled.values())
+        assert d_min <= sampled_min + NOISE, key
+        if sampled_min < threshold - NOISE:
+            assert d_min < threshold, key
+        elif d_min < threshold - NOISE:
+            assert t_min not in sampled, key  # a genuine between-samples violation
+    return timings
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+@pytest.mark.parametrize("mode", ["2d", "3d", "auto"])
+def test_fast_paths_match_reference_sampler(seed, mode, record_property):
+    for path, (reference_seconds, path_seconds) in run_paths(seed, mode).items():
+        record_property(f"{path} speedup", reference_seconds / max(path_seconds, 1e-9))
+
+
+def test_generator_covers_edge_cases():
+    missions = [m for seed in SEEDS for m in generated_missions(seed)]
+    assert any(m.is_3d_mission() for m in missions) and any(not m.is_3d_mission() for m in missions)
+    assert any(0 in m.compiled().durations for m in missions)
+    jumps = [m for m in missions
+             if any(a.time == b.time and (a.x, a.y, a.z) != (b.x, b.y, b.z)
+                    for a, b in zip(m.waypoints, m.waypoints[1:]))]
+    assert len(jumps) >= 5
+    assert any(m.end_time > m.waypoints[-1].time for m in missions)
+    assert any(m.start_time < m.waypoints[0].time for m in missions)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seeds", type=int, default=20)
+    args = parser.parse_args()
+
+    totals = {}
+    for seed in range(args.seeds):
+        for mode in ("2d", "3d", "auto"):
+            for path, (reference_seconds, path_seconds) in run_paths(seed, mode).items():
+                ref_total, path_total = totals.get(path, (0.0, 0.0))
+                totals[path] = (ref_total + reference_seconds, path_total + path_seconds)
+    print(f"All paths match the reference sampler on {args.seeds} seeds x 3 modes")
+    for path, (reference_seconds, path_seconds) in totals.items():
+        print(f"  {path:<17} {path_seconds * 1000:8.1f} ms vs reference {reference_seconds * 1000:8.1f} ms "
+              f"({reference_seconds / path_seconds:5.1f}x)")
@@ -0,0 +1,121 @@
+import math
+import random
+
+import pytest
+
+from src.deconfliction_system import DeconflictionSystem
+from src.geofence import GeoZone, GeofenceIndex, segment_entry
+from src.models import waypoint, Mission
+from src.serialization import decode_binary
+
+SQUARE = [(0, 0), (100, 0), (100, 100), (0, 100)]
+
+
+def random_zones(rng, count, area=5000.0):
+    zones = []
+    for i in range(count):
+        cx, cy, r = rng.uniform(0, area), rng.uniform(0, area), rng.uniform(20, 150)
+        sides = rng.randint(3, 8)
+        polygon = [(cx + r * math.cos(2 * math.pi * k / sides), cy + r * math.sin(2 * math.pi * k / sides))
+                   for k in range(sides)]
+        floor = rng.choice([-math.inf, rng.uniform(0, 60)])
+        zones.append(GeoZone(f"Z{i}", polygon, floor=floor, ceiling=floor + rng.uniform(20, 100)))
+    return zones
+
+
+def random_flight(rng, drone_id, area=5000.0):
+    t = rng.uniform(0, 100)
+    wps = []
+    for _ in range(rng.randint(2, 6)):
+        wps.append(waypoint(rng.uniform(0, area), rng.uniform(0, area), rng.uniform(5, 120), t))
+        t += rng.uniform(30, 200)
+    return Mission(wps, wps[0].time, wps[-1].time, drone_id)
+
+
+def test_segment_entry_is_exact():
+    zone = GeoZone("Z", SQUARE, floor=50, ceiling=80, start_time=0, end_time=100)
+    # Level flight through the middle at 60 m enters at x = 0 (s = 0.25)
+    assert segment_entry(zone, (-100, 50, 60), (300, 50, 60), 0, 40) == 0.25
+    # Same path above the ceiling, or after the zone expires
+    assert segment_entry(zone, (-100, 50, 90), (300, 50, 90), 0, 40) is None
+    assert segment_entry(zone, (-100, 50, 60), (300, 50, 60), 200, 240) is None
+    # Descending over the square: enters through the ceiling above the polygon
+    s = segment_entry(zone, (50, 50, 120), (50, 50, 0), 0, 10)
+    assert math.isclose(s, 40 / 120)
+    # Passing beside the square never enters it
+    assert segment_entry(zone, (-10, -10, 60), (-10, 200, 60), 0, 10) is None
+    # Altitude ignored (2D): the high path counts
+    assert segment_entry(zone, (-100, 50, 90), (300, 50, 90), 0, 40, use_altitude=False) == 0.25
+
+
+def test_index_matches_checking_every_zone():
+    rng = random.Random(42)
+    zones = random_zones(rng, 800)
+    indexed = GeofenceIndex(zones, cell_size=250.0)
+    flat = GeofenceIndex(zones, cell_size=1e9)  # a single cell: every zone is a candidate
+    hits = 0
+    for i in range(20):
+        mission = random_flight(rng, f"M{i}")
+        for use_altitude in (True, False):
+            expected = flat.check_mission(mission, use_altitude)
+            assert indexed.check_mission(mission, use_altitude) == expected
+            hits += len(expected)
+    assert hits
+
+
+def test_dense_sampling_never_finds_an_unreported_entry():
+    rng = random.Random(7)
+    zones = random_zones(rng, 120, area=1500.0)
+    index = GeofenceIndex(zones, cell_size=200.0)
+    for i in range(10):
+        mission = random_flight(rng, f"M{i}", area=1500.0)
+        reported = {v.zone_id: v.time for v in index.check_mission(mission)}
+        traj = mission.compiled()
+        min_x, min_y, _, max_x, max_y, _ = traj.bounds
+        for zone in index.candidates(min_x, min_y, max_x, max_y):
+            for k in range(traj.count - 1):
+                for step in range(61):
+                    s = step / 60
+                    x = traj.xs[k] + s * (traj.xs[k + 1] - traj.xs[k])
+                    y = traj.ys[k] + s * (traj.ys[k + 1] - traj.ys[k])
+                    z = traj.zs[k] + s * (traj.zs[k + 1] - traj.zs[k])
+                    t = traj.times[k] + s * (traj.times[k + 1] - traj.times[k])
+                    if zone.floor <= z <= zone.ceiling and zone.contains_xy(x, y):
+                        assert zone.zone_id in reported and reported[zone.zone_id] <= t + 1e-9
+
+
+def test_query_rejects_missions_entering_a_zone():
+    system = DeconflictionSystem(safety_distance=10.0, mode="3d", verbose=False)
+    queue = system.enable_replanning()
+    system.add_geofences([GeoZone("AIRPORT", SQUARE, floor=0, ceiling=150)])
+    through = Mission([waypoint(-100, 50, 60, 0), waypoint(300, 50, 60, 40)], 0, 40, "THROUGH")
+    over = Mission([waypoint(-100, 50, 200, 0), waypoint(300, 50, 200, 40)], 0, 40, "OVER")
+
+    result = system.query_mission_safety(through, response_format="summary")
+    assert result["status"] == "REJECTED" and result["conflicts_detected"] == 0
+    assert result["geofence_violations"] == [{"zone_id": "AIRPORT", "time": 10.0, "position": [0.0, 50.0, 60.0]}]
+    assert "AIRPORT" in result["recommendations"][0]
+    assert len(queue) == 0  # nothing to wait for
+
+    frame = system.query_mission_safety(through, response_format="binary")
+    assert decode_binary(frame)["geofence_violations"] == [{"zone_id": "AIRPORT", "time": 10.0}]
+    assert system.query_mission_safety(over)["status"] == "APPROVED"
+
+
+def test_simplified_routes_are_checked_within_their_tolerance():
+    # Simplification cuts the corner at (50, 4); the flown path still enters the zone
+    zone = GeoZone("TOWER", [(45, 3), (55, 3), (55, 10), (45, 10)])
+    route = lambda: Mission([waypoint(0, 0, 50, 0), waypoint(50, 4, 50, 50), waypoint(100, 0, 50, 100)],
+                            0, 100, "CORNER")
+    for epsilon in (None, 5.0):
+        system = DeconflictionSystem(safety_distance=10.0, mode="3d", verbose=False, simplify_epsilon=epsilon)
+        system.add_geofences([zone])
+        assert system.query_mission_safety(route(), response_format="summary")["status"] == "REJECTED"
+
+    # The grown zone is exact: just beyond the tolerance is clear, just inside it is not
+    level = ((0, 0, 50), (100, 0, 50))
+    assert segment_entry(zone, *level, 0, 100, tolerance=2.9) is None
+    assert segment_entry(zone, *level, 0, 100, tolerance=3.1) is not None
+    corner = ((0, -3.5, 50), (42, -3.5, 50))  # ends about 7.16 m from (45, 3)
+    assert segment_entry(zone, *corner, 0, 100, tolerance=7.1) is None
+    assert segment_entry(zone, *corner, 0, 100, tolerance=7.2) == pytest.approx(1.0, abs=0.01)
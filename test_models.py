@@ -0,0 +1,68 @@
+import pickle
+
+import pytest
+
+from src.conflict_detector import ConflictDetector
+from src.models import waypoint, Mission, WaypointList
+
+
+@pytest.mark.parametrize("wps, start, end, message", [
+    ([waypoint(0, 0, time=0)], 0, 10, "at least 2 waypoints"),
+    ([waypoint(0, 0, time=10), waypoint(5, 5, time=0)], 0, 10, "non-decreasing"),
+    ([waypoint(0, 0, time=0), waypoint(5, 5, time=10)], 10, 0, "before start_time"),
+    ([waypoint(0, 0, time=0), waypoint(5, 5, time=10)], 20, 30, "does not overlap"),
+    ([waypoint(0, float("nan"), time=0), waypoint(5, 5, time=10)], 0, 10, "finite"),
+])
+def test_invalid_missions_are_rejected_at_construction(wps, start, end, message):
+    with pytest.raises(ValueError, match=message):
+        Mission(wps, start, end, "BAD")
+
+
+def test_segment_geometry_is_precompiled():
+    mission = Mission([waypoint(0, 0, 10, 0), waypoint(20, -10, 10, 10), waypoint(20, -10, 10, 10),
+                       waypoint(20, 30, 50, 30)], 0, 30, "M")
+    traj = mission.compiled()
+    assert traj.durations == [10, 0, 20]
+    assert (traj.vxs, traj.vys, traj.vzs) == ([2.0, 0.0, 0.0], [-1.0, 0.0, 2.0], [0.0, 0.0, 2.0])
+    assert traj.bboxes[0] == (0, -10, 10, 20, 0, 10)
+    assert traj.bounds == (0, -10, 10, 20, 30, 50)
+
+
+def test_replacing_a_waypoint_recompiles():
+    mission = Mission([waypoint(0, 0, 10, 0), waypoint(20, 0, 10, 10)], 0, 10, "M")
+    traj = mission.compiled()
+    assert mission.compiled() is traj
+    mission.waypoints[1] = waypoint(20, 40, 10, 10)
+    assert mission.compiled().bounds == (0, 0, 10, 20, 40, 10)
+    detector = ConflictDetector(safety_distance=5.0, time_step=1.0, mode="3d")
+    other = Mission([waypoint(20, 40, 10, 0), waypoint(20, 40, 10, 10)], 0, 10, "O")
+    assert detector.check_conflicts_between_missions(mission, other)
+
+
+def test_list_edits_recompile_and_reassignment_is_wrapped():
+    mission = Mission([waypoint(0, 0, 10, 0), waypoint(20, 0, 10, 10)], 0, 30, "M")
+    traj = mission.compiled()
+    mission.waypoints += [waypoint(20, 0, 10, 30)]
+    assert mission.compiled().count == 3
+    mission.waypoints[1:] = [waypoint(40, 0, 10, 30)]
+    assert mission.compiled().bounds == (0, 0, 10, 40, 0, 10)
+    del mission.waypoints[1]
+    mission.waypoints.insert(1, waypoint(5, 5, 10, 30))
+    assert mission.compiled().xs == [0, 5]
+
+    mission.waypoints = [waypoint(0, 0, 10, 0), waypoint(1, 1, 10, 30)]
+    assert isinstance(mission.waypoints, WaypointList)
+    copy = pickle.loads(pickle.dumps(mission))
+    assert copy == mission and copy.compiled().xs == [0, 1]
+    copy.waypoints.pop()
+    copy.waypoints.append(waypoint(2, 2, 10, 30))
+    assert copy.compiled().xs == [0, 2] and traj.xs == [0, 20]
+
+
+def test_positions_match_reference_interpolation():
+    mission = Mission([waypoint(0, 0, 10, 0), waypoint(7, -3, 12, 3), waypoint(7, -3, 12, 3),
+                       waypoint(1, 9, 30, 11)], 0, 12, "M")
+    detector = ConflictDetector(safety_distance=100.0, time_step=0.25, mode="3d")
+    other = Mission([waypoint(0, 0, 10, 0), waypoint(0, 0, 10, 12)], 0, 12, "O")
+    for record in detector.find_conflicts(mission, other):
+        assert record.pos1 == pytest.approx(detector.get_position_at_time(mission, record.time), abs=1e-9)
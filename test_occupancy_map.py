@@ -0,0 +1,81 @@
+import random
+
+from src.models import waypoint, Mission
+from src.conflict_detector import ConflictDetector
+from src.occupancy_map import OccupancyMap
+from tests_support import random_mission
+
+
+def test_prescreen_never_drops_a_conflict():
+    rng = random.Random(26)
+    detector = ConflictDetector(safety_distance=15.0, time_step=1.0, mode="auto")
+    occupancy = OccupancyMap(cell_size=40.0, time_bucket=10.0, margin=7.5)
+    approved = [random_mission(rng, f"A{i}") for i in range(60)]
+    for m in approved:
+        occupancy.add_mission(m)
+
+    for i in range(40):
+        candidate = random_mission(rng, f"C{i}")
+        screened = occupancy.candidates(candidate)
+        assert len(screened) <= len(approved)
+        assert (detector.check_mission_against_others(candidate, screened) ==
+                detector.check_mission_against_others(candidate, approved))
+
+
+def test_remove_frees_voxels():
+    rng = random.Random(1)
+    occupancy = OccupancyMap(cell_size=40.0, time_bucket=10.0, margin=5.0)
+    missions = [random_mission(rng, f"A{i}") for i in range(10)]
+    for m in missions:
+        occupancy.add_mission(m)
+    assert len(occupancy) == 10
+    for m in missions:
+        occupancy.remove_mission(m)
+    assert len(occupancy) == 0
+    assert occupancy.voxel_count == 0
+
+
+def test_oversized_mission_goes_to_overflow():
+    occupancy = OccupancyMap(cell_size=1.0, time_bucket=1.0, margin=1.0, max_cells_per_mission=50)
+    big = Mission([waypoint(0, 0, 0, 0), waypoint(1000, 1000, 0, 100)], 0, 100, "BIG")
+    small = Mission([waypoint(0, 0, 0, 0), waypoint(1, 1, 0, 1)], 0, 1, "SMALL")
+    occupancy.add_mission(big)
+    assert occupancy.voxel_count == 0
+    assert big in occupancy.candidates(small)
+
+
+def test_system_resyncs_after_the_store_is_replaced():
+    from src.deconfliction_system import DeconflictionSystem
+
+    line = lambda drone_id, y: Mission([waypoint(0, y, 50, 0), waypoint(1000, y, 50, 100)], 0, 100, drone_id)
+    system = DeconflictionSystem(safety_distance=10.0, mode="3d", verbose=False)
+    assert system.query_mission_safety(line("A", 0))["status"] == "APPROVED"
+    version = system._version
+    # Same length, different mission: the index must follow the new list
+    system.approved_missions = [line("B", 500)]
+    assert system.query_mission_safety(line("C", 503))["status"] == "REJECTED"
+    assert system._version > version
+    assert system.query_mission_safety(line("D", 3))["status"] == "APPROVED"
+
+
+def test_candidates_come_back_in_approval_order():
+    occupancy = OccupancyMap(cell_size=40.0, time_bucket=10.0, margin=5.0)
+    line = lambda drone_id: Mission([waypoint(0, 0, 0, 0), waypoint(100, 0, 0, 10)], 0, 10, drone_id)
+    missions = [line(f"A{i}") for i in range(5)]
+    for m in missions:
+        occupancy.add_mission(m)
+    occupancy.remove_mission(missions[1])
+    occupancy.add_mission(missions[1])  # re-approved: now the newest
+    assert occupancy.candidates(line("Q")) == [missions[0], missions[2], missions[3], missions[4], missions[1]]
+
+
+def test_jump_on_a_bucket_boundary_is_rasterized():
+    # A jumps to (100, 500) at t = 10, exactly where a time bucket starts
+    jumper = Mission([waypoint(0, 0, 50, 0), waypoint(0, 0, 50, 10), waypoint(100, 500, 50, 10),
+                      waypoint(200, 0, 50, 20)], 0, 20, "A")
+    hover = Mission([waypoint(110, 450, 50, 10), waypoint(110, 450, 50, 12)], 10, 12, "B")
+    detector = ConflictDetector(safety_distance=10.0, time_step=1.0, mode="3d")
+    assert detector.find_conflicts(jumper, hover)
+    occupancy = OccupancyMap(cell_size=40.0, time_bucket=10.0, margin=5.0)
+    occupancy.add_mission(jumper)
+    assert occupancy.candidates(hover) == [jumper]
@@ -0,0 +1,42 @@
+import random
+
+import pytest
+
+from src.conflict_detector import ConflictDetector
+from src.parallel import find_conflicts_threaded
+from src.separation_minima import SeparationMinima, SeparationTable
+from tests_support import generated_missions, random_mission
+
+
+def test_threaded_check_matches_serial_order_and_values():
+    rng = random.Random(38)
+    primary = random_mission(rng, "P")
+    others = [random_mission(rng, f"M{i}") for i in range(200)] + [primary]
+    serial = ConflictDetector(safety_distance=30.0, mode="3d")
+    threaded = ConflictDetector(safety_distance=30.0, mode="3d", workers=3)
+
+    expected = serial.find_conflicts_against_others(primary, others)
+    assert expected
+    assert threaded.find_conflicts_against_others(primary, others) == expected
+    assert find_conflicts_threaded(serial, primary, others[:5], workers=2) == \
+        serial.find_conflicts_against_others(primary, others[:5])
+
+
+
+@pytest.mark.parametrize("mode", ["auto", "2d"])
+def test_chunked_pool_matches_pair_kernels_on_mixed_fleet_with_jumps(mode):
+    rng = random.Random(7)
+    missions = generated_missions(38, count=80)
+    for mission in missions:
+        mission.drone_class = rng.choice(["quad", "fixed_wing"])
+    table = SeparationTable(SeparationMinima(30.0, 12.0), {("quad", "fixed_wing"): (50.0, 20.0)})
+    reference = ConflictDetector(mode=mode, separation=table)
+    threaded = ConflictDetector(mode=mode, separation=table, workers=2)
+
+    found_any = False
+    for primary in missions[:8]:
+        others = [m for m in missions if m is not primary]
+        expected = [r for other in others for r in reference.find_conflicts(primary, other)]
+        found_any = found_any or bool(expected)
+        assert threaded.find_conflicts_against_others(primary, others) == expected
+    assert found_any
@@ -0,0 +1,97 @@
+from src.deconfliction_system import DeconflictionSystem
+from src.models import waypoint, Mission
+from src.replan_queue import delay_replanner
+
+
+def corridor(drone_id, y, start, duration=100):
+    return Mission([waypoint(0, y, 20, start), waypoint(1000, y, 20, start + duration)],
+                   start, start + duration, drone_id)
+
+
+def test_only_missions_blocked_by_removed_traffic_are_retried():
+    system = DeconflictionSystem(safety_distance=10.0, mode="3d", verbose=False)
+    queue = system.enable_replanning()
+    system.query_mission_safety(corridor("A", 0, 0))
+    system.query_mission_safety(corridor("B", 500, 0))
+    system.query_mission_safety(corridor("X", 3, 0))    # blocked by A
+    system.query_mission_safety(corridor("Y", 503, 0))  # blocked by B
+    assert len(queue) == 2 and queue.ready == 0
+
+    system.cancel_mission("A")
+    assert queue.ready == 1
+    cleared = queue.process_pending()
+    assert [m.drone_id for m, _ in cleared] == ["X"]
+    assert queue.retries == 1
+    assert [m.drone_id for m in system.approved_missions] == ["B", "X"]
+    assert len(queue) == 1  # Y still waits for B
+
+
+def test_retry_that_is_still_blocked_is_reparked():
+    system = DeconflictionSystem(safety_distance=10.0, mode="3d", verbose=False)
+    queue = system.enable_replanning()
+    system.query_mission_safety(corridor("A", 0, 0, 50))
+    system.query_mission_safety(corridor("X", 3, 0))  # blocked by A only
+    hover = Mission([waypoint(900, 12, 20, 60), waypoint(900, 12, 20, 200)], 60, 200, "C")
+    assert system.query_mission_safety(hover, response_format="summary")["status"] == "APPROVED"
+
+    system.expire_missions(current_time=55)  # A gone, X now runs into C
+    assert queue.process_pending() == []
+    assert len(queue) == 1 and queue.ready == 0
+
+    system.cancel_mission("C")
+    assert [m.drone_id for m, _ in queue.process_pending()] == ["X"]
+    assert queue.retries == 2 and queue.cleared == 1
+
+
+def test_missions_are_dropped_after_max_attempts():
+    system = DeconflictionSystem(safety_distance=10.0, mode="3d", verbose=False)
+    queue = system.enable_replanning(max_attempts=1)
+    system.query_mission_safety(corridor("A", 0, 0, 50))
+    system.query_mission_safety(corridor("X", 3, 0))
+    hover = Mission([waypoint(900, 12, 20, 60), waypoint(900, 12, 20, 200)], 60, 200, "C")
+    system.query_mission_safety(hover)
+    system.expire_missions(current_time=55)
+    queue.process_pending()
+    assert len(queue) == 0 and queue.dropped == 1
+
+
+def test_delay_replanner_clears_backlog():
+    system = DeconflictionSystem(safety_distance=10.0, mode="3d", verbose=False)
+    queue = system.enable_replanning(replanner=delay_replanner(150))
+    system.query_mission_safety(corridor("A", 0, 0))
+    system.query_mission_safety(corridor("L", 0, 0, 300))    # long mission, keeps blocking
+    system.query_mission_safety(corridor("X", 3, 0))
+    system.cancel_mission("A")
+    system.query_mission_safety(corridor("A2", 0, 120))
+    cleared = queue.process_pending()
+    # L now runs into A2; only its shifted copy (150 s later) fits
+    assert sorted(m.drone_id for m, _ in cleared) == ["L", "X"]
+    approved = {m.drone_id: m for m in system.approved_missions}
+    assert approved["L"].start_time == 150 and approved["L"].end_time == 450
+    assert approved["X"].start_time == 0
+    assert queue.cleared == 2 and queue.retries == 2 and len(queue) == 0
+
+
+def test_background_retries_and_foreground_queries_share_the_lock():
+    system = DeconflictionSystem(safety_distance=10.0, mode="3d", verbose=False)
+    queue = system.enable_replanning()
+    assert system._lock is queue.lock
+
+    pairs = 40
+    for i in range(pairs):
+        system.query_mission_safety(corridor(f"A{i}", 100 * i, 0))
+        system.query_mission_safety(corridor(f"X{i}", 100 * i + 3, 0))  # blocked by A{i}
+    queue.start(poll_interval=0.01)
+    try:
+        for i in range(pairs):
+            system.cancel_mission(f"A{i}")  # wakes X{i} on the scheduler thread
+            # ...while this thread races it for the same slot
+            system.query_mission_safety(corridor(f"B{i}", 100 * i + 6, 0))
+    finally:
+        queue.stop()
+    queue.process_pending()
+
+    approved = {m.drone_id for m in system.approved_missions}
+    for i in range(pairs):
+        # X and B are 3 m apart: exactly one of them may hold the slot
+        assert len(approved & {f"X{i}", f"B{i}"}) == 1
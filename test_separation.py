@@ -0,0 +1,61 @@
+import random
+
+import numpy as np
+
+from src.conflict_detector import ConflictDetector
+from src.models import waypoint, Mission
+from src.separation import downsample_minmax, separation_against_others
+from tests_support import random_mission
+
+
+def test_series_matches_conflict_check():
+    rng = random.Random(33)
+    missions = [random_mission(rng, f"M{i}") for i in range(20)]
+    for step in (1.0, 0.05):
+        detector = ConflictDetector(safety_distance=30.0, time_step=step, mode="3d")
+        curves = separation_against_others(detector, missions[0], missions[1:])
+        for other in missions[1:]:
+            conflicts = [r.time for r in detector.find_conflicts(missions[0], other)]
+            times, distances = curves.get(other.drone_id, (np.empty(0), np.empty(0)))
+            assert times[distances < 30.0].tolist() == conflicts
+
+
+def test_closest_approach_is_exact_between_samples():
+    a = Mission([waypoint(0, 0, 10, 0), waypoint(100, 0, 10, 10)], 0, 10, "A")
+    b = Mission([waypoint(100, 7, 10, 0), waypoint(0, 7, 10, 10)], 0, 10, "B")
+    detector = ConflictDetector(safety_distance=5.0, time_step=2.0, mode="3d")
+    t, d = detector.closest_approach(a, b)
+    assert abs(t - 5.0) < 1e-9 and abs(d - 7.0) < 1e-9
+    _, sampled = detector.separation_series(a, b)
+    assert sampled.min() > d
+
+
+def test_closest_approach_follows_jumps():
+    # A jumps from (0, 0) to (100, 0) at t = 10, then hovers where B crosses at t = 11
+    a = Mission([waypoint(0, 0, 0, 0), waypoint(0, 0, 0, 10), waypoint(100, 0, 0, 10), waypoint(100, 0, 0, 20)],
+                0, 20, "A")
+    b = Mission([waypoint(100, -10, 0, 10), waypoint(100, 90, 0, 20)], 10, 20, "B")
+    detector = ConflictDetector(safety_distance=5.0, time_step=1.0, mode="2d")
+    assert [(r.time, r.distance) for r in detector.find_conflicts(a, b)] == [(11.0, 0.0)]
+    assert detector.closest_approach(a, b) == (11.0, 0.0)
+
+
+def test_closest_approach_does_not_smear_a_final_jump():
+    # A hovers at the origin and jumps to (100, 0) at its last instant, next to B
+    a = Mission([waypoint(0, 0, 0, 0), waypoint(0, 0, 0, 10), waypoint(100, 0, 0, 10)], 0, 10, "A")
+    b = Mission([waypoint(90, 0, 0, 0), waypoint(90, 0, 0, 10)], 0, 10, "B")
+    detector = ConflictDetector(safety_distance=5.0, time_step=1.0, mode="2d")
+    _, sampled = detector.separation_series(a, b)
+    assert sampled.min() == 10.0
+    assert detector.closest_approach(a, b) == (10.0, 10.0)
+
+
+def test_downsampling_keeps_extremes():
+    times = np.arange(10000, dtype=float)
+    values = np.sin(times / 50.0) + 0.001 * times
+    values[4321] = -5.0
+    t, v = downsample_minmax(times, values, 100)
+    assert len(v) <= 100
+    assert v.min() == -5.0 and t[np.argmin(v)] == 4321
+    assert v.max() == values.max()
+    assert np.all(np.diff(t) > 0)
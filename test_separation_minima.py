@@ -0,0 +1,113 @@
+import math
+import random
+
+import pytest
+
+from src.conflict_detector import ConflictDetector
+from src.deconfliction_system import DeconflictionSystem
+from src.mission_io import mission_from_dict, mission_to_dict
+from src.models import waypoint, Mission, simplify_mission
+from src.parallel import find_conflicts_threaded
+from src.separation_minima import SeparationMinima, SeparationTable
+from tests_support import generated_missions
+
+TABLE = SeparationTable(
+    default=SeparationMinima(20.0, 10.0),
+    pairs={
+        ("quad", "quad"): SeparationMinima(15.0, 8.0),
+        ("quad", "fixed_wing"): SeparationMinima(60.0, 30.0),
+        ("fixed_wing", "fixed_wing"): SeparationMinima(90.0, 45.0),
+    },
+)
+
+
+def line(drone_id, y, z, drone_class="default", t0=0.0):
+    return Mission([waypoint(0, y, z, t0), waypoint(100, y, z, t0 + 100)], t0, t0 + 100, drone_id,
+                   drone_class=drone_class)
+
+
+def test_table_is_symmetric_with_default_fallback():
+    assert TABLE.minima("fixed_wing", "quad") == TABLE.minima("quad", "fixed_wing") == (60.0, 30.0)
+    assert TABLE.minima("quad", "balloon") == (20.0, 10.0)  # no entry: default minima
+    assert TABLE.max_separation() == 90.0
+    horizontal, vertical = TABLE.row("quad", ["quad", "fixed_wing", "balloon"])
+    assert horizontal == [15.0, 60.0, 20.0] and vertical == [8.0, 30.0, 10.0]
+
+    data = {"default": {"horizontal": 20, "vertical": 10},
+            "pairs": [{"classes": ["quad", "fixed_wing"], "horizontal": 60, "vertical": 30}]}
+    assert SeparationTable.from_dict(data).minima("fixed_wing", "quad") == (60.0, 30.0)
+    with pytest.raises(ValueError):
+        SeparationTable.from_dict({"pairs": []})
+    with pytest.raises(ValueError):
+        TABLE.set("quad", "quad", -1.0, 5.0)
+
+
+def test_cylinder_separates_horizontal_and_vertical_minima():
+    sphere = ConflictDetector(safety_distance=20.0, mode="3d")
+    detector = ConflictDetector(safety_distance=20.0, mode="3d", separation=TABLE)
+    # 12 m straight above: inside the 20 m sphere, outside the default 10 m vertical minimum
+    above = line("A", 0, 50), line("B", 0, 62)
+    assert sphere.find_conflicts(*above)
+    assert detector.find_conflicts(*above) == []
+    # ...but inside the 30 m vertical minimum between a quad and a fixed-wing
+    mixed = line("A", 0, 50, "quad"), line("B", 0, 75, "fixed_wing")
+    records = detector.find_conflicts(*mixed)
+    assert len(records) == 101 and records[0].distance == pytest.approx(25.0)
+    # Level 50 m apart: clear for two quads, a conflict with a fixed-wing
+    assert detector.find_conflicts(line("A", 0, 50, "quad"), line("B", 50, 50, "quad")) == []
+    assert detector.find_conflicts(line("A", 0, 50, "quad"), line("B", 50, 50, "fixed_wing"))
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_engines_and_batched_paths_agree_on_mixed_fleets(seed):
+    rng = random.Random(seed)
+    missions = generated_missions(seed)
+    for mission in missions:
+        mission.drone_class = rng.choice(["quad", "fixed_wing", "balloon"])
+    table = SeparationTable(SeparationMinima(30.0, 12.0), {
+        ("quad", "quad"): (20.0, 8.0), ("quad", "fixed_wing"): (60.0, 25.0),
+        ("fixed_wing", "fixed_wing"): (80.0, 35.0)})
+    python = ConflictDetector(time_step=0.7, mode="auto", separation=table)
+    numpy = ConflictDetector(time_step=0.7, mode="auto", separation=table, engine="numpy")
+
+    found_any = False
+    for primary in missions:
+        others = [m for m in missions if m is not primary]
+        expected = [r for other in others for r in python.find_conflicts(primary, other)]
+        found_any = found_any or bool(expected)
+        assert numpy.find_conflicts_against_others(primary, others) == expected
+        assert python.find_conflicts_against_others(primary, others) == expected
+        assert find_conflicts_threaded(numpy, primary, others, workers=3) == expected
+
+        # Against the reference sampler, with the cylinder test spelled out
+        for other in others:
+            h, v = table.minima(primary.drone_class, other.drone_class)
+            is_3d = python.is_3d_pair(primary, other)
+            times = {r.time for r in expected if r.drone_b == other.drone_id}
+            for t in python.sample_times(max(primary.start_time, other.start_time),
+                                         min(primary.end_time, other.end_time)):
+                a = python.get_position_at_time(primary, t) + (0.0,)
+                b = python.get_position_at_time(other, t) + (0.0,)
+                horizontal = math.hypot(a[0] - b[0], a[1] - b[1])
+                inside = horizontal < h and (not is_3d or abs(a[2] - b[2]) < v)
+                near_edge = abs(horizontal - h) < 1e-9 or (is_3d and abs(abs(a[2] - b[2]) - v) < 1e-9)
+                if not near_edge:
+                    assert (t in times) == inside, (primary.drone_id, other.drone_id, t)
+    assert found_any
+
+
+def test_system_prescreen_covers_the_widest_class_pair():
+    system = DeconflictionSystem(safety_distance=10.0, mode="3d", separation=TABLE, verbose=False)
+    assert system.occupancy.margin == 45.0
+    assert system.query_mission_safety(line("FW1", 0, 100, "fixed_wing"))["status"] == "APPROVED"
+    # 80 m away: far outside the 10 m scalar distance, inside the 90 m fixed-wing minimum
+    assert system.query_mission_safety(line("FW2", 80, 100, "fixed_wing"))["status"] == "REJECTED"
+    assert system.query_mission_safety(line("Q1", 80, 100, "quad"))["status"] == "APPROVED"
+
+
+def test_drone_class_round_trips_through_json_and_copies():
+    mission = line("Q", 0, 10, "quad")
+    assert mission_from_dict(mission_to_dict(mission)).drone_class == "quad"
+    assert mission_from_dict({k: v for k, v in mission_to_dict(mission).items()
+                              if k != "drone_class"}).drone_class == "default"
+    assert simplify_mission(mission, 1.0).drone_class == "quad"
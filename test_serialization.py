@@ -0,0 +1,59 @@
+import json
+
+from src.conflict_detector import ConflictRecord
+from src.models import waypoint, Mission
+from src.serialization import coalesce_intervals, decode_binary, encode_binary
+from src.deconfliction_system import DeconflictionSystem
+
+
+def crossing_missions():
+    a = Mission([waypoint(0, 0, 10, 0), waypoint(1000, 0, 10, 1000)], 0, 1000, "A")
+    b = Mission([waypoint(0, 3, 10, 0), waypoint(1000, 3, 10, 1000)], 0, 1000, "B")
+    return a, b
+
+
+def test_summary_coalesces_conflicts_into_intervals():
+    a, b = crossing_missions()
+    system = DeconflictionSystem(safety_distance=5.0, mode="3d")
+    system.query_mission_safety(a)
+    full = system.query_mission_safety(b, [a])
+    summary = system.query_mission_safety(b, [a], response_format="summary", sample_limit=3)
+
+    assert summary["conflicts_detected"] == full["conflicts_detected"] == 1001
+    assert summary["conflict_sample"] == full["conflicts"][:3]
+    assert summary["recommendations"] == full["recommendations"]
+    [interval] = summary["conflict_intervals"]
+    assert interval["drone_id"] == "A"
+    assert (interval["start"], interval["end"], interval["samples"]) == (0, 1000, 1001)
+    assert len(json.dumps(summary)) * 50 < len(json.dumps(full))
+
+
+def test_wire_formats_round_trip():
+    a, b = crossing_missions()
+    system = DeconflictionSystem(safety_distance=5.0, mode="3d")
+    system.query_mission_safety(a)
+    summary = system.query_mission_safety(b, [a], response_format="summary")
+
+    assert json.loads(system.query_mission_safety(b, [a], response_format="json")) == summary
+    decoded = decode_binary(system.query_mission_safety(b, [a], response_format="binary"))
+    assert decoded["status"] == "REJECTED"
+    assert decoded["mission_id"] == "B"
+    assert decoded["detection_mode"] == "3d"
+    assert decoded["conflict_intervals"] == summary["conflict_intervals"]
+
+
+def test_missions_of_one_drone_are_not_merged_backwards():
+    at = lambda t: ConflictRecord("P", "A", t, (0, 0), (0, 0), 1.0)
+    # A's second approved mission conflicts earlier than its first
+    intervals = coalesce_intervals([at(100), at(101), at(102), at(10), at(11), at(12)], time_step=1.0)
+    assert [(i["start"], i["end"], i["samples"]) for i in intervals] == [(100, 102, 3), (10, 12, 3)]
+
+
+def test_binary_frame_holds_more_than_65535_intervals():
+    records = [ConflictRecord("P", "A", 3.0 * k, (0, 0), (0, 0), 1.0) for k in range(70000)]
+    summary = {"status": "REJECTED", "mission_id": "P", "conflicts_detected": len(records),
+               "conflict_intervals": coalesce_intervals(records, time_step=1.0),
+               "safety_distance": 5.0, "detection_mode": "2d"}
+    decoded = decode_binary(encode_binary(summary))
+    assert len(decoded["conflict_intervals"]) == 70000
+    assert decoded["conflict_intervals"][-1]["start"] == 3.0 * 69999
@@ -0,0 +1,39 @@
+import math
+import random
+
+from src.conflict_detector import ConflictDetector
+from src.models import waypoint, Mission, simplify_mission
+
+
+def gps_log_mission(rng, drone_id, y_offset, n=2000):
+    wps = []
+    for i in range(n):
+        t = i * 0.5
+        wps.append(waypoint(t * 10 + rng.gauss(0, 0.3), y_offset + 40 * math.sin(t / 200) + rng.gauss(0, 0.3),
+                            30 + rng.gauss(0, 0.2), t))
+    return Mission(waypoints=wps, start_time=0, end_time=wps[-1].time, drone_id=drone_id)
+
+
+def test_simplification_compresses_within_bound():
+    rng = random.Random(34)
+    mission = gps_log_mission(rng, "LOG", 0)
+    simplified = simplify_mission(mission, epsilon=2.0)
+    assert len(simplified.waypoints) < len(mission.waypoints) // 20
+    assert 0 < simplified.position_tolerance <= 2.0
+
+    detector = ConflictDetector(safety_distance=0.0, time_step=0.25, mode="3d")
+    for wp in mission.waypoints:
+        exact = (wp.x, wp.y, wp.z)
+        approx = detector.get_position_at_time(simplified, wp.time)
+        assert math.dist(exact, approx) <= simplified.position_tolerance + 1e-9
+
+
+def test_simplified_check_stays_conservative():
+    rng = random.Random(7)
+    a = gps_log_mission(rng, "A", 0)
+    b = gps_log_mission(rng, "B", 9)
+    detector = ConflictDetector(safety_distance=10.0, time_step=1.0, mode="3d")
+    original = {r.time for r in detector.find_conflicts(a, b)}
+    compressed = {r.time for r in detector.find_conflicts(simplify_mission(a, 1.5), simplify_mission(b, 1.5))}
+    assert original
+    assert original <= compressed
@@ -0,0 +1,30 @@
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def loaded_modules(statement):
+    code = f"{statement}; import sys; print(' '.join(sorted(sys.modules)))"
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    return set(out.stdout.split())
+
+
+def test_core_import_is_lightweight():
+    modules = loaded_modules("from src import DeconflictionSystem, ConflictDetector, Mission, waypoint")
+    for heavy in ("numpy", "matplotlib", "plotly", "asyncio", "data.sample_missions"):
+        assert heavy not in modules
+
+
+def test_imports_do_not_touch_sys_path():
+    code = ("import sys; before = list(sys.path); import src.conflict_detector, data.sample_missions, "
+            "main_deconfliction_system; assert sys.path == before")
+    subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True)
+
+
+def test_visualizations_import_plotting_lazily():
+    modules = loaded_modules("import visualizations.visualize_3d, visualizations.compare_2d_3d, "
+                             "visualizations.visualize_congestion")
+    for heavy in ("numpy", "matplotlib", "plotly"):
+        assert heavy not in modules
@@ -0,0 +1,41 @@
+import random
+
+from src.audit import iter_conflicts
+from src.conflict_detector import ConflictDetector
+from src.models import waypoint, Mission
+from src.sweep import iter_overlapping_pairs, windows_overlap
+from tests_support import random_mission
+
+
+def window(drone_id, start, end):
+    return Mission([waypoint(0, 0, 0, start), waypoint(1, 1, 0, end)], start, end, drone_id)
+
+
+def test_sweep_yields_exactly_the_overlapping_pairs():
+    rng = random.Random(36)
+    missions = []
+    for i in range(300):
+        start = rng.uniform(0, 1000)
+        missions.append(window(f"M{i}", start, start + rng.choice([0, 5, 30, 200])))
+
+    pairs = list(iter_overlapping_pairs(missions))
+    assert all(i < j for i, j in pairs)
+    assert len(pairs) == len(set(pairs))
+    expected = {(i, j) for i in range(len(missions)) for j in range(i + 1, len(missions))
+                if windows_overlap(missions[i], missions[j])}
+    assert set(pairs) == expected
+
+
+def test_touching_windows_overlap():
+    pairs = list(iter_overlapping_pairs([window("A", 0, 10), window("B", 10, 20), window("C", 21, 30)]))
+    assert pairs == [(0, 1)]
+
+
+def test_audit_finds_same_conflicts_as_brute_force():
+    rng = random.Random(7)
+    missions = [random_mission(rng, f"M{i}") for i in range(30)]
+    detector = ConflictDetector(safety_distance=30.0, mode="3d")
+    brute = {r for i in range(len(missions)) for j in range(i + 1, len(missions))
+             for r in detector.find_conflicts(missions[i], missions[j])}
+    audited = list(iter_conflicts(detector, missions))
+    assert brute and len(audited) == len(brute) and set(audited) == brute
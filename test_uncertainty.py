@@ -0,0 +1,36 @@
+from src.models import waypoint, Mission
+from src.conflict_detector import ConflictDetector
+from src.uncertainty import ErrorModel
+
+
+def parallel_missions(gap):
+    a = Mission([waypoint(0, 0, 10, 0), waypoint(100, 0, 10, 100)], 0, 100, "A")
+    b = Mission([waypoint(0, gap, 10, 0), waypoint(100, gap, 10, 100)], 0, 100, "B")
+    return a, b
+
+
+def test_exact_models_match_deterministic_check():
+    detector = ConflictDetector(safety_distance=10.0, mode="3d")
+    close, far = parallel_missions(5), parallel_missions(15)
+    assert detector.conflict_probability(*close) == 1.0
+    assert detector.conflict_probability(*far) == 0.0
+
+
+def test_probability_grows_with_error():
+    detector = ConflictDetector(safety_distance=10.0, mode="3d")
+    a, b = parallel_missions(12)
+    detector.set_error_model("A", ErrorModel(horizontal_sigma=0.5))
+    detector.set_error_model("B", ErrorModel(horizontal_sigma=0.5))
+    low = detector.conflict_probability(a, b, seed=0)
+    detector.set_error_model("A", ErrorModel(horizontal_sigma=3.0, timing_sigma=2.0))
+    detector.set_error_model("B", ErrorModel(horizontal_sigma=3.0, timing_sigma=2.0))
+    high = detector.conflict_probability(a, b, seed=0)
+    assert 0.0 <= low < high <= 1.0
+
+
+def test_far_pair_is_pruned_before_sampling():
+    detector = ConflictDetector(safety_distance=10.0, mode="3d")
+    a, b = parallel_missions(500)
+    detector.set_error_model("A", ErrorModel(horizontal_sigma=3.0, timing_sigma=2.0))
+    assert detector.conflict_probability(a, b, seed=0) == 0.0
+    assert detector.check_mission_probabilistic(a, [b], threshold=0.01) == []
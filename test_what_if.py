@@ -0,0 +1,69 @@
+import random
+
+import pytest
+
+from src.deconfliction_system import DeconflictionSystem
+from src.models import waypoint, Mission
+from tests_support import random_mission
+
+
+def corridor(drone_id, y, start=0, duration=100):
+    return Mission([waypoint(0, y, 20, start), waypoint(1000, y, 20, start + duration)],
+                   start, start + duration, drone_id)
+
+
+def live_system(n=40):
+    rng = random.Random(37)
+    system = DeconflictionSystem(safety_distance=30.0, mode="3d", verbose=False)
+    system.query_mission_batch([random_mission(rng, f"M{i}") for i in range(n)])
+    return system, rng
+
+
+def test_session_decides_like_live_system_and_discard_leaves_it_untouched():
+    system, rng = live_system()
+    before = list(system.approved_missions)
+    batch = [random_mission(rng, f"W{i}") for i in range(20)]
+
+    with system.what_if() as session:
+        speculative = [session.query_mission_safety(m, "summary")["status"] for m in batch]
+    assert system.approved_missions == before
+    assert len(system.occupancy) == len(before)
+
+    live = [r["status"] for r in system.query_mission_batch(batch)]
+    assert speculative == live
+
+
+def test_cancellation_inside_session_frees_airspace_only_there():
+    system = DeconflictionSystem(safety_distance=10.0, mode="3d", verbose=False)
+    system.query_mission_safety(corridor("A", 0))
+    session = system.what_if()
+    other = system.what_if()
+    session.cancel_mission("A")
+    assert session.query_mission_safety(corridor("B", 3))["status"] == "APPROVED"
+    assert other.query_mission_safety(corridor("B", 3))["status"] == "REJECTED"
+    assert [m.drone_id for m in system.approved_missions] == ["A"]
+
+    session.commit()
+    assert [m.drone_id for m in system.approved_missions] == ["B"]
+    assert system.query_mission_safety(corridor("C", 0))["status"] == "REJECTED"
+
+
+def test_stale_session_is_rechecked_on_commit():
+    system = DeconflictionSystem(safety_distance=10.0, mode="3d", verbose=False)
+    first, second = system.what_if(), system.what_if()
+    first.query_mission_safety(corridor("A", 0))
+    second.query_mission_safety(corridor("B", 3))
+    first.commit()
+    with pytest.raises(ValueError, match="stale"):
+        second.commit()
+    assert [m.drone_id for m in system.approved_missions] == ["A"]
+
+
+def test_snapshot_restore():
+    system, rng = live_system(10)
+    snap = system.snapshot()
+    approved = list(system.approved_missions)
+    system.query_mission_batch([random_mission(rng, f"X{i}") for i in range(10)])
+    system.restore(snap)
+    assert system.approved_missions == approved
+    assert len(system.occupancy) == len(approved)
@@ -0,0 +1,43 @@
+"""Mission generators shared by the test modules"""
+import random
+
+from src.models import waypoint, Mission
+
+
+def random_mission(rng, drone_id, is_3d=True):
+    start = rng.uniform(0, 200)
+    t = start
+    wps = []
+    for _ in range(rng.randint(2, 6)):
+        z = rng.uniform(0, 60) if is_3d else 0.0
+        wps.append(waypoint(rng.uniform(0, 300), rng.uniform(0, 300), z, t))
+        t += rng.uniform(5, 40)
+    return Mission(waypoints=wps, start_time=start, end_time=t + rng.uniform(0, 10), drone_id=drone_id)
+
+
+def generated_missions(seed: int, count: int = 16):
+    """Random 2D and 3D missions over a small area, with hovers, zero-length segments and jumps"""
+    rng = random.Random(seed)
+    missions = []
+    for i in range(count):
+        is_3d = rng.random() < 0.6
+        t = rng.uniform(0, 120)
+        start = t - rng.choice([0.0, 0.0, rng.uniform(0, 10)])
+        wps = []
+        for _ in range(rng.randint(2, 7)):
+            x, y = rng.uniform(0, 250), rng.uniform(0, 250)
+            z = rng.uniform(5, 60) if is_3d else 0.0
+            wps.append(waypoint(x, y, z, t))
+            roll = rng.random()
+            if roll < 0.05:
+                wps.append(waypoint(x, y, z, t))  # zero-duration segment
+            elif roll < 0.1:
+                x, y = rng.uniform(0, 250), rng.uniform(0, 250)
+                wps.append(waypoint(x, y, z, t))  # jump: a zero-duration segment that moves
+            elif roll < 0.2:
+                t += rng.uniform(2, 15)
+                wps.append(waypoint(x, y, z, t))  # hover
+            t += rng.uniform(3, 40)
+        end = wps[-1].time + rng.choice([0.0, rng.uniform(0, 15)])
+        missions.append(Mission(wps, start, end, f"{'3D' if is_3d else '2D'}_{seed}_{i}"))
+    return missions
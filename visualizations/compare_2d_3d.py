@@ -1,11 +1,12 @@
-import sys
-import os
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if __package__ in (None, ""):
+    # Running as a script: make the project root importable (no effect on package imports)
+    import os
+    import sys
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from data.sample_missions import create_sample_missions_2d, create_sample_missions_3d
 from src.conflict_detector import ConflictDetector
-import matplotlib.pyplot as plt
+from src.sweep import iter_overlapping_pairs
 
 def analyze_conflicts(missions, detector_mode, safety_distance=5.0):
     """Analyze conflicts for given missions and detector mode"""
@@ -14,13 +15,12 @@ def analyze_conflicts(missions, detector_mode, safety_distance=5.0):
     all_conflicts = []
     mission_pairs = []
     
-    # Check all pairs of missions
-    for i in range(len(missions)):
-        for j in range(i + 1, len(missions)):
-            conflicts = detector.check_conflicts_between_missions(missions[i], missions[j])
-            if conflicts:
-                all_conflicts.extend(conflicts)
-                mission_pairs.append((missions[i].drone_id, missions[j].drone_id))
+    # Check every pair of missions whose time windows overlap
+    for i, j in sorted(iter_overlapping_pairs(missions)):
+        conflicts = detector.check_conflicts_between_missions(missions[i], missions[j])
+        if conflicts:
+            all_conflicts.extend(conflicts)
+            mission_pairs.append((missions[i].drone_id, missions[j].drone_id))
     
     return all_conflicts, mission_pairs
 
@@ -97,6 +97,7 @@ def create_comparison_report():
 
 def create_comparison_chart(results):
     """Create a bar chart comparing conflict detection results"""
+    import matplotlib.pyplot as plt
     
     categories = ['2D Missions\n(2D Detector)', '3D Missions\n(2D Detector)', '3D Missions\n(3D Detector)']
     conflict_counts = [results['conflicts_2d_on_2d'], results['conflicts_2d_on_3d'], results['conflicts_3d_on_3d']]
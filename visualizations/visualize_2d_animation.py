@@ -1,10 +1,9 @@
-import sys
-import os
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if __package__ in (None, ""):
+    # Running as a script: make the project root importable (no effect on package imports)
+    import os
+    import sys
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-import matplotlib.pyplot as plt
-from matplotlib.animation import FuncAnimation
 from data.sample_missions import create_sample_missions
 from src.conflict_detector import ConflictDetector
 
@@ -34,6 +33,9 @@ def find_conflicts_at_time(detector, missions, t):
 
 
 if __name__ == "__main__":
+    import matplotlib.pyplot as plt
+    from matplotlib.animation import FuncAnimation
+
     missions = create_sample_missions()
     detector = ConflictDetector(safety_distance=5.0, time_step=1.0)
 
@@ -1,12 +1,9 @@
-import sys
-import os
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if __package__ in (None, ""):
+    # Running as a script: make the project root importable (no effect on package imports)
+    import os
+    import sys
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-import plotly.graph_objects as go
-import plotly.express as px
-from plotly.subplots import make_subplots
-import numpy as np
 from data.sample_missions import create_sample_missions_2d, create_sample_missions_3d
 from src.conflict_detector import ConflictDetector
 
@@ -14,6 +11,8 @@ def plot_3d_missions(missions, conflicts=None, title="3D Drone Missions"):
     """
     Create interactive 3D plot of drone missions
     """
+    import plotly.graph_objects as go
+
     fig = go.Figure()
     
     colors = ['red', 'blue', 'green', 'orange', 'purple', 'brown', 'pink']
@@ -107,6 +106,9 @@ def create_3d_animation(missions, detector, time_range=None):
     """
     Create animated 3D plot showing drone movements over time
     """
+    import numpy as np
+    import plotly.graph_objects as go
+
     if time_range is None:
         t_min = min(m.start_time for m in missions)
         t_max = max(m.end_time for m in missions)
@@ -0,0 +1,101 @@
+if __package__ in (None, ""):
+    # Running as a script: make the project root importable (no effect on package imports)
+    import os
+    import sys
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def plot_congestion_heatmap(grid, title="Airspace Congestion"):
+    """
+    Static matplotlib view of a CongestionGrid: drone-minutes per horizontal cell
+    with near-miss cells outlined, and traffic per time bin underneath
+    """
+    import matplotlib.pyplot as plt
+
+    t_edges, x_edges, y_edges = grid.edges[:3]
+    fig, (ax_map, ax_time) = plt.subplots(2, 1, figsize=(9, 11), gridspec_kw={"height_ratios": [3, 1]})
+
+    minutes = grid.spatial() * grid.time_step / 60.0
+    mesh = ax_map.pcolormesh(x_edges, y_edges, minutes.T, cmap="inferno", shading="flat")
+    fig.colorbar(mesh, ax=ax_map, label="Drone-minutes")
+    near = grid.spatial(grid.near_misses)
+    if near.any():
+        xc = (x_edges[:-1] + x_edges[1:]) / 2
+        yc = (y_edges[:-1] + y_edges[1:]) / 2
+        ix, iy = near.nonzero()
+        ax_map.scatter(xc[ix], yc[iy], s=20 + 10 * near[ix, iy], facecolors="none", edgecolors="cyan",
+                       label=f"Near misses (< {grid.near_miss_distance:g} m)")
+        ax_map.legend(loc="upper right")
+    ax_map.set_xlabel("X (meters)")
+    ax_map.set_ylabel("Y (meters)")
+    ax_map.set_title(title)
+
+    hours = t_edges[:-1] / 3600.0
+    width = (t_edges[1] - t_edges[0]) / 3600.0
+    ax_time.bar(hours, grid.timeline() * grid.time_step / 60.0, width=width, align="edge", color="tab:orange")
+    ax_time.set_xlabel("Time (hours)")
+    ax_time.set_ylabel("Drone-minutes")
+    ax_time.grid(True, alpha=0.3)
+    plt.tight_layout()
+    plt.show()
+
+
+def plot_congestion_interactive(grid, title="Airspace Congestion Over Time"):
+    """Plotly heatmap of drone-minutes per cell with a slider over the time bins"""
+    import plotly.graph_objects as go
+
+    t_edges, x_edges, y_edges = grid.edges[:3]
+    counts = grid.occupancy.sum(axis=3) if grid.is_3d else grid.occupancy
+    minutes = counts * grid.time_step / 60.0
+    xc = (x_edges[:-1] + x_edges[1:]) / 2
+    yc = (y_edges[:-1] + y_edges[1:]) / 2
+    zmax = float(minutes.max()) or 1.0
+
+    frames = [
+        go.Frame(data=[go.Heatmap(x=xc, y=yc, z=minutes[k].T, zmin=0, zmax=zmax, colorscale="Inferno")],
+                 name=f"{t_edges[k] / 3600:.2f}h")
+        for k in range(minutes.shape[0])
+    ]
+    fig = go.Figure(data=frames[0].data, frames=frames)
+    fig.update_layout(
+        title=title,
+        xaxis_title="X (meters)",
+        yaxis_title="Y (meters)",
+        sliders=[dict(
+            currentvalue=dict(prefix="Time bin from "),
+            steps=[dict(method="animate", label=frame.name,
+                        args=[[frame.name], dict(mode="immediate", frame=dict(duration=0, redraw=True))])
+                   for frame in frames],
+        )],
+    )
+    fig.show()
+    return fig
+
+
+if __name__ == "__main__":
+    import random
+    import time
+
+    from benchmarks.load_generator import random_mission
+    from src.congestion import compute_congestion
+    from src.models import waypoint, Mission
+
+    # A day of traffic: one-hour mission shapes shifted across 24 hours
+    rng = random.Random(41)
+    missions = []
+    for i in range(5000):
+        shape = random_mission(rng, f"DRONE_{i:04d}", 10000)
+        shift = rng.uniform(0, 23 * 3600)
+        missions.append(Mission([waypoint(wp.x, wp.y, wp.z, wp.time + shift) for wp in shape.waypoints],
+                                shape.start_time + shift, shape.end_time + shift, shape.drone_id))
+
+    started = time.perf_counter()
+    grid = compute_congestion(missions, time_step=1.0, cell_size=500.0, time_bin=1800.0,
+                              altitude_bin=30.0, near_miss_distance=30.0)
+    print(f"Aggregated {len(missions)} missions in {time.perf_counter() - started:.2f}s")
+    print("Busiest bins (t, x, y, z, samples):")
+    for spot in grid.hotspots(5):
+        print(f"  {spot}")
+
+    plot_congestion_heatmap(grid)
+    plot_congestion_interactive(grid)
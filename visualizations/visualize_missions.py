@@ -1,13 +1,14 @@
-import sys
-import os
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if __package__ in (None, ""):
+    # Running as a script: make the project root importable (no effect on package imports)
+    import os
+    import sys
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-import matplotlib.pyplot as plt
 from data.sample_missions import create_sample_missions
 from src.conflict_detector import ConflictDetector
 
 def plot_missions(missions, conflicts=None):
+    import matplotlib.pyplot as plt
     colors = ['r', 'g', 'b', 'm', 'c']
     plt.figure(figsize=(8, 8))
 